@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from benchmarks.synthetic import (
+    GAMES_PER_WEEK,
+    WEEKS_PER_SEASON,
+    make_scores_json,
+    make_the_odds_json,
+)
+from nfl_confidence.backtest import BacktestConfig, Season, backtest_season
+from nfl_confidence.compact import compact_games, compact_table
+from nfl_confidence.fakes import FakeWorksheet
+from nfl_confidence.odds import OddsTable, get_this_weeks_games, parse_the_odds_json
+from nfl_confidence.schedule import GameIndex
+from nfl_confidence.sheets import SheetWriter, TokenBucket
+from nfl_confidence.simulate import (
+    greedy_assignment,
+    season_distribution,
+    simulate_assignments,
+)
+from nfl_confidence.utils import get_ranks
+
+# Simulated outcomes per week in the simulate_season stage
+SIMULATIONS_PER_WEEK = 20_000
+
+# Benchmark scales: (weeks of games, bookmakers per game)
+SCALES = {
+    "week": (1, 16),
+    "season": (WEEKS_PER_SEASON, 40),
+    "10_seasons": (10 * WEEKS_PER_SEASON, 40),
+}
+COMPUTED_FIELDS = [
+    "home_team_win_prob",
+    "away_team_win_prob",
+    "predicted_winner",
+    "win_probability",
+    "win_probability_variance",
+    "oddsmaker_agreement",
+]
+
+
+def time_it(func: Callable[[], object], repeats: int, setup: Optional[Callable] = None) -> float:
+    """Best wall-clock time of several runs of func
+
+    Args:
+        func (Callable[[], object]): Function to time
+        repeats (int): Number of runs
+        setup (Optional[Callable], optional): Called before every run, untimed. Defaults to None.
+
+    Returns:
+        float: Minimum seconds per run
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bytes_per_item(build: Callable[[], List]) -> float:
+    """Memory allocated by build and still held by its result, per item of the result
+
+    Args:
+        build (Callable[[], List]): Builds a list, e.g. of parsed games
+
+    Returns:
+        float: Retained bytes per item
+    """
+    tracemalloc.start()
+    try:
+        items = build()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained / len(items)
+
+
+def write_weeks(tables: List[OddsTable]) -> None:
+    """Write one worksheet per week through SheetWriter against fake worksheets"""
+    limiter = TokenBucket(rate_per_minute=float("inf"))
+    for week, table in enumerate(tables):
+        writer = SheetWriter(ws=FakeWorksheet(title=f"Week {week + 1}"), limiter=limiter)
+        ranks = get_ranks(values=table.win_probability)
+        for row, (winner, rank) in enumerate(zip(table.predicted_winner, ranks), start=2):
+            writer.update_cell(row=row, col=2, value=winner.value)
+            writer.update_cell(row=row, col=3, value=int(rank))
+        writer.flush()
+
+
+def simulate_season(tables: List[OddsTable]) -> None:
+    """Simulate the greedy assignment's points every week and combine them into a season"""
+    weeks = []
+    for table in tables:
+        assignment = greedy_assignment(table.home_team_win_prob)
+        distributions = simulate_assignments(
+            table.home_team_win_prob, {"greedy": assignment}, n_sims=SIMULATIONS_PER_WEEK
+        )
+        weeks.append(distributions["greedy"])
+    season_distribution(weeks)
+
+
+def run_scale(name: str, n_weeks: int, n_bookmakers: int, repeats: int) -> Dict[str, Dict]:
+    """Time every pipeline stage on synthetic input of the given scale
+
+    Args:
+        name (str): Scale name
+        n_weeks (int): Weeks of games
+        n_bookmakers (int): Bookmakers per game
+        repeats (int): Timing repeats per stage
+
+    Returns:
+        Dict[str, Dict]: Timing result per "stage[scale]"
+    """
+    the_odds_json = make_the_odds_json(n_weeks=n_weeks, n_bookmakers=n_bookmakers)
+    n_games = len(the_odds_json)
+    games = parse_the_odds_json(the_odds_json)
+    week_starts = range(0, n_games, GAMES_PER_WEEK)
+    weeks = [games[start:][:GAMES_PER_WEEK] for start in week_starts]
+    tables = [OddsTable.from_games(games=week) for week in weeks]
+    win_probs = [game.win_probability for game in games]
+    compact = compact_games(games)
+
+    # Archive the odds and matching results for the backtest stage
+    archive_dir = tempfile.mkdtemp()
+    season = Season(
+        name=name,
+        odds_path=os.path.join(archive_dir, "odds.json"),
+        scores_path=os.path.join(archive_dir, "scores.json"),
+    )
+    with open(season.odds_path, "w") as f:
+        json.dump(the_odds_json, f)
+    with open(season.scores_path, "w") as f:
+        json.dump(make_scores_json(the_odds_json), f)
+    parsed_cache_dir = os.path.join(archive_dir, "parsed_games")
+    backtest_season(season=season, configs=[BacktestConfig()], cache_dir=parsed_cache_dir)
+
+    def read_fields(field: str) -> Callable[[], None]:
+        return lambda: [getattr(game, field) for game in games]
+
+    stages = {
+        "parse_the_odds_json": (lambda: parse_the_odds_json(the_odds_json), None),
+        "get_this_weeks_games": (lambda: get_this_weeks_games(games), None),
+        "GameIndex.weeks": (lambda: GameIndex(games).weeks(), None),
+        "OddsTable.from_games": (lambda: OddsTable.from_games(games=games), None),
+        "compact_games": (lambda: compact_games(games), None),
+        "compact_table": (lambda: compact_table(compact), None),
+        "get_ranks": (lambda: [get_ranks(values=t.win_probability) for t in tables], None),
+        "get_ranks_all": (lambda: get_ranks(values=win_probs), None),
+        "sheet_write": (lambda: write_weeks(tables), None),
+        "simulate_season": (lambda: simulate_season(tables), None),
+        "backtest_season": (
+            lambda: backtest_season(season=season, configs=[BacktestConfig()]),
+            None,
+        ),
+        "backtest_season_warm_cache": (
+            lambda: backtest_season(
+                season=season, configs=[BacktestConfig()], cache_dir=parsed_cache_dir
+            ),
+            None,
+        ),
+    }
+    for field in COMPUTED_FIELDS:
+        stages[f"GameOdds.{field}"] = (
+            read_fields(field),
+            lambda: [game.clear_memoized() for game in games],
+        )
+
+    results = {}
+    for stage, (func, setup) in stages.items():
+        seconds = time_it(func, repeats=repeats, setup=setup)
+        results[f"{stage}[{name}]"] = {
+            "seconds": seconds,
+            "games": n_games,
+            "bookmakers": n_bookmakers,
+            "games_per_second": n_games / seconds if seconds else None,
+        }
+        logger.info(f"{stage}[{name}]: {seconds * 1e3:.2f} ms ({n_games} games)")
+
+    # Memory held per game by the pydantic models versus the compact representation
+    memory_stages = {
+        "parse_the_odds_json": lambda: parse_the_odds_json(the_odds_json),
+        "compact_games": lambda: compact_games(games),
+    }
+    for stage, build in memory_stages.items():
+        results[f"{stage}[{name}]"]["bytes_per_game"] = bytes_per_item(build)
+        logger.info(
+            f"{stage}[{name}]: {results[f'{stage}[{name}]']['bytes_per_game']:.0f} bytes per game"
+        )
+    shutil.rmtree(archive_dir)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Compare results to a baseline and return the stages which slowed down
+
+    Args:
+        results (Dict[str, Dict]): Current results
+        baseline (Dict[str, Dict]): Baseline results
+        threshold (float): Slowdown ratio counted as a regression
+
+    Returns:
+        List[str]: Stages slower than threshold x baseline
+    """
+    regressions = []
+    for stage, result in results.items():
+        if stage not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[stage]["seconds"]
+        result["baseline_ratio"] = ratio
+        if ratio > threshold:
+            regressions.append(stage)
+            logger.warning(f"{stage} regressed: {ratio:.2f}x baseline")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pick pipeline hot paths")
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        choices=list(SCALES),
+        default=["week", "season"],
+        help="Input scales to benchmark",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats per stage")
+    parser.add_argument("--output", type=str, default=None, help="Path to write results JSON")
+    parser.add_argument("--baseline", type=str, default=None, help="Baseline results JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="Slowdown ratio versus the baseline counted as a regression",
+    )
+    args = parser.parse_args()
+
+    # Keep per-call logging (e.g. from SheetWriter.flush) out of the timings
+    logger.disable("nfl_confidence")
+    results = {}
+    for scale in args.scales:
+        n_weeks, n_bookmakers = SCALES[scale]
+        results.update(run_scale(scale, n_weeks, n_bookmakers, repeats=args.repeats))
+
+    regressions = []
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, threshold=args.threshold)
+
+    if args.output is not None:
+        report = {
+            "meta": {
+                "created_at": datetime.now(tz=timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+            "regressions": regressions,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"Wrote results to {args.output}")
+
+    if regressions:
+        logger.error(f"{len(regressions)} stages regressed: {regressions}")
+        exit(1)
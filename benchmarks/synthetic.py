@@ -0,0 +1,135 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from nfl_confidence.odds import get_valid_team_names
+
+# Kickoff of the first synthetic season (a Thursday)
+FIRST_KICKOFF = datetime(2014, 9, 4, 20, 20, tzinfo=timezone.utc)
+GAMES_PER_WEEK = 16
+WEEKS_PER_SEASON = 18
+
+
+def probability_to_american(prob: float) -> int:
+    """Convert an implied win probability into American moneyline odds
+
+    Args:
+        prob (float): Implied win probability, strictly between 0 and 1
+
+    Returns:
+        int: American odds
+    """
+    if prob >= 0.5:
+        return -int(round(100 * prob / (1 - prob)))
+    return int(round(100 * (1 - prob) / prob))
+
+
+def _timestamp(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_the_odds_json(
+    n_weeks: int, n_bookmakers: int, games_per_week: int = GAMES_PER_WEEK, seed: int = 0
+) -> List[Dict]:
+    """Generate a synthetic the-odds API response with the same shape as the real one
+
+    Args:
+        n_weeks (int): Number of weeks of games
+        n_bookmakers (int): Number of bookmakers quoting every game
+        games_per_week (int, optional): Games per week. Defaults to GAMES_PER_WEEK.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        List[Dict]: Synthetic the-odds API response
+    """
+    rng = random.Random(seed)
+    teams = sorted(get_valid_team_names())
+    games = []
+    for week in range(n_weeks):
+        season, week_of_season = divmod(week, WEEKS_PER_SEASON)
+        kickoff = FIRST_KICKOFF + timedelta(weeks=52 * season + week_of_season)
+        for game_idx in range(games_per_week):
+            home_team, away_team = rng.sample(teams, 2)
+            # Thursday night opener, everything else on Sunday
+            days = 0 if game_idx == 0 else 3
+            commence_time = kickoff + timedelta(days=days, hours=game_idx % 3)
+            last_update = _timestamp(commence_time - timedelta(hours=12))
+            home_prob = rng.uniform(0.2, 0.8)
+            bookmakers = []
+            for book_idx in range(n_bookmakers):
+                book_prob = min(max(home_prob + rng.gauss(0, 0.01), 0.05), 0.95)
+                vig = rng.uniform(0.02, 0.05)
+                outcomes = [
+                    {
+                        "name": away_team.replace("-", " ").title(),
+                        "price": probability_to_american((1 - book_prob) * (1 + vig)),
+                    },
+                    {
+                        "name": home_team.replace("-", " ").title(),
+                        "price": probability_to_american(book_prob * (1 + vig)),
+                    },
+                ]
+                bookmakers.append(
+                    {
+                        "key": f"book_{book_idx}",
+                        "title": f"Book {book_idx}",
+                        "last_update": last_update,
+                        "markets": [
+                            {"key": "h2h", "last_update": last_update, "outcomes": outcomes}
+                        ],
+                    }
+                )
+            games.append(
+                {
+                    "id": f"{week:04d}{game_idx:02d}{rng.getrandbits(96):024x}",
+                    "sport_key": "americanfootball_nfl",
+                    "sport_title": "NFL",
+                    "commence_time": _timestamp(commence_time),
+                    "home_team": home_team.replace("-", " ").title(),
+                    "away_team": away_team.replace("-", " ").title(),
+                    "bookmakers": bookmakers,
+                }
+            )
+    return games
+
+
+def make_scores_json(the_odds_json: List[Dict], seed: int = 0) -> List[Dict]:
+    """Generate the-odds scores endpoint results for synthetic games, drawing each winner from the
+    first bookmaker's implied home win probability
+
+    Args:
+        the_odds_json (List[Dict]): Synthetic the-odds API response, from make_the_odds_json
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        List[Dict]: Synthetic the-odds scores API response
+    """
+    rng = random.Random(seed)
+    results = []
+    for game in the_odds_json:
+        away, home = game["bookmakers"][0]["markets"][0]["outcomes"]
+        away_prob, home_prob = (
+            (-price if price < 0 else 100) / (abs(price) + 100)
+            for price in (away["price"], home["price"])
+        )
+        home_wins = rng.random() < home_prob / (home_prob + away_prob)
+        winner_score, loser_score = rng.randint(17, 38), rng.randint(0, 16)
+        home_score, away_score = (
+            (winner_score, loser_score) if home_wins else (loser_score, winner_score)
+        )
+        results.append(
+            {
+                "id": game["id"],
+                "sport_key": game["sport_key"],
+                "commence_time": game["commence_time"],
+                "completed": True,
+                "home_team": game["home_team"],
+                "away_team": game["away_team"],
+                "scores": [
+                    {"name": game["home_team"], "score": str(home_score)},
+                    {"name": game["away_team"], "score": str(away_score)},
+                ],
+                "last_update": game["commence_time"],
+            }
+        )
+    return results
@@ -0,0 +1,240 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from nfl_confidence.cache import QuotaState, ResponseCache, parse_quota_headers
+
+
+class SnapshotNotFoundError(LookupError):
+    """Raised when the archive holds no response to a request at or before the replay time"""
+
+
+class ArchiveEntry(BaseModel):
+    fetched_at: datetime  # When the response was received
+    sport: str  # the-odds sport key
+    params: Dict[str, str]  # Request params, without the API key
+    quota: QuotaState  # Quota reported by the response headers
+    digest: str  # sha256 of the response's canonical JSON, naming its object file
+
+
+def canonical_json(response: Any) -> bytes:
+    """Serialize a response with sorted keys and no whitespace, so equal responses hash equally
+
+    Args:
+        response (Any): Response JSON
+
+    Returns:
+        bytes: Canonical UTF-8 JSON
+    """
+    return json.dumps(response, sort_keys=True, separators=(",", ":")).encode()
+
+
+def odds_params(
+    odds_format: str = "american", regions: str = "us", markets: str = "h2h"
+) -> Dict[str, str]:
+    """Request params of a the-odds odds request, as sent by odds.get_the_odds_json
+
+    Args:
+        odds_format (str, optional): Format for odds. Defaults to "american".
+        regions (str, optional): Comma separated bookmaker regions. Defaults to "us".
+        markets (str, optional): Comma separated markets. Defaults to "h2h".
+
+    Returns:
+        Dict[str, str]: Request params, without the API key
+    """
+    return {"regions": regions, "markets": markets, "oddsFormat": odds_format}
+
+
+class ResponseArchive:
+    """Append-only, content-addressed archive of the-odds API responses for exact, offline replay.
+
+    Each distinct response body is stored once, gzip compressed, under objects/ named by the sha256
+    of its canonical JSON. index.jsonl gets one ArchiveEntry line per recorded fetch with its time,
+    request and quota. A fetch identical to the previous one for the same request adds nothing,
+    so frequent polling of unchanged odds does not grow the archive.
+    """
+
+    def __init__(self, archive_dir: str):
+        """
+        Args:
+            archive_dir (str): Directory holding the archive, created if needed
+        """
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        self._last_digest: Optional[Dict[str, str]] = None
+        os.makedirs(os.path.join(archive_dir, "objects"), exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["ResponseArchive"]:
+        """Build the archive configured by the settings, or None if recording is disabled
+
+        Args:
+            settings (Settings): nfl_confidence settings
+
+        Returns:
+            Optional[ResponseArchive]: Response archive, None if THE_ODDS_ARCHIVE_DIR is unset
+        """
+        if not settings.THE_ODDS_ARCHIVE_DIR:
+            return None
+        return cls(archive_dir=settings.THE_ODDS_ARCHIVE_DIR)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.archive_dir, "objects", digest[:2], f"{digest}.json.gz")
+
+    def _write_object(self, digest: str, body: bytes) -> None:
+        """Atomically store a response body, unless the same content is already stored"""
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(body, mtime=0))
+        os.replace(tmp_path, path)
+
+    def entries(
+        self, sport: Optional[str] = None, params: Optional[Mapping[str, str]] = None
+    ) -> List[ArchiveEntry]:
+        """Every recorded fetch, optionally only those of one request, in fetch order
+
+        Args:
+            sport (Optional[str], optional): Keep only this sport. Defaults to every sport.
+            params (Optional[Mapping[str, str]], optional): Keep only requests with these params.
+                Defaults to every request.
+
+        Returns:
+            List[ArchiveEntry]: Index entries sorted by fetched_at
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r") as f:
+            entries = [ArchiveEntry.model_validate_json(line) for line in f if line.strip()]
+        if sport is not None:
+            entries = [entry for entry in entries if entry.sport == sport]
+        if params is not None:
+            params = {k: v for k, v in params.items() if k != "apiKey"}
+            entries = [entry for entry in entries if entry.params == params]
+        return sorted(entries, key=lambda entry: entry.fetched_at)
+
+    def load(self, digest: str) -> List[Dict[str, Any]]:
+        """Read a stored response body
+
+        Args:
+            digest (str): Digest of the response, from its ArchiveEntry
+
+        Returns:
+            List[Dict[str, Any]]: Response JSON
+        """
+        return json.loads(self.load_bytes(digest))
+
+    def load_bytes(self, digest: str) -> bytes:
+        """Read a stored response body without decoding it
+
+        Args:
+            digest (str): Digest of the response, from its ArchiveEntry
+
+        Returns:
+            bytes: Canonical JSON of the response
+        """
+        with open(self._object_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def record(
+        self,
+        sport: str,
+        params: Mapping[str, str],
+        response: List[Dict[str, Any]],
+        headers: Mapping[str, str],
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """Archive a response, skipping it if it is identical to the request's previous response
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+            response (List[Dict[str, Any]]): Response JSON
+            headers (Mapping[str, str]): Response headers, for the quota
+            now (Optional[datetime], optional): Time the response was received. Defaults to the
+                system clock.
+
+        Returns:
+            bool: True if an entry was appended, False for a duplicate of the previous response
+        """
+        now = now or datetime.now(tz=timezone.utc)
+        body = canonical_json(response)
+        digest = hashlib.sha256(body).hexdigest()
+        key = ResponseCache.key(sport=sport, params=params)
+        with self._lock:
+            if self._last_digest is None:
+                self._last_digest = {
+                    ResponseCache.key(sport=entry.sport, params=entry.params): entry.digest
+                    for entry in self.entries()
+                }
+            if self._last_digest.get(key) == digest:
+                logger.debug("the-odds response unchanged since the last archived snapshot")
+                return False
+            self._write_object(digest, body)
+            entry = ArchiveEntry(
+                fetched_at=now,
+                sport=sport,
+                params={k: v for k, v in params.items() if k != "apiKey"},
+                quota=parse_quota_headers(headers=headers, now=now),
+                digest=digest,
+            )
+            with open(self.index_path, "a") as f:
+                f.write(entry.model_dump_json() + "\n")
+            self._last_digest[key] = digest
+        logger.debug(f"Archived the-odds response {digest[:12]}")
+        return True
+
+    def snapshots(
+        self,
+        sport: str = "americanfootball_nfl",
+        params: Optional[Mapping[str, str]] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+    ) -> Iterator[Tuple[ArchiveEntry, List[Dict[str, Any]]]]:
+        """Stream one request's archived responses in fetch order
+
+        Args:
+            sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+            params (Optional[Mapping[str, str]], optional): Request params. Defaults to
+                odds_params().
+            after (Optional[datetime], optional): Inclusive start. Defaults to unbounded.
+            before (Optional[datetime], optional): Exclusive end. Defaults to unbounded.
+
+        Yields:
+            Iterator[Tuple[ArchiveEntry, List[Dict[str, Any]]]]: Entry and response JSON
+        """
+        for entry in self.entries(sport=sport, params=params or odds_params()):
+            if after is not None and entry.fetched_at < after:
+                continue
+            if before is not None and entry.fetched_at >= before:
+                continue
+            yield entry, self.load(entry.digest)
+
+    def export(self, path: str, **kwargs) -> int:
+        """Write one request's archived responses as gzipped JSON-lines, one response per line,
+        e.g. for Season.odds_path in a backtest
+
+        Args:
+            path (str): Destination path
+            **kwargs: Passed to snapshots, e.g. sport, params, after and before
+
+        Returns:
+            int: Number of responses written
+        """
+        n_snapshots = 0
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for _, response in self.snapshots(**kwargs):
+                f.write(json.dumps(response) + "\n")
+                n_snapshots += 1
+        return n_snapshots
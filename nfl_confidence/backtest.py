@@ -0,0 +1,246 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel
+
+from nfl_confidence.compact import CompactGame, compact_games, compact_table
+from nfl_confidence.game_cache import ParsedGameCache
+from nfl_confidence.odds import GameOdds, OddsTable, parse_the_odds_json
+from nfl_confidence.probability import DevigMethod
+from nfl_confidence.schedule import GameIndex
+from nfl_confidence.scores import GameResult, load_results
+from nfl_confidence.stream import iter_json_values
+from nfl_confidence.utils import assign_confidence
+from nfl_confidence.weights import BookmakerWeights
+
+
+class BacktestConfig(BaseModel):
+    name: str = "proportional"  # Label for this configuration in the results
+    devig_method: DevigMethod = DevigMethod.PROPORTIONAL  # How each bookmaker's margin is removed
+    max_confidence: int = 16  # Confidence value of the most confident game each week
+    bookmaker_weights_path: Optional[str] = None  # Fitted BookmakerWeights, else a plain average
+
+
+class Season(BaseModel):
+    name: str  # Label for the season in the results, e.g. "2023"
+    odds_path: str  # Archive of the-odds odds responses taken during the season
+    scores_path: str  # Archive of the-odds scores responses with the final results
+
+
+def _last_update(game_json: Dict) -> str:
+    # the-odds timestamps share one ISO 8601 format, so they compare correctly as strings
+    return max(
+        (bookmaker["last_update"] for bookmaker in game_json["bookmakers"]),
+        default="",
+    )
+
+
+def closing_lines(odds_path: str) -> List[GameOdds]:
+    """Find each game's closing line: its latest odds published before kickoff. The archive is
+    decoded as raw JSON and only the closing version of each game is parsed, so the cost of
+    replaying many snapshots is dominated by JSON decoding.
+
+    Args:
+        odds_path (str): JSON or JSON-lines archive of the-odds odds responses, gzip included
+
+    Returns:
+        List[GameOdds]: Closing line of every game, ordered by commence time then ID
+    """
+    closing: Dict[str, Tuple[str, Dict]] = {}
+    for game in iter_json_values(path=odds_path, stream_arrays=True):
+        last_update = _last_update(game)
+        if not game["bookmakers"] or last_update > game["commence_time"]:
+            continue
+        if last_update >= closing.get(game["id"], ("",))[0]:
+            closing[game["id"]] = (last_update, game)
+    games = parse_the_odds_json(the_odds_json=[game for _, game in closing.values()])
+    return GameIndex(games).games
+
+
+def load_closing_lines(odds_path: str, cache_dir: Optional[str] = None) -> List[CompactGame]:
+    """Closing lines of an archive as compact games. With a cache, an archive replayed before is
+    loaded from its parsed games without decoding or validating anything.
+
+    Args:
+        odds_path (str): JSON or JSON-lines archive of the-odds odds responses, gzip included
+        cache_dir (Optional[str], optional): ParsedGameCache directory. Defaults to no cache.
+
+    Returns:
+        List[CompactGame]: Closing line of every game, ordered by commence time then ID
+    """
+    if cache_dir is None:
+        return compact_games(closing_lines(odds_path=odds_path))
+    cache = ParsedGameCache(cache_dir=cache_dir)
+    key = cache.file_key(odds_path, "closing_lines")
+    games = cache.get(key)
+    if games is None:
+        games = compact_games(closing_lines(odds_path=odds_path))
+        cache.put(key, games)
+    return games
+
+
+def training_data(
+    seasons: List[Season],
+    devig_method: DevigMethod = DevigMethod.PROPORTIONAL,
+    cache_dir: Optional[str] = None,
+) -> Tuple[OddsTable, np.ndarray]:
+    """Collect the closing lines of every decided game across seasons into a single table, for
+    fitting bookmaker weights. Ties and games without a final result are left out.
+
+    Args:
+        seasons (List[Season]): Season archives
+        devig_method (DevigMethod, optional): Method used to remove each bookmaker's margin.
+            Defaults to proportional.
+        cache_dir (Optional[str], optional): ParsedGameCache directory. Defaults to no cache.
+
+    Returns:
+        Tuple[OddsTable, np.ndarray]: Games, and whether the home team won each one
+    """
+    games, home_won = [], []
+    for season in seasons:
+        results = load_results(path=season.scores_path)
+        for game in load_closing_lines(odds_path=season.odds_path, cache_dir=cache_dir):
+            result = results.get(game.id)
+            if result is not None and result.winner is not None:
+                games.append(game)
+                home_won.append(result.winner == game.home_team)
+    table = compact_table(games=games, devig_method=devig_method)
+    return table, np.array(home_won, dtype=bool)
+
+
+def score_week(
+    table: OddsTable, results: Dict[str, GameResult], max_confidence: int = 16
+) -> Dict[str, float]:
+    """Rank a week of games and score the picks with confidence league rules: a correct pick
+    earns its confidence value, anything else earns nothing
+
+    Args:
+        table (OddsTable): The week's games
+        results (Dict[str, GameResult]): Final results keyed by game ID
+        max_confidence (int, optional): Confidence value of the most confident game. Defaults to
+            16.
+
+    Returns:
+        Dict[str, float]: Games, settled games, correct picks, points, expected points under the
+            model and points available from the settled games
+    """
+    confidence = assign_confidence(values=table.win_probability, max_confidence=max_confidence)
+    winners = [
+        results[game_id].winner if game_id in results else None for game_id in table.game_ids
+    ]
+    settled = np.array(
+        [game_id in results and results[game_id].completed for game_id in table.game_ids]
+    )
+    correct = np.array(
+        [
+            winner is not None and pick == winner
+            for pick, winner in zip(table.predicted_winner, winners)
+        ]
+    )
+    return {
+        "games": len(table),
+        "settled": int(settled.sum()),
+        "correct": int(correct.sum()),
+        "points": int(np.sum(confidence * correct)),
+        "expected_points": float(np.sum(confidence * table.win_probability)),
+        "possible_points": int(np.sum(confidence * settled)),
+    }
+
+
+def backtest_season(
+    season: Season, configs: List[BacktestConfig], cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """Replay every week of a season through the ranking pipeline for each configuration. Weeks
+    are numbered by the NFL week they fall in counting from the season opener's, so weeks missing
+    from the archive leave gaps rather than renumbering the rest.
+
+    Args:
+        season (Season): Season archives
+        configs (List[BacktestConfig]): Configurations to evaluate
+        cache_dir (Optional[str], optional): ParsedGameCache directory. Defaults to no cache.
+
+    Returns:
+        pd.DataFrame: One row per configuration and week
+    """
+    games = load_closing_lines(odds_path=season.odds_path, cache_dir=cache_dir)
+    results = load_results(path=season.scores_path)
+    weeks = GameIndex(games).weeks()
+    opener_week_start = next(iter(weeks), None)
+
+    rows = []
+    for config in configs:
+        weights = None
+        if config.bookmaker_weights_path is not None:
+            weights = BookmakerWeights.load(config.bookmaker_weights_path).weights
+        for week_start, week_games in weeks.items():
+            table = compact_table(
+                games=week_games, devig_method=config.devig_method, bookmaker_weights=weights
+            )
+            rows.append(
+                {
+                    "config": config.name,
+                    "season": season.name,
+                    "week": (week_start - opener_week_start).days // 7 + 1,
+                    "week_start": week_start,
+                    **score_week(
+                        table=table, results=results, max_confidence=config.max_confidence
+                    ),
+                }
+            )
+    logger.info(f"Backtested season {season.name}: {len(weeks)} weeks, {len(games)} games")
+    return pd.DataFrame(rows)
+
+
+def backtest(
+    seasons: List[Season],
+    configs: Optional[List[BacktestConfig]] = None,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """Backtest several configurations over several seasons, one season per worker process.
+    Each worker parses its season once and evaluates every configuration on it.
+
+    Args:
+        seasons (List[Season]): Season archives
+        configs (Optional[List[BacktestConfig]], optional): Configurations to evaluate. Defaults
+            to the default BacktestConfig.
+        max_workers (Optional[int], optional): Worker processes. Defaults to one per season, up
+            to the number of CPUs. With 1, seasons run in this process.
+        cache_dir (Optional[str], optional): ParsedGameCache directory, so seasons replayed
+            before skip parsing. Defaults to no cache.
+
+    Returns:
+        pd.DataFrame: One row per configuration, season and week
+    """
+    configs = configs or [BacktestConfig()]
+    run_season = partial(backtest_season, configs=configs, cache_dir=cache_dir)
+    if max_workers == 1 or len(seasons) <= 1:
+        frames = [run_season(season) for season in seasons]
+    else:
+        max_workers = max_workers or min(len(seasons), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(run_season, seasons))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarize(weeks: pd.DataFrame) -> pd.DataFrame:
+    """Total the weekly backtest rows per configuration and season
+
+    Args:
+        weeks (pd.DataFrame): Output of backtest
+
+    Returns:
+        pd.DataFrame: Points, expected points and accuracy per configuration and season, with an
+            "all" season totalling every season
+    """
+    columns = ["games", "settled", "correct", "points", "expected_points", "possible_points"]
+    per_season = weeks.groupby(["config", "season"])[columns].sum().reset_index()
+    overall = weeks.groupby("config")[columns].sum().reset_index().assign(season="all")
+    summary = pd.concat([per_season, overall], ignore_index=True)
+    summary["accuracy"] = summary.correct / summary.settled
+    return summary
@@ -0,0 +1,155 @@
+from itertools import combinations
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from nfl_confidence.metrics import timed
+
+# Weight vectors scored at a time; memory use is about chunk_size x weeks x games x 24 bytes
+CHUNK_SIZE = 2**12
+
+# Weekly source probabilities, (weeks, games, sources), and whether each game's pick was correct,
+# (weeks, games). Weeks with fewer games are padded with -inf probabilities and 0 outcomes.
+WeekArrays = Tuple[np.ndarray, np.ndarray]
+
+
+def stack_weeks(
+    frames: Mapping[str, pd.DataFrame], sources: Sequence[str], outcome: str = "was_correct"
+) -> WeekArrays:
+    """Load every week's source probabilities and outcomes into padded arrays, so blends can be
+    scored over the whole season at once
+
+    Args:
+        frames (Mapping[str, pd.DataFrame]): One frame per week, with a column per source and an
+            outcome column
+        sources (Sequence[str]): Probability source columns to blend
+        outcome (str, optional): Column saying whether each game's pick was correct. Defaults
+            to "was_correct".
+
+    Raises:
+        ValueError: If a week is missing a source column or has blank values
+
+    Returns:
+        WeekArrays: Source probabilities and outcomes of each week
+    """
+    max_games = max((len(df) for df in frames.values()), default=0)
+    probabilities = np.full((len(frames), max_games, len(sources)), -np.inf)
+    correct = np.zeros((len(frames), max_games))
+    for i, (week, df) in enumerate(frames.items()):
+        missing = set(sources) - set(df.columns)
+        if outcome not in df.columns:
+            missing.add(outcome)
+        if missing:
+            raise ValueError(f"'{week}' is missing columns {sorted(missing)}")
+        values = df[list(sources)].to_numpy(dtype=float)
+        outcomes = df[outcome].to_numpy(dtype=float)
+        if np.isnan(values).any() or np.isnan(outcomes).any():
+            raise ValueError(f"'{week}' has blank source probabilities or outcomes")
+        probabilities[i, : len(df)] = values
+        correct[i, : len(df)] = outcomes
+    return probabilities, correct
+
+
+def simplex_grid(n_sources: int, resolution: float = 0.01) -> np.ndarray:
+    """Every weight vector over n_sources whose weights are multiples of resolution and sum to 1
+
+    Args:
+        n_sources (int): Number of sources to blend
+        resolution (float, optional): Step between weights. Defaults to 0.01.
+
+    Raises:
+        ValueError: If resolution does not divide 1 into a whole number of steps
+
+    Returns:
+        np.ndarray: (n_weights, n_sources) weight vectors
+    """
+    steps = int(round(1 / resolution))
+    if steps < 1 or not np.isclose(steps * resolution, 1):
+        raise ValueError(f"Resolution must divide 1 into whole steps, got {resolution}")
+    if n_sources == 1:
+        return np.ones((1, 1))
+
+    # Stars and bars: each choice of n_sources - 1 bar positions among steps + n_sources - 1 slots
+    # splits the steps into n_sources parts
+    bars = np.array(list(combinations(range(steps + n_sources - 1), n_sources - 1)))
+    edges = np.column_stack(
+        [np.full(len(bars), -1), bars, np.full(len(bars), steps + n_sources - 1)]
+    )
+    return (np.diff(edges, axis=1) - 1) / steps
+
+
+def week_points(weights: np.ndarray, probabilities: np.ndarray, correct: np.ndarray) -> np.ndarray:
+    """Points each blend scores each week, ranking every week's games by blended probability
+    with the most confident game worth as many points as the week has games
+
+    Args:
+        weights (np.ndarray): (n_weights, n_sources) weight vectors
+        probabilities (np.ndarray): (weeks, games, sources) source probabilities from stack_weeks
+        correct (np.ndarray): (weeks, games) outcomes from stack_weeks
+
+    Returns:
+        np.ndarray: (n_weights, weeks) points
+    """
+    # Padded games blend to -inf, so they take the lowest ranks and shift the real games' ranks
+    # up by the number of padded games in their week
+    padded = np.isneginf(probabilities[..., 0])
+    blended = np.einsum("wgs,ks->kwg", np.where(padded[..., None], 0, probabilities), weights)
+    blended[:, padded] = -np.inf
+    ranks = np.argsort(np.argsort(blended, axis=-1, kind="stable"), axis=-1)
+    confidence = ranks + 1 - padded.sum(axis=-1)[:, None]
+    return np.einsum("kwg,wg->kw", confidence, correct)
+
+
+@timed("blend_search")
+def search_blends(
+    probabilities: np.ndarray,
+    correct: np.ndarray,
+    sources: Sequence[str],
+    weights: Optional[np.ndarray] = None,
+    resolution: float = 0.01,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Score blends of the sources over every week at once
+
+    Args:
+        probabilities (np.ndarray): (weeks, games, sources) source probabilities from stack_weeks
+        correct (np.ndarray): (weeks, games) outcomes from stack_weeks
+        sources (Sequence[str]): Source names, in the order of the last probabilities axis
+        weights (Optional[np.ndarray], optional): (n_weights, n_sources) weight vectors to score.
+            Defaults to the simplex grid at the given resolution.
+        resolution (float, optional): Step of the default weight grid. Defaults to 0.01.
+        chunk_size (int, optional): Weight vectors per chunk. Defaults to CHUNK_SIZE.
+
+    Returns:
+        pd.DataFrame: One row per weight vector with the weight of each source, the season's
+            points and the variance of the weekly points
+    """
+    if weights is None:
+        weights = simplex_grid(n_sources=len(sources), resolution=resolution)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    points = np.concatenate(
+        [
+            week_points(chunk, probabilities, correct)
+            for chunk in np.array_split(weights, range(chunk_size, len(weights), chunk_size))
+        ]
+    )
+    results = pd.DataFrame(weights, columns=list(sources))
+    results["points"] = points.sum(axis=1)
+    results["variance"] = points.var(axis=1)
+    return results
+
+
+def pareto_front(results: pd.DataFrame) -> pd.DataFrame:
+    """Keep the blends no other blend beats on both points and variance
+
+    Args:
+        results (pd.DataFrame): Output of search_blends
+
+    Returns:
+        pd.DataFrame: Non-dominated blends, most points first
+    """
+    order = np.lexsort((results["variance"].to_numpy(), -results["points"].to_numpy()))
+    variance = results["variance"].to_numpy()[order]
+    lowest_so_far = np.concatenate([[np.inf], np.minimum.accumulate(variance)[:-1]])
+    return results.iloc[order[variance < lowest_so_far]]
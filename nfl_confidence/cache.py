@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a request to the-odds API would exhaust the remaining request quota"""
+
+
+class QuotaState(BaseModel):
+    requests_remaining: Optional[int] = None
+    requests_used: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+class CachedResponse(BaseModel):
+    fetched_at: datetime
+    sport: str
+    params: Dict[str, str]
+    quota: QuotaState
+    response: List[Dict[str, Any]]
+
+
+def parse_quota_headers(headers: Mapping[str, str], now: datetime) -> QuotaState:
+    """Read the quota usage headers from a the-odds API response
+
+    Args:
+        headers (Mapping[str, str]): Response headers
+        now (datetime): Time the response was received
+
+    Returns:
+        QuotaState: Remaining and used requests, None where a header is missing
+    """
+    remaining = headers.get("x-requests-remaining")
+    used = headers.get("x-requests-used")
+    return QuotaState(
+        requests_remaining=None if remaining is None else int(float(remaining)),
+        requests_used=None if used is None else int(float(used)),
+        updated_at=now,
+    )
+
+
+def request_cost(params: Mapping[str, str]) -> int:
+    """Number of quota requests a the-odds odds request costs (markets x regions)
+
+    Args:
+        params (Mapping[str, str]): Request params with comma separated "regions" and "markets"
+
+    Returns:
+        int: Quota cost of the request
+    """
+    n_regions = len(params.get("regions", "us").split(","))
+    n_markets = len(params.get("markets", "h2h").split(","))
+    return n_regions * n_markets
+
+
+class ResponseCache:
+    """Persistent on-disk cache of the-odds API responses with a time-to-live, which also tracks
+    the account's request quota from the x-requests-remaining/x-requests-used headers"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = 300.0,
+        min_requests_remaining: int = 0,
+        raise_on_low_quota: bool = True,
+    ):
+        """
+        Args:
+            cache_dir (str): Directory to store cached responses in
+            ttl (float, optional): Seconds a cached response stays fresh. Defaults to 300.
+            min_requests_remaining (int, optional): Requests to keep in reserve; a request that
+                would leave fewer remaining is refused or warned about. Defaults to 0.
+            raise_on_low_quota (bool, optional): Raise QuotaExceededError instead of only logging a
+                warning when the quota would run out. Defaults to True.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.min_requests_remaining = min_requests_remaining
+        self.raise_on_low_quota = raise_on_low_quota
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["ResponseCache"]:
+        """Build the cache configured by the settings, or None if caching is disabled
+
+        Args:
+            settings (Settings): nfl_confidence settings
+
+        Returns:
+            Optional[ResponseCache]: Response cache, None if THE_ODDS_CACHE_DIR is unset
+        """
+        if not settings.THE_ODDS_CACHE_DIR:
+            return None
+        return cls(
+            cache_dir=settings.THE_ODDS_CACHE_DIR,
+            ttl=settings.THE_ODDS_CACHE_TTL,
+            min_requests_remaining=settings.THE_ODDS_MIN_REQUESTS_REMAINING,
+        )
+
+    @staticmethod
+    def key(sport: str, params: Mapping[str, str]) -> str:
+        """Cache key for a request, ignoring the API key
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        request = {"sport": sport, **{k: v for k, v in params.items() if k != "apiKey"}}
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _write(self, name: str, model: BaseModel) -> None:
+        """Atomically write a model to the cache directory"""
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(model.model_dump_json())
+        os.replace(tmp_path, path)
+
+    def get(
+        self, sport: str, params: Mapping[str, str], now: Optional[datetime] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached response for a request if it is still fresh
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+            now (Optional[datetime], optional): Current time. Defaults to the system clock.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached response JSON, None on a miss or stale entry
+        """
+        path = self._path(self.key(sport=sport, params=params))
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            entry = CachedResponse.model_validate_json(f.read())
+        now = now or datetime.now(tz=timezone.utc)
+        age = (now - entry.fetched_at).total_seconds()
+        if age >= self.ttl:
+            return None
+        logger.info(f"Using cached the-odds response from {age:.0f}s ago")
+        return entry.response
+
+    def put(
+        self,
+        sport: str,
+        params: Mapping[str, str],
+        response: List[Dict[str, Any]],
+        headers: Mapping[str, str],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Store a response and the quota usage reported in its headers
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+            response (List[Dict[str, Any]]): Response JSON
+            headers (Mapping[str, str]): Response headers
+            now (Optional[datetime], optional): Time the response was received. Defaults to the
+                system clock.
+        """
+        now = now or datetime.now(tz=timezone.utc)
+        quota = parse_quota_headers(headers=headers, now=now)
+        entry = CachedResponse(
+            fetched_at=now,
+            sport=sport,
+            params={k: v for k, v in params.items() if k != "apiKey"},
+            quota=quota,
+            response=response,
+        )
+        self._write(self.key(sport=sport, params=params), entry)
+        if quota.requests_remaining is not None:
+            self._write("quota", quota)
+            logger.info(
+                f"the-odds quota: {quota.requests_remaining} requests remaining, "
+                f"{quota.requests_used} used"
+            )
+
+    def quota(self) -> QuotaState:
+        """Return the last known request quota
+
+        Returns:
+            QuotaState: Last reported quota, empty if no response has been cached yet
+        """
+        path = self._path("quota")
+        if not os.path.exists(path):
+            return QuotaState()
+        with open(path, "r") as f:
+            return QuotaState.model_validate_json(f.read())
+
+    def check_quota(self, cost: int = 1) -> None:
+        """Refuse (or warn about) a request that would leave fewer than min_requests_remaining
+
+        Args:
+            cost (int, optional): Quota cost of the request. Defaults to 1.
+
+        Raises:
+            QuotaExceededError: If the request would exhaust the quota and raise_on_low_quota
+        """
+        remaining = self.quota().requests_remaining
+        if remaining is None or remaining - cost >= self.min_requests_remaining:
+            return
+        message = (
+            f"Request costing {cost} would leave {remaining - cost} the-odds requests, below the "
+            f"reserve of {self.min_requests_remaining}"
+        )
+        if self.raise_on_low_quota:
+            raise QuotaExceededError(message)
+        logger.warning(message)
@@ -0,0 +1,511 @@
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+# Subcommand name -> module under nfl_confidence.commands implementing run(args). Modules are only
+# imported once their subcommand is chosen, so startup does not pay for pandas, gspread, etc.
+COMMANDS = {
+    "print": "print_confidence",
+    "write-sheet": "write_sheet",
+    "update-sheet": "update_sheet",
+    "compare": "compare_sources",
+    "plot": "plot_league_results",
+    "watch": "watch",
+    "backtest": "backtest",
+    "optimize": "optimize",
+    "fit-weights": "fit_weights",
+    "export-archive": "export_archive",
+    "settle": "settle",
+}
+
+
+def add_print_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max_confidence",
+        metavar="m",
+        type=int,
+        required=False,
+        default=16,
+        help="Maximum confidence value for the week",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        required=False,
+        help="Whether to print the results column by column",
+    )
+    parser.add_argument("--skip_errors", dest="skip_errors", action="store_true")
+    parser.set_defaults(skip_errors=False)
+
+
+def add_write_sheet_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--config_path",
+        type=str,
+        default="scripts/initialize_week_sheets.yaml",
+        help="Path to the config file",
+    )
+
+
+def add_update_sheet_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--secret_path",
+        metavar="p",
+        type=str,
+        required=False,
+        default=None,
+        help="Directory containing google sheets secret",
+    )
+    parser.add_argument(
+        "--username",
+        metavar="u",
+        type=str,
+        default="lukeross",
+        help="Username for google sheets account",
+    )
+    parser.add_argument(
+        "--sheet",
+        metavar="s",
+        type=str,
+        required=False,
+        default="Luke NFL Confidence '23-'24",
+        help="Sheet name under the account",
+    )
+    parser.add_argument(
+        "--week",
+        metavar="w",
+        type=int,
+        required=True,
+        help="Week number to update",
+    )
+    parser.add_argument(
+        "--max_confidence",
+        metavar="m",
+        type=int,
+        required=False,
+        default=16,
+        help="Maximum confidence value for the week",
+    )
+
+
+def add_compare_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--secret_path",
+        metavar="p",
+        type=str,
+        required=False,
+        default=None,
+        help="Path to the google sheets secret",
+    )
+    parser.add_argument(
+        "--sheet",
+        metavar="s",
+        type=str,
+        default="Luke Confidence 21-22",
+        help="Sheet name with one tab per week of source probabilities",
+    )
+    parser.add_argument(
+        "--weeks",
+        metavar="n",
+        type=int,
+        default=4,
+        help="Number of weeks to score, starting from week 1",
+    )
+    parser.add_argument(
+        "--mus",
+        metavar="mu",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Score only these weights of the first source in a two source blend",
+    )
+    parser.add_argument(
+        "--sources",
+        metavar="c",
+        type=str,
+        nargs="+",
+        default=["espn", "538"],
+        help="Probability source columns to blend",
+    )
+    parser.add_argument(
+        "--resolution",
+        metavar="r",
+        type=float,
+        default=0.01,
+        help="Step between source weights in the blend search",
+    )
+
+
+def add_plot_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--year", metavar="y", type=int, default=2023, help="Season year to plot results for"
+    )
+    parser.add_argument(
+        "--results_dir",
+        type=str,
+        default="results",
+        help="Directory containing league_results_{year}.csv",
+    )
+    parser.add_argument(
+        "--images_dir", type=str, default="images", help="Directory to save the plots to"
+    )
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    add_update_sheet_arguments(parser)
+    parser.add_argument(
+        "--interval",
+        metavar="i",
+        type=float,
+        default=300.0,
+        help="Seconds between polls of the-odds API; set THE_ODDS_CACHE_TTL no higher than this",
+    )
+    parser.add_argument(
+        "--max_polls",
+        metavar="n",
+        type=int,
+        default=None,
+        help="Stop after this many polls. Defaults to polling until interrupted",
+    )
+
+
+def add_settle_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--secret_path",
+        metavar="p",
+        type=str,
+        required=False,
+        default=None,
+        help="Path to the google sheets secret",
+    )
+    parser.add_argument(
+        "--sheet",
+        metavar="s",
+        type=str,
+        required=False,
+        default="Luke NFL Confidence '23-'24",
+        help="Sheet name under the account",
+    )
+    parser.add_argument(
+        "--week",
+        metavar="w",
+        type=int,
+        required=True,
+        help="Week number to settle",
+    )
+    parser.add_argument(
+        "--pick_set",
+        dest="pick_sets",
+        nargs=4,
+        action="append",
+        default=[],
+        metavar=("WINNER_COL", "CONFIDENCE_COL", "CORRECT_COL", "POINTS_COL"),
+        help="Columns of a set of picks and of its grades. Repeat for more pick sets. Defaults to "
+        "predicted_winner confidence_rank was_correct points",
+    )
+    parser.add_argument(
+        "--scores_path",
+        type=str,
+        default=None,
+        help="Read scores once from this file of the-odds scores responses instead of the API",
+    )
+    parser.add_argument(
+        "--days_from",
+        metavar="d",
+        type=int,
+        default=3,
+        choices=[1, 2, 3],
+        help="Days of completed games to request from the-odds scores endpoint",
+    )
+    parser.add_argument(
+        "--interval",
+        metavar="i",
+        type=float,
+        default=600.0,
+        help="Seconds between polls for scores",
+    )
+    parser.add_argument(
+        "--max_polls",
+        metavar="n",
+        type=int,
+        default=None,
+        help="Stop after this many polls. Defaults to polling until every game settles",
+    )
+    parser.add_argument(
+        "--max_idle_polls",
+        metavar="n",
+        type=int,
+        default=36,
+        help="Stop after this many polls in a row settle no games",
+    )
+
+
+def add_backtest_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--season",
+        dest="seasons",
+        nargs=3,
+        action="append",
+        required=True,
+        metavar=("NAME", "ODDS_PATH", "SCORES_PATH"),
+        help="Season label with its archived odds and scores responses. Repeat for more seasons",
+    )
+    parser.add_argument(
+        "--devig",
+        nargs="+",
+        default=["proportional"],
+        choices=["proportional", "additive", "power", "shin"],
+        help="De-vig methods to compare",
+    )
+    parser.add_argument(
+        "--max_confidence",
+        metavar="m",
+        type=int,
+        default=16,
+        help="Maximum confidence value for each week",
+    )
+    parser.add_argument(
+        "--max_workers",
+        metavar="w",
+        type=int,
+        default=None,
+        help="Worker processes. Defaults to one per season, up to the number of CPUs",
+    )
+    parser.add_argument(
+        "--weights",
+        type=str,
+        default=None,
+        help="Fitted bookmaker weights; each de-vig method is also run with them",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Optional CSV path for the weekly results"
+    )
+    parser.add_argument(
+        "--parsed_cache",
+        type=str,
+        default=None,
+        help="Directory caching each archive's parsed games, so re-runs skip parsing",
+    )
+
+
+def add_optimize_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--results_path",
+        type=str,
+        required=True,
+        help="League results CSV with the season's points so far, e.g. "
+        "results/league_results_2023.csv",
+    )
+    parser.add_argument(
+        "--me", type=str, required=True, help="My column name in the league results"
+    )
+    parser.add_argument(
+        "--noise",
+        metavar="n",
+        type=float,
+        default=0.5,
+        help="Std of the rivals' errors, in log-odds, when judging each game",
+    )
+    parser.add_argument(
+        "--sims", metavar="n", type=int, default=20_000, help="Simulated weeks to search on"
+    )
+    parser.add_argument("--restarts", metavar="r", type=int, default=8, help="Hill climbs to run")
+    parser.add_argument(
+        "--correlation",
+        metavar="rho",
+        type=float,
+        default=0.0,
+        help="Correlation between favorites' outcomes",
+    )
+    parser.add_argument(
+        "--max_confidence",
+        metavar="m",
+        type=int,
+        default=16,
+        help="Maximum confidence value for the week",
+    )
+    parser.add_argument(
+        "--max_workers",
+        metavar="w",
+        type=int,
+        default=None,
+        help="Worker processes. Defaults to one per restart, up to the number of CPUs",
+    )
+
+
+def add_fit_weights_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--season",
+        dest="seasons",
+        nargs=3,
+        action="append",
+        required=True,
+        metavar=("NAME", "ODDS_PATH", "SCORES_PATH"),
+        help="Season label with its archived odds and scores responses. Repeat for more seasons",
+    )
+    parser.add_argument(
+        "--rule",
+        default="log_loss",
+        choices=["log_loss", "brier"],
+        help="Scoring rule the weights minimize",
+    )
+    parser.add_argument(
+        "--devig",
+        default="proportional",
+        choices=["proportional", "additive", "power", "shin"],
+        help="De-vig method to fit and later apply the weights with",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="JSON path to save the weights to; point BOOKMAKER_WEIGHTS_PATH at it to use them",
+    )
+    parser.add_argument(
+        "--parsed_cache",
+        type=str,
+        default=None,
+        help="Directory caching each archive's parsed games, so re-runs skip parsing",
+    )
+
+
+def add_export_archive_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--archive_dir",
+        type=str,
+        default=None,
+        help="Recorded response archive. Defaults to THE_ODDS_ARCHIVE_DIR",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="Gzipped JSON-lines path to write, usable as a backtest season's odds archive",
+    )
+    parser.add_argument(
+        "--sport", type=str, default="americanfootball_nfl", help="the-odds sport key"
+    )
+    parser.add_argument("--regions", type=str, default="us", help="Recorded request's regions")
+    parser.add_argument("--markets", type=str, default="h2h", help="Recorded request's markets")
+    parser.add_argument(
+        "--after",
+        type=str,
+        default=None,
+        help="Keep responses fetched at or after this ISO 8601 time, e.g. 2023-09-05T00:00-04:00",
+    )
+    parser.add_argument(
+        "--before",
+        type=str,
+        default=None,
+        help="Keep responses fetched before this ISO 8601 time",
+    )
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Capture a cProfile of the command to this path, e.g. for snakeviz or pstats",
+    )
+    parser.add_argument(
+        "--metrics_json",
+        type=str,
+        default=None,
+        help="Write stage timings and counters to this JSON file",
+    )
+    parser.add_argument(
+        "--metrics_textfile",
+        type=str,
+        default=None,
+        help="Write stage timings and counters to this Prometheus textfile",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for every subcommand without importing any of them
+
+    Returns:
+        argparse.ArgumentParser: nfl-confidence argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="nfl-confidence", description="NFL confidence league picks"
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+    add_print_arguments(
+        subparsers.add_parser("print", help="Print this week's confidence rankings")
+    )
+    add_write_sheet_arguments(
+        subparsers.add_parser(
+            "write-sheet", help="Fill in picks and confidence on an existing week sheet"
+        )
+    )
+    add_update_sheet_arguments(
+        subparsers.add_parser(
+            "update-sheet",
+            help="Create a week sheet or re-rank its upcoming games, keeping kicked off games",
+        )
+    )
+    add_compare_arguments(
+        subparsers.add_parser("compare", help="Score blends of past prediction sources")
+    )
+    add_plot_arguments(subparsers.add_parser("plot", help="Plot league results for a season"))
+    add_watch_arguments(
+        subparsers.add_parser(
+            "watch", help="Poll the odds and push re-ranked rows to a week sheet as lines move"
+        )
+    )
+    add_backtest_arguments(
+        subparsers.add_parser("backtest", help="Replay archived seasons and score the picks")
+    )
+    add_optimize_arguments(
+        subparsers.add_parser(
+            "optimize", help="Choose this week's picks to maximize the chance of leading the league"
+        )
+    )
+    add_fit_weights_arguments(
+        subparsers.add_parser(
+            "fit-weights", help="Fit bookmaker weights to archived seasons and save them"
+        )
+    )
+    add_export_archive_arguments(
+        subparsers.add_parser(
+            "export-archive", help="Write recorded odds responses out for a backtest"
+        )
+    )
+    add_settle_arguments(
+        subparsers.add_parser("settle", help="Grade a week sheet's picks as each game finishes")
+    )
+    for subparser in subparsers.choices.values():
+        add_instrumentation_arguments(subparser)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse the command line and run the chosen subcommand
+
+    Args:
+        argv (Optional[List[str]], optional): Command line arguments. Defaults to sys.argv[1:].
+    """
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    command = importlib.import_module(f"nfl_confidence.commands.{COMMANDS[args.command]}")
+    profiler = None
+    if args.profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        command.run(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        from nfl_confidence import metrics
+
+        metrics.export(json_path=args.metrics_json, textfile_path=args.metrics_textfile)
+
+
+if __name__ == "__main__":
+    main()
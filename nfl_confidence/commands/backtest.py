@@ -0,0 +1,41 @@
+import argparse
+import time
+
+from loguru import logger
+
+from nfl_confidence.backtest import BacktestConfig, Season, backtest, summarize
+
+
+def run(args: argparse.Namespace) -> None:
+    seasons = [
+        Season(name=name, odds_path=odds_path, scores_path=scores_path)
+        for name, odds_path, scores_path in args.seasons
+    ]
+    configs = [
+        BacktestConfig(name=method, devig_method=method, max_confidence=args.max_confidence)
+        for method in args.devig
+    ]
+    if args.weights is not None:
+        configs += [
+            config.model_copy(
+                update={"name": f"{config.name}+weights", "bookmaker_weights_path": args.weights}
+            )
+            for config in configs
+        ]
+
+    start = time.perf_counter()
+    weeks = backtest(
+        seasons=seasons,
+        configs=configs,
+        max_workers=args.max_workers,
+        cache_dir=args.parsed_cache,
+    )
+    logger.info(
+        f"Backtested {len(configs)} configs over {len(seasons)} seasons "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    print(summarize(weeks).to_string(index=False))
+    if args.output is not None:
+        weeks.to_csv(args.output, index=False)
+        logger.info(f"Wrote weekly results to {args.output}")
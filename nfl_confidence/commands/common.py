@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pytz import timezone
+
+from nfl_confidence.archive import ResponseArchive
+from nfl_confidence.cache import ResponseCache
+from nfl_confidence.compact import CompactGame
+from nfl_confidence.fetch import ReplayClient
+from nfl_confidence.game_cache import ParsedGameCache, parse_games
+from nfl_confidence.odds import OddsTable, get_the_odds_bytes, get_this_weeks_games
+from nfl_confidence.settings import Settings
+from nfl_confidence.utils import assign_confidence
+from nfl_confidence.weights import BookmakerWeights
+
+
+def confirm(prompt: str) -> bool:
+    """Ask the user a yes/no question on the terminal
+
+    Args:
+        prompt (str): Question to ask
+
+    Returns:
+        bool: True if the user answered "y"
+    """
+    return input(f"{prompt} (y/n) ").lower() == "y"
+
+
+def check_system_time() -> None:
+    """Ask the user to confirm the system time, since this week's games are chosen by it. Exits if
+    the user says the time is wrong."""
+    now = datetime.now(tz=timezone("US/Eastern"))
+    date_str = now.strftime("%I:%M on %A, %b %d")
+    if not confirm(f"\n\nIs it curently {date_str}?"):
+        logger.error("System time is wrong. Please restart")
+        exit()
+
+
+def get_secret_path(secret_path: Optional[str], settings: Settings) -> str:
+    """Resolve the google sheets secret path from the command line or the settings. Exits if
+    neither provides one.
+
+    Args:
+        secret_path (Optional[str]): Path passed on the command line, if any
+        settings (Settings): nfl_confidence settings
+
+    Returns:
+        str: Path to the google sheets secret
+    """
+    if secret_path is not None:
+        return secret_path
+    if settings.GOOGLE_SHEETS_SECRET_PATH is not None:
+        return settings.GOOGLE_SHEETS_SECRET_PATH
+    logger.error(
+        "No google sheets path provided. Must pass '--secret_path' arg, set "
+        "'GOOGLE_SHEETS_SECRET_PATH' environment variable, or add to .env file"
+    )
+    exit()
+
+
+def get_this_weeks_odds(settings: Settings) -> List[CompactGame]:
+    """Fetch the current moneyline odds and keep this week's games, sorted by commence time then
+    ID to keep the order the same on subsequent runs. With THE_ODDS_REPLAY_AT set, the odds come
+    from the archive as of that time instead, and the week is the one containing that time. A
+    response parsed before is loaded from the parsed game cache without validation.
+
+    Args:
+        settings (Settings): nfl_confidence settings
+
+    Returns:
+        List[CompactGame]: This week's games
+    """
+    # Get Moneyline/Head2head odds
+    archive = ResponseArchive.from_settings(settings)
+    now = settings.THE_ODDS_REPLAY_AT
+    if now is not None:
+        if archive is None:
+            logger.error("THE_ODDS_REPLAY_AT needs THE_ODDS_ARCHIVE_DIR to replay from")
+            exit()
+        logger.info(f"Replaying archived odds as of {now.isoformat()}")
+        raw = ReplayClient(archive=archive, clock=lambda: now).get_the_odds_bytes(
+            odds_format="american"
+        )
+    else:
+        raw = get_the_odds_bytes(
+            api_key=settings.THE_ODDS_API_KEY.get_secret_value(),
+            odds_format="american",
+            cache=ResponseCache.from_settings(settings),
+            archive=archive,
+        )
+
+    # Parse the raw response into games and filter to only this week's games
+    games = parse_games(raw, cache=ParsedGameCache.from_settings(settings))
+    games = get_this_weeks_games(games=games, now=now)
+    return sorted(games, key=lambda x: (x.commence_time, x.id))
+
+
+def get_bookmaker_weights(settings: Settings) -> Optional[BookmakerWeights]:
+    """Load the fitted bookmaker weights named in the settings, if any
+
+    Args:
+        settings (Settings): nfl_confidence settings
+
+    Returns:
+        Optional[BookmakerWeights]: Fitted weights, or None to average bookmakers equally
+    """
+    if settings.BOOKMAKER_WEIGHTS_PATH is None:
+        return None
+    logger.info(f"Weighting bookmakers with {settings.BOOKMAKER_WEIGHTS_PATH}")
+    return BookmakerWeights.load(settings.BOOKMAKER_WEIGHTS_PATH)
+
+
+def get_confidence_ranks(
+    table: OddsTable, max_confidence: int, locked_values: Iterable[int] = ()
+) -> np.ndarray:
+    """Rank games by win probability, with the most confident game worth max_confidence. Games
+    which already kicked off keep their confidence values, and the table's games share the rest.
+
+    Args:
+        table (OddsTable): This week's games which have not kicked off
+        max_confidence (int): Maximum confidence value for the week
+        locked_values (Iterable[int], optional): Confidence values of the week's games which
+            already kicked off. Defaults to none.
+
+    Returns:
+        np.ndarray: Confidence value of each game in the table
+    """
+    locked_values = list(locked_values)
+    values = np.concatenate([table.win_probability, np.zeros(len(locked_values))])
+    locked = {len(table) + i: value for i, value in enumerate(locked_values)}
+    confidence = assign_confidence(values=values, max_confidence=max_confidence, locked=locked)
+    return confidence[: len(table)]
+
+
+def confidence_dataframe(table: OddsTable, confidence_ranks: np.ndarray) -> pd.DataFrame:
+    """Build the per-game confidence table printed and written to the week sheets
+
+    Args:
+        table (OddsTable): This week's games
+        confidence_ranks (np.ndarray): Confidence value of each game
+
+    Returns:
+        pd.DataFrame: One row per game
+    """
+    return pd.DataFrame(
+        {
+            "id": table.game_ids,
+            "home_team": [team.value for team in table.home_team],
+            "away_team": [team.value for team in table.away_team],
+            "predicted_winner": [team.value for team in table.predicted_winner],
+            "prob_variance": table.win_probability_variance,
+            "oddsmaker_agreement": table.oddsmaker_agreement,
+            "confidence_prob": table.win_probability,
+            "confidence_rank": confidence_ranks,
+        }
+    )
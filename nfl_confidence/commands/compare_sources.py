@@ -0,0 +1,41 @@
+import argparse
+
+import gspread as gs
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from nfl_confidence.blend import pareto_front, search_blends, stack_weeks
+from nfl_confidence.commands.common import get_secret_path
+from nfl_confidence.settings import Settings
+from nfl_confidence.sheets import SheetReader
+
+
+def run(args: argparse.Namespace) -> None:
+    secret_path = get_secret_path(secret_path=args.secret_path, settings=Settings())
+    gc = gs.service_account(filename=secret_path)
+    sh = gc.open(args.sheet)
+
+    # Read every week once, in one batch, and score every blend over all weeks at once
+    weeks = [f"Week {n+1}" for n in range(args.weeks)]
+    probabilities, correct = stack_weeks(frames=SheetReader(sh).frames(weeks), sources=args.sources)
+    weights = None
+    if args.mus is not None:
+        if len(args.sources) != 2:
+            logger.error("'--mus' only applies to a blend of two sources")
+            exit()
+        mus = np.asarray(args.mus, dtype=float)
+        weights = np.column_stack([mus, 1 - mus])
+    results = search_blends(
+        probabilities=probabilities,
+        correct=correct,
+        sources=args.sources,
+        weights=weights,
+        resolution=args.resolution,
+    )
+
+    # Trade points off against week-to-week variance
+    front = pareto_front(results)
+    print(f"Scored {len(results)} blends of {', '.join(args.sources)} over {len(weeks)} weeks")
+    with pd.option_context("display.max_rows", None):
+        print(front.to_string(index=False))
@@ -0,0 +1,26 @@
+import argparse
+from datetime import datetime
+
+from loguru import logger
+
+from nfl_confidence.archive import ResponseArchive, odds_params
+from nfl_confidence.settings import Settings
+
+
+def run(args: argparse.Namespace) -> None:
+    archive_dir = args.archive_dir
+    if archive_dir is None:
+        archive_dir = Settings(_env_file=".env").THE_ODDS_ARCHIVE_DIR
+    if not archive_dir:
+        logger.error("No archive provided. Must pass '--archive_dir' or set THE_ODDS_ARCHIVE_DIR")
+        exit()
+
+    archive = ResponseArchive(archive_dir=archive_dir)
+    n_snapshots = archive.export(
+        path=args.output,
+        sport=args.sport,
+        params=odds_params(regions=args.regions, markets=args.markets),
+        after=None if args.after is None else datetime.fromisoformat(args.after),
+        before=None if args.before is None else datetime.fromisoformat(args.before),
+    )
+    logger.info(f"Wrote {n_snapshots} archived responses to {args.output}")
@@ -0,0 +1,26 @@
+import argparse
+
+from loguru import logger
+
+from nfl_confidence.backtest import Season, training_data
+from nfl_confidence.weights import fit_bookmaker_weights, score_bookmakers
+
+
+def run(args: argparse.Namespace) -> None:
+    seasons = [
+        Season(name=name, odds_path=odds_path, scores_path=scores_path)
+        for name, odds_path, scores_path in args.seasons
+    ]
+    table, home_won = training_data(
+        seasons=seasons, devig_method=args.devig, cache_dir=args.parsed_cache
+    )
+    logger.info(f"Fitting {len(table.bookmakers)} bookmakers on {len(table)} games")
+
+    weights = fit_bookmaker_weights(table=table, home_won=home_won, rule=args.rule)
+    losses = score_bookmakers(table=table, home_won=home_won, rule=args.rule)
+    for title, weight in sorted(weights.weights.items(), key=lambda x: -x[1]):
+        print(f"{title:<24} weight {weight:.3f}  {args.rule} {losses[title]:.4f}")
+    print(f"\n{args.rule}: {weights.loss:.4f} weighted, {weights.unweighted_loss:.4f} unweighted")
+
+    weights.save(args.output)
+    logger.info(f"Saved weights to {args.output}")
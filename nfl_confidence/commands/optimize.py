@@ -0,0 +1,63 @@
+import argparse
+
+import pandas as pd
+
+from nfl_confidence.commands.common import (
+    check_system_time,
+    get_bookmaker_weights,
+    get_this_weeks_odds,
+)
+from nfl_confidence.optimize import (
+    load_standings,
+    opponents_from_standings,
+    optimize_picks,
+)
+from nfl_confidence.settings import Settings
+from nfl_confidence.weights import build_table
+
+
+def run(args: argparse.Namespace) -> None:
+    # Load env and settings
+    settings = Settings(_env_file=".env")
+
+    # Check the current time
+    check_system_time()
+
+    # This week's games and the standings so far
+    table = build_table(
+        games=get_this_weeks_odds(settings=settings), weights=get_bookmaker_weights(settings)
+    )
+    points, opponents = opponents_from_standings(
+        standings=load_standings(args.results_path), me=args.me, noise=args.noise
+    )
+
+    picks = optimize_picks(
+        home_win_probability=table.home_team_win_prob,
+        opponents=opponents,
+        points=points,
+        max_confidence=args.max_confidence,
+        n_sims=args.sims,
+        restarts=args.restarts,
+        max_workers=args.max_workers,
+        correlation=args.correlation,
+    )
+    df = pd.DataFrame(
+        {
+            "home_team": [team.value for team in table.home_team],
+            "away_team": [team.value for team in table.away_team],
+            "pick": [
+                home.value if pick_home else away.value
+                for home, away, pick_home in zip(table.home_team, table.away_team, picks.picks_home)
+            ],
+            "pick_win_prob": [
+                prob if pick_home else 1 - prob
+                for prob, pick_home in zip(table.home_team_win_prob, picks.picks_home)
+            ],
+            "confidence": picks.confidence,
+        }
+    )
+    print(df, "\n")
+    print(
+        f"P(first): {picks.win_probability:.4f} (expected-points picks: "
+        f"{picks.greedy_win_probability:.4f})"
+    )
@@ -0,0 +1,37 @@
+import argparse
+
+from nfl_confidence.commands.common import (
+    check_system_time,
+    confidence_dataframe,
+    get_bookmaker_weights,
+    get_confidence_ranks,
+    get_this_weeks_odds,
+)
+from nfl_confidence.settings import Settings
+from nfl_confidence.weights import build_table
+
+
+def run(args: argparse.Namespace) -> None:
+    # Load env and settings
+    settings = Settings(_env_file=".env")
+
+    # Check the current time
+    check_system_time()
+
+    # Compute every per-game metric for this week's games in a single vectorized pass
+    table = build_table(
+        games=get_this_weeks_odds(settings=settings), weights=get_bookmaker_weights(settings)
+    )
+
+    # Compute confidence ranks and create pandas dataframe
+    confidence_ranks = get_confidence_ranks(table=table, max_confidence=args.max_confidence)
+    df = confidence_dataframe(table=table, confidence_ranks=confidence_ranks)
+
+    # Display the data frame
+    print(df, "\n")
+    if args.verbose:
+        for column in df.columns:
+            print(column)
+            for val in list(df[column]):
+                print(val)
+            print("\n")
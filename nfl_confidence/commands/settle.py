@@ -0,0 +1,72 @@
+import argparse
+from datetime import timedelta
+from functools import partial
+
+import gspread as gs
+from loguru import logger
+
+from nfl_confidence.commands.common import get_secret_path
+from nfl_confidence.scores import get_scores_json, read_scores_json
+from nfl_confidence.settings import Settings
+from nfl_confidence.settle import PickSet, Settler, push_results, settle
+from nfl_confidence.sheets import SheetReader, SheetWriter
+
+
+def run(args: argparse.Namespace) -> None:
+    # Get the google sheets secret
+    settings = Settings(_env_file=".env")
+    secret_path = get_secret_path(secret_path=args.secret_path, settings=settings)
+
+    # Read the week's picks once; later polls diff against the cells written since
+    logger.info(f"Reading google sheet '{args.sheet}' using secret at {secret_path}")
+    gc = gs.service_account(filename=secret_path)
+    reader = SheetReader(gc.open(args.sheet))
+    worksheet_name = f"Week {args.week}"
+    current_values = reader.values(worksheet_name)
+    game_ids = reader.frame(worksheet_name).id.astype(str).tolist()
+    pick_sets = [
+        PickSet(
+            winner_column=winner_column,
+            confidence_column=confidence_column,
+            correct_column=correct_column,
+            points_column=points_column,
+        )
+        for winner_column, confidence_column, correct_column, points_column in args.pick_sets
+    ] or [PickSet()]
+
+    # Scores come from a local file of the-odds scores responses, read once, or the scores
+    # endpoint, which only returns games which kicked off in the last days_from days
+    max_polls = args.max_polls
+    expire_after = None
+    if args.scores_path is not None:
+        logger.info(f"Settling '{worksheet_name}' from scores in {args.scores_path}")
+        fetch = partial(read_scores_json, path=args.scores_path)
+        max_polls = 1
+    else:
+        expire_after = timedelta(days=args.days_from)
+        logger.info(f"Settling '{worksheet_name}' every {args.interval:.0f}s as games finish")
+        fetch = partial(
+            get_scores_json,
+            api_key=settings.THE_ODDS_API_KEY.get_secret_value(),
+            days_from=args.days_from,
+        )
+
+    # Grade each game as it finishes, until the whole week is settled
+    writer = SheetWriter(ws=reader.worksheet(worksheet_name), limiter=reader.limiter)
+    try:
+        n_settled = settle(
+            fetch=fetch,
+            settler=Settler(),
+            on_settled=partial(
+                push_results, writer, pick_sets=pick_sets, current_values=current_values
+            ),
+            game_ids=game_ids,
+            interval=args.interval,
+            max_polls=max_polls,
+            max_idle_polls=args.max_idle_polls,
+            expire_after=expire_after,
+        )
+    except KeyboardInterrupt:
+        logger.info("Stopped settling")
+        return
+    logger.info(f"Settled {n_settled} of {len(game_ids)} games on '{worksheet_name}'")
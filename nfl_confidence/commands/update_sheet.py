@@ -0,0 +1,122 @@
+import argparse
+
+import gspread as gs
+import pandas as pd
+from loguru import logger
+
+from nfl_confidence.commands.common import (
+    check_system_time,
+    confidence_dataframe,
+    confirm,
+    get_bookmaker_weights,
+    get_confidence_ranks,
+    get_secret_path,
+    get_this_weeks_odds,
+)
+from nfl_confidence.settings import Settings
+from nfl_confidence.sheets import (
+    WEEK_SHEET_COLUMNS,
+    SheetReader,
+    SheetWriter,
+    push_rows,
+)
+from nfl_confidence.weights import build_table
+
+
+def run(args: argparse.Namespace) -> None:
+    # Get the google sheets secret
+    settings = Settings(_env_file=".env")
+    secret_path = get_secret_path(secret_path=args.secret_path, settings=settings)
+
+    # Check the current time
+    check_system_time()
+
+    # Get spreadsheet object
+    logger.info(f"Reading google sheet '{args.sheet}' using secret at {secret_path}")
+    gc = gs.service_account(filename=secret_path)
+    reader = SheetReader(gc.open(args.sheet))
+
+    # Decide whether to create new worksheet or update existing
+    worksheet_list = reader.titles()
+    worksheet_name = f"Week {args.week}"
+    if worksheet_name in worksheet_list:
+        ws = reader.worksheet(worksheet_name)
+        df = reader.frame(worksheet_name)
+        logger.debug(f"Found existing worksheet '{worksheet_name}':\n{df}")
+
+        # Check that sheet has all required columns
+        for column in WEEK_SHEET_COLUMNS:
+            if column not in df.columns:
+                raise ValueError(
+                    f"Couldn't find required column '{column}' "
+                    f"among existing columns: {list(df.columns)}"
+                )
+    else:
+        logger.info(f"Could not find worksheet '{worksheet_name}' among existing: {worksheet_list}")
+
+        # Exit without creating a worksheet
+        if not confirm(f"\n\nWorksheet '{worksheet_name}' does not exist. Create it?"):
+            logger.info("Exiting without creating new worksheet")
+            exit()
+
+        # Create a new worksheet
+        logger.info(f"Creating new worksheet {worksheet_name}")
+        ws = reader.add_worksheet(title=worksheet_name, rows=20, cols=15)
+        df = pd.DataFrame(columns=WEEK_SHEET_COLUMNS)
+
+    # Get this week's games from the-odds API
+    games = get_this_weeks_odds(settings=settings)
+
+    # Check that union of existing and the-odds API games has a valid count
+    existing_game_ids = set(df.id)
+    logger.info(f"Got {len(existing_game_ids)} existing games")
+    api_game_ids = set(game.id for game in games)
+    logger.info(f"Got {len(api_game_ids)} games from the-odds API")
+    all_game_ids = existing_game_ids.union(api_game_ids)
+    logger.info(f"Got {len(all_game_ids)} total games for the week")
+    if not (9 <= len(all_game_ids) <= 16):
+        if not confirm(
+            f"\n\n{len(all_game_ids)} games is outside the normal range for regular season weeks."
+            " Continue?"
+        ):
+            logger.info("Exiting without updating worksheet")
+            exit()
+
+    # Games already on the sheet which are no longer upcoming have kicked off, so their
+    # confidence is fixed and their rows are left alone
+    locked_df = df[~df.id.isin(api_game_ids)]
+    if len(locked_df):
+        logger.info(f"Keeping confidence of {len(locked_df)} games which already kicked off")
+    locked_values = [
+        int(value) for value in locked_df.confidence_rank if value != "" and pd.notna(value)
+    ]
+    if len(locked_values) < len(locked_df):
+        logger.warning(
+            f"{len(locked_df) - len(locked_values)} games which already kicked off have no "
+            "confidence value on the sheet"
+        )
+
+    # Compute every per-game metric in a single vectorized pass
+    table = build_table(games=games, weights=get_bookmaker_weights(settings))
+
+    # Assign the remaining confidence values and create new dataframe
+    try:
+        confidence_ranks = get_confidence_ranks(
+            table=table, max_confidence=args.max_confidence, locked_values=locked_values
+        )
+    except ValueError as e:
+        logger.error(f"Can't keep the confidence of the games which already kicked off: {e}")
+        exit()
+    new_df = confidence_dataframe(table=table, confidence_ranks=confidence_ranks)
+
+    # Get user approval to update sheet
+    logger.info(f"Ready to update sheet with new data:\n{new_df}")
+    if not confirm(f"\n\nReady to update sheet '{worksheet_name}' with the above data?"):
+        logger.info("Exiting without updating worksheet")
+        exit()
+
+    # Update only the upcoming games' cells which changed
+    rows = {row[0]: row for row in new_df.values.tolist()}
+    writer = SheetWriter(ws=ws, limiter=reader.limiter)
+    push_rows(writer, rows, current_values=reader.values(worksheet_name))
+    logger.info(f"Successfully updated worksheet {worksheet_name}!")
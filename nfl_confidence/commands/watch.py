@@ -0,0 +1,80 @@
+import argparse
+from functools import partial
+
+import gspread as gs
+import pandas as pd
+from loguru import logger
+
+from nfl_confidence.archive import ResponseArchive
+from nfl_confidence.cache import ResponseCache
+from nfl_confidence.commands.common import (
+    check_system_time,
+    confirm,
+    get_bookmaker_weights,
+    get_secret_path,
+    get_this_weeks_odds,
+)
+from nfl_confidence.odds import get_the_odds_json
+from nfl_confidence.settings import Settings
+from nfl_confidence.sheets import SheetReader, SheetWriter, push_rows
+from nfl_confidence.watch import OddsWatcher, watch
+
+
+def run(args: argparse.Namespace) -> None:
+    # Get the google sheets secret
+    settings = Settings(_env_file=".env")
+    secret_path = get_secret_path(secret_path=args.secret_path, settings=settings)
+
+    # Check the current time once, since the watcher runs unattended afterwards
+    check_system_time()
+
+    # Get the week's worksheet, creating it if needed
+    logger.info(f"Reading google sheet '{args.sheet}' using secret at {secret_path}")
+    gc = gs.service_account(filename=secret_path)
+    reader = SheetReader(gc.open(args.sheet))
+    worksheet_name = f"Week {args.week}"
+    watcher = OddsWatcher(
+        max_confidence=args.max_confidence, bookmaker_weights=get_bookmaker_weights(settings)
+    )
+    if worksheet_name in reader.titles():
+        ws = reader.worksheet(worksheet_name)
+
+        # Games already on the sheet which are no longer upcoming have kicked off, so they keep
+        # their confidence values while the rest are ranked
+        df = reader.frame(worksheet_name)
+        if {"id", "confidence_rank"} <= set(df.columns):
+            upcoming_game_ids = set(game.id for game in get_this_weeks_odds(settings=settings))
+            locked_df = df[~df.id.isin(upcoming_game_ids)]
+            for game_id, value in zip(locked_df.id, locked_df.confidence_rank):
+                if value != "" and pd.notna(value):
+                    watcher.locked[game_id] = int(value)
+            if watcher.locked:
+                logger.info(
+                    f"Keeping confidence of {len(watcher.locked)} games which already kicked off"
+                )
+    else:
+        if not confirm(f"\n\nWorksheet '{worksheet_name}' does not exist. Create it?"):
+            logger.info("Exiting without creating new worksheet")
+            exit()
+        ws = reader.add_worksheet(title=worksheet_name, rows=20, cols=15)
+
+    # Poll until interrupted, pushing only the rows that change
+    cache = ResponseCache.from_settings(settings)
+    fetch = partial(
+        get_the_odds_json,
+        api_key=settings.THE_ODDS_API_KEY.get_secret_value(),
+        odds_format="american",
+        cache=cache,
+        archive=ResponseArchive.from_settings(settings),
+    )
+    logger.info(f"Watching odds every {args.interval:.0f}s for '{worksheet_name}'")
+    try:
+        watch(
+            fetch=fetch,
+            watcher=watcher,
+            on_change=partial(push_rows, SheetWriter(ws=ws, limiter=reader.limiter)),
+            interval=args.interval,
+            max_polls=args.max_polls,
+        )
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
@@ -0,0 +1,113 @@
+import argparse
+
+import gspread as gs
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+from nfl_confidence.commands.common import (
+    check_system_time,
+    confirm,
+    get_bookmaker_weights,
+    get_confidence_ranks,
+    get_this_weeks_odds,
+)
+from nfl_confidence.settings import Settings
+from nfl_confidence.sheets import SheetReader, SheetWriter
+from nfl_confidence.utils import read_config
+from nfl_confidence.weights import build_table
+
+
+class ScriptParams(BaseModel):
+    week_number: int  # Week number to initialize
+    gspread_username: str = "lukeross"  # Username for google sheets account
+    sheet_name: str = "Luke NFL Confidence '24-'25"  # Google sheet names to update
+    winner_col_name: str = (
+        "Predicted Winner"  # Name of the column corresponding to the predicted winner
+    )
+    confidence_col_name: str = (
+        "Confidence Rank"  # Name of the column corresponding to the confidence score
+    )
+    game_id_col_name: str = "Game ID"  # Name of the column corresponding to the game ID
+    max_confidence: int = 16
+
+    model_config = ConfigDict(extra="forbid")
+
+
+def main(config: ScriptParams):
+    # Check the current time
+    settings = Settings()
+    check_system_time()
+
+    # Load the spreadsheet object
+    gc = gs.service_account(filename=settings.GOOGLE_SHEETS_SECRET_PATH)
+    reader = SheetReader(gc.open(config.sheet_name))
+    worksheet_name = f"Week {config.week_number}"
+
+    # Read the current sheet contents once, for both the game IDs and diffing writes
+    writer = SheetWriter(ws=reader.worksheet(worksheet_name), limiter=reader.limiter)
+    current_values = reader.values(worksheet_name)
+
+    # Get the game IDs to update
+    df = pd.DataFrame(current_values[1:], columns=current_values[0])
+    winner_col_idx = list(df.columns).index(config.winner_col_name) + 1  # Account for 1-indexing
+    confidence_col_idx = (
+        list(df.columns).index(config.confidence_col_name) + 1
+    )  # Account for 1-indexing
+    game_ids = list(df[config.game_id_col_name])
+    total_games = len(game_ids)
+
+    # Compute every per-game metric for this week's games in a single vectorized pass
+    table = build_table(
+        games=get_this_weeks_odds(settings=settings), weights=get_bookmaker_weights(settings)
+    )
+
+    # Games on the sheet which are no longer upcoming have kicked off, so their picks are fixed
+    upcoming_game_ids = set(table.game_ids)
+    locked_df = df[~df[config.game_id_col_name].isin(upcoming_game_ids)]
+    game_ids_to_update = [gid for gid in game_ids if gid in upcoming_game_ids]
+    logger.info(
+        f"Found {total_games} total games; {len(locked_df)} already kicked off, "
+        f"{len(game_ids_to_update)} to update"
+    )
+    if not confirm(f"\nUpdate {len(game_ids_to_update)} games?"):
+        logger.error("Stopping")
+        exit()
+
+    # Assign the confidence values not held by games which already kicked off
+    locked_values = [
+        int(value)
+        for value in locked_df[config.confidence_col_name]
+        if value != "" and pd.notna(value)
+    ]
+    if len(locked_values) < len(locked_df):
+        logger.warning(
+            f"{len(locked_df) - len(locked_values)} games which already kicked off have no "
+            "confidence value on the sheet"
+        )
+    try:
+        confidence_ranks = get_confidence_ranks(
+            table=table, max_confidence=config.max_confidence, locked_values=locked_values
+        )
+    except ValueError as e:
+        logger.error(f"Can't keep the confidence of the games which already kicked off: {e}")
+        exit()
+    gid2rank = {}
+    gid2winner = {}
+    for game_id, winner, confidence_rank in zip(
+        table.game_ids, table.predicted_winner, confidence_ranks
+    ):
+        gid2rank[game_id] = int(confidence_rank)
+        gid2winner[game_id] = winner.value
+
+    # Collect the confidence scores and write only the changed cells in one batch
+    for game_id in game_ids_to_update:
+        [row_idx] = df.index[df[config.game_id_col_name] == game_id].tolist()
+        row_idx += 2  # Account for 1 indexing and header row
+        writer.update_cell(row=row_idx, col=winner_col_idx, value=gid2winner[game_id])
+        writer.update_cell(row=row_idx, col=confidence_col_idx, value=gid2rank[game_id])
+    writer.flush(current_values=current_values)
+
+
+def run(args: argparse.Namespace) -> None:
+    main(read_config(args.config_path, ScriptParams))
@@ -0,0 +1,252 @@
+import functools
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from nfl_confidence.odds import GameOdds, OddsTable, TeamNameEnum
+from nfl_confidence.probability import DevigMethod
+
+# Every team in a fixed order, so a team is stored as its small int index into this tuple
+TEAMS: Tuple[TeamNameEnum, ...] = tuple(sorted(TeamNameEnum, key=lambda team: team.value))
+TEAM_INDEX: Dict[TeamNameEnum, int] = {team: idx for idx, team in enumerate(TEAMS)}
+
+# Buffer dtypes: whole-number American odds as int32, fractional (converted decimal) as float64
+INT_PRICES = np.dtype(np.int32)
+FLOAT_PRICES = np.dtype(np.float64)
+TIMESTAMPS = np.dtype(np.int64)
+
+# Distinct bookmaker lineups kept shared, dropping the least recently used past this many
+LINEUP_CACHE_SIZE = 2**10
+
+
+@functools.lru_cache(maxsize=LINEUP_CACHE_SIZE)
+def _shared_lineup(lineup: Tuple[str, ...]) -> Tuple[str, ...]:
+    # One shared tuple per distinct bookmaker lineup, since most games are priced by the same books
+    return lineup
+
+
+def _intern_lineup(titles: Iterable[str]) -> Tuple[str, ...]:
+    return _shared_lineup(tuple(sys.intern(title) for title in titles))
+
+
+def _to_timestamp(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def _to_datetime(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+class CompactGame:
+    """Frozen, slotted runtime representation of a validated GameOdds, holding only the fields the
+    pipeline reads: teams as indices into TEAMS, the kickoff and last updates as epoch seconds and
+    the (home, away) prices of every bookmaker in an immutable bytes buffer. Unknown keys kept by
+    the pydantic models (extra="allow") and each market's own last_update are dropped, so
+    to_game() returns the validated fields only.
+    """
+
+    __slots__ = ("id", "home", "away", "kickoff", "bookmakers", "last_updates", "prices", "dtype")
+
+    def __init__(
+        self,
+        id: str,
+        home: int,
+        away: int,
+        kickoff: int,
+        bookmakers: Tuple[str, ...],
+        last_updates: bytes,
+        prices: bytes,
+        dtype: np.dtype = INT_PRICES,
+    ):
+        """
+        Args:
+            id (str): Game ID
+            home (int): Index of the home team in TEAMS
+            away (int): Index of the away team in TEAMS
+            kickoff (int): Commence time in epoch seconds
+            bookmakers (Tuple[str, ...]): Bookmaker titles
+            last_updates (bytes): int64 epoch seconds of each bookmaker's last update
+            prices (bytes): (home, away) American odds of each bookmaker, flattened
+            dtype (np.dtype, optional): dtype of prices. Defaults to int32.
+        """
+        values = (id, home, away, kickoff, bookmakers, last_updates, prices, np.dtype(dtype))
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactGame):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.kickoff, self.prices))
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactGame(id={self.id!r}, home={self.home_team.value!r}, "
+            f"away={self.away_team.value!r}, bookmakers={len(self.bookmakers)})"
+        )
+
+    @classmethod
+    def from_game(cls, game: GameOdds) -> "CompactGame":
+        """Convert a validated GameOdds
+
+        Args:
+            game (GameOdds): Parsed game
+
+        Returns:
+            CompactGame: Compact copy of the game
+        """
+        prices = []
+        for bookmaker in game.bookmakers:
+            pair = [np.nan, np.nan]
+            for outcome in bookmaker.markets[0].outcomes:
+                if outcome.name == game.home_team:
+                    pair[OddsTable.HOME] = outcome.price
+                elif outcome.name == game.away_team:
+                    pair[OddsTable.AWAY] = outcome.price
+            prices.extend(pair)
+        prices = np.array(prices, dtype=FLOAT_PRICES)
+        dtype = INT_PRICES if np.all(prices == np.round(prices)) else FLOAT_PRICES
+        last_updates = [_to_timestamp(bookmaker.last_update) for bookmaker in game.bookmakers]
+        return cls(
+            id=game.id,
+            home=TEAM_INDEX[game.home_team],
+            away=TEAM_INDEX[game.away_team],
+            kickoff=_to_timestamp(game.commence_time),
+            bookmakers=_intern_lineup(bookmaker.title for bookmaker in game.bookmakers),
+            last_updates=np.array(last_updates, dtype=TIMESTAMPS).tobytes(),
+            prices=prices.astype(dtype).tobytes(),
+            dtype=dtype,
+        )
+
+    @property
+    def home_team(self) -> TeamNameEnum:
+        return TEAMS[self.home]
+
+    @property
+    def away_team(self) -> TeamNameEnum:
+        return TEAMS[self.away]
+
+    @property
+    def commence_time(self) -> datetime:
+        return _to_datetime(self.kickoff)
+
+    @property
+    def price_array(self) -> np.ndarray:
+        """Read-only (bookmakers, 2) view of the prices, ordered (home, away)"""
+        return np.frombuffer(self.prices, dtype=self.dtype).reshape(-1, 2)
+
+    @property
+    def last_update_array(self) -> np.ndarray:
+        """Read-only view of each bookmaker's last update in epoch seconds"""
+        return np.frombuffer(self.last_updates, dtype=TIMESTAMPS)
+
+    def to_game(self) -> GameOdds:
+        """Convert back to a GameOdds. The data is already normalized, so it is validated in
+        trusted mode.
+
+        Returns:
+            GameOdds: Game with the same teams, kickoff, bookmakers and prices
+        """
+        bookmakers = []
+        for title, last_update, pair in zip(
+            self.bookmakers, self.last_update_array.tolist(), self.price_array.tolist()
+        ):
+            last_update = _to_datetime(last_update)
+            outcomes = [
+                {"name": self.home_team, "price": pair[OddsTable.HOME]},
+                {"name": self.away_team, "price": pair[OddsTable.AWAY]},
+            ]
+            market = {"key": "h2h", "last_update": last_update, "outcomes": outcomes}
+            bookmakers.append({"title": title, "last_update": last_update, "markets": [market]})
+        return GameOdds.model_validate(
+            {
+                "id": self.id,
+                "home_team": self.home_team,
+                "away_team": self.away_team,
+                "commence_time": self.commence_time,
+                "bookmakers": bookmakers,
+            },
+            context={"trusted": True},
+        )
+
+
+def compact_games(games: Iterable[GameOdds]) -> List[CompactGame]:
+    """Convert validated games to their compact representation
+
+    Args:
+        games (Iterable[GameOdds]): Parsed games, or a stream of them
+
+    Returns:
+        List[CompactGame]: Compact games, in the same order
+    """
+    return [CompactGame.from_game(game) for game in games]
+
+
+def expand_games(games: Iterable[CompactGame]) -> List[GameOdds]:
+    """Convert compact games back to GameOdds models
+
+    Args:
+        games (Iterable[CompactGame]): Compact games
+
+    Returns:
+        List[GameOdds]: Validated games, in the same order
+    """
+    return [game.to_game() for game in games]
+
+
+def compact_table(
+    games: List[CompactGame],
+    devig_method: Union[DevigMethod, str] = DevigMethod.PROPORTIONAL,
+    bookmaker_weights: Optional[Mapping[str, float]] = None,
+) -> OddsTable:
+    """Build an OddsTable straight from compact games, matching OddsTable.from_games. Each
+    game's prices are copied into the table in one assignment, with the column indices computed
+    once per distinct bookmaker lineup.
+
+    Args:
+        games (List[CompactGame]): Compact games
+        devig_method (Union[DevigMethod, str], optional): Method used to remove each
+            bookmaker's margin. Defaults to proportional.
+        bookmaker_weights (Optional[Mapping[str, float]], optional): Weight of each bookmaker in
+            the home win probability. Defaults to an unweighted mean.
+
+    Returns:
+        OddsTable: Columnar table with one row per game
+    """
+    bookmaker_idx: Dict[str, int] = {}
+    columns: Dict[Tuple[str, ...], np.ndarray] = {}
+    for game in games:
+        if game.bookmakers not in columns:
+            for title in game.bookmakers:
+                bookmaker_idx.setdefault(title, len(bookmaker_idx))
+            columns[game.bookmakers] = np.array(
+                [bookmaker_idx[title] for title in game.bookmakers], dtype=int
+            )
+
+    prices = np.full((len(games), len(bookmaker_idx), 2), np.nan)
+    for i, game in enumerate(games):
+        prices[i, columns[game.bookmakers]] = game.price_array
+
+    return OddsTable(
+        game_ids=[game.id for game in games],
+        home_teams=[game.home_team for game in games],
+        away_teams=[game.away_team for game in games],
+        commence_times=[game.commence_time for game in games],
+        bookmakers=list(bookmaker_idx),
+        prices=prices,
+        devig_method=devig_method,
+        bookmaker_weights=bookmaker_weights,
+    )
@@ -0,0 +1,336 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_to_rowcol
+from pydantic import BaseModel
+
+from nfl_confidence.sheets import format_cell_value
+
+
+class FaultConfig(BaseModel):
+    latency: float = 0.0  # Seconds added to every call
+    rate_limit_first: int = 0  # Number of initial calls answered with a 429
+    rate_limit_probability: float = 0.0  # Probability of answering any other call with a 429
+    seed: int = 0  # Seed for the random 429s
+
+
+class FaultInjector:
+    """Adds latency and 429 responses to calls according to a FaultConfig, and counts calls"""
+
+    def __init__(self, config: Optional[FaultConfig] = None):
+        self.config = config or FaultConfig()
+        self.calls: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str) -> bool:
+        """Record a call, sleep for the configured latency and decide whether to rate limit it
+
+        Args:
+            name (str): Name of the API method being called
+
+        Returns:
+            bool: True if the call should be answered with a 429
+        """
+        with self._lock:
+            self.calls[name] += 1
+            n_calls = sum(self.calls.values())
+            limited = (
+                n_calls <= self.config.rate_limit_first
+                or self._random.random() < self.config.rate_limit_probability
+            )
+            if limited:
+                self.rate_limited[name] += 1
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        return limited
+
+
+def rate_limit_error() -> APIError:
+    """Build the gspread error raised when Google Sheets answers with a 429
+
+    Returns:
+        APIError: Rate limiting error
+    """
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps(
+        {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+    ).encode()
+    return APIError(response)
+
+
+def _numericise(value: str) -> Union[str, int, float]:
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+class FakeWorksheet:
+    """Stand-in for gspread.Worksheet, storing cells as strings like the Sheets API returns them"""
+
+    def __init__(
+        self,
+        title: str,
+        rows: int = 1000,
+        cols: int = 26,
+        faults: Optional[FaultInjector] = None,
+    ):
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.faults = faults or FaultInjector()
+        self.cells: Dict[tuple, str] = {}
+        self.display_decimals: Optional[int] = None  # Round numbers shown as formatted values
+
+    def _call(self, name: str) -> None:
+        if self.faults(name):
+            raise rate_limit_error()
+
+    def _set(self, row: int, col: int, value: Any) -> None:
+        self.cells[(row, col)] = format_cell_value(value)
+
+    def _render(self, value: str, value_render_option: Optional[str]) -> Any:
+        if str(value_render_option) == "UNFORMATTED_VALUE":
+            if value in ("TRUE", "FALSE"):
+                return value == "TRUE"
+            return _numericise(value)
+        if self.display_decimals is not None and isinstance(_numericise(value), float):
+            return f"{float(value):.{self.display_decimals}f}"
+        return value
+
+    def _values(self, value_render_option: Optional[str] = None) -> List[List[Any]]:
+        if not self.cells:
+            return []
+        n_rows = max(row for row, _ in self.cells)
+        n_cols = max(col for _, col in self.cells)
+        values = [
+            [self.cells.get((row, col), "") for col in range(1, n_cols + 1)]
+            for row in range(1, n_rows + 1)
+        ]
+        # Sheets trims trailing empty cells from each row
+        for row in values:
+            while row and row[-1] == "":
+                row.pop()
+        return [[self._render(value, value_render_option) for value in row] for row in values]
+
+    def _write_range(self, range_name: Optional[str], values: Iterable[Iterable[Any]]) -> None:
+        start = (range_name or "A1").split(":")[0]
+        start_row, start_col = a1_to_rowcol(start)
+        for i, row in enumerate(values):
+            for j, value in enumerate(row):
+                self._set(start_row + i, start_col + j, value)
+
+    def get_all_values(self, *args, value_render_option=None, **kwargs) -> List[List[Any]]:
+        self._call("get_all_values")
+        return self._values(value_render_option=value_render_option)
+
+    def get_all_records(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        self._call("get_all_records")
+        values = self._values()
+        if not values:
+            return []
+        header = values[0]
+        records = []
+        for row in values[1:]:
+            row = row + [""] * (len(header) - len(row))
+            records.append({key: _numericise(value) for key, value in zip(header, row)})
+        return records
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        self._call("update_cell")
+        self._set(row, col, value)
+
+    def update(self, values: Any = None, range_name: Optional[str] = None, **kwargs) -> None:
+        self._call("update")
+        # Support both update(values) and the gspread 4 update(range_name, values) signatures
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        self._write_range(range_name, values)
+
+    def batch_update(self, data: Iterable[Mapping[str, Any]], **kwargs) -> None:
+        self._call("batch_update")
+        for update in data:
+            self._write_range(update["range"], update["values"])
+
+    def clear(self) -> None:
+        self._call("clear")
+        self.cells = {}
+
+
+class FakeSpreadsheet:
+    """Stand-in for gspread.Spreadsheet"""
+
+    def __init__(self, title: str, faults: Optional[FaultInjector] = None):
+        self.title = title
+        self.faults = faults or FaultInjector()
+        self._worksheets: List[FakeWorksheet] = []
+
+    def _call(self, name: str) -> None:
+        if self.faults(name):
+            raise rate_limit_error()
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._call("worksheets")
+        return list(self._worksheets)
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._call("worksheet")
+        for ws in self._worksheets:
+            if ws.title == title:
+                return ws
+        raise WorksheetNotFound(title)
+
+    def add_worksheet(
+        self, title: str, rows: int = 1000, cols: int = 26, **kwargs
+    ) -> FakeWorksheet:
+        self._call("add_worksheet")
+        ws = FakeWorksheet(title=title, rows=rows, cols=cols, faults=self.faults)
+        self._worksheets.append(ws)
+        return ws
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict] = None) -> Dict:
+        self._call("values_batch_get")
+        value_ranges = []
+        for range_name in ranges:
+            title = range_name.split("!")[0].strip("'")
+            ws = next(ws for ws in self._worksheets if ws.title == title)
+            values = ws._values(value_render_option=(params or {}).get("valueRenderOption"))
+            value_ranges.append({"range": range_name, "values": values})
+        return {"spreadsheetId": self.title, "valueRanges": value_ranges}
+
+
+class FakeClient:
+    """Stand-in for gspread.Client, as returned by gspread.service_account"""
+
+    def __init__(self, faults: Optional[FaultInjector] = None):
+        self.faults = faults or FaultInjector()
+        self.spreadsheets: Dict[str, FakeSpreadsheet] = {}
+
+    def create(self, title: str) -> FakeSpreadsheet:
+        self.spreadsheets[title] = FakeSpreadsheet(title=title, faults=self.faults)
+        return self.spreadsheets[title]
+
+    def open(self, title: str) -> FakeSpreadsheet:
+        if self.faults("open"):
+            raise rate_limit_error()
+        return self.spreadsheets[title]
+
+
+class FakeOddsServer:
+    """Local HTTP stand-in for the-odds API, serving saved responses (e.g. tests/assets fixtures)
+    on /v4/sports/{sport}/{endpoint}/ with configurable latency and 429 responses. Quota headers
+    count down from requests_quota with each successful request, once per request even when
+    requests arrive concurrently."""
+
+    _PATH = re.compile(r"^/v4/sports/(?P<sport>[^/]+)/(?P<endpoint>[^/]+)/?$")
+
+    def __init__(
+        self,
+        responses: Mapping[str, Union[str, List[Dict]]],
+        faults: Optional[FaultConfig] = None,
+        requests_quota: int = 500,
+    ):
+        """
+        Args:
+            responses (Mapping[str, Union[str, List[Dict]]]): Response JSON (or a path to it) per
+                route, keyed by sport (for the odds endpoint) or "{sport}/{endpoint}"
+            faults (Optional[FaultConfig], optional): Latency and 429 configuration. Defaults to
+                no faults.
+            requests_quota (int, optional): Starting request quota. Defaults to 500.
+        """
+        self.responses = {}
+        for route, response in responses.items():
+            if isinstance(response, str):
+                with open(response, "r") as f:
+                    response = json.load(f)
+            if "/" not in route:
+                route = f"{route}/odds"
+            self.responses[route] = json.dumps(response).encode()
+        self.faults = FaultInjector(faults)
+        self.requests_quota = requests_quota
+        self.requests_used = 0
+        self.requests: List[Dict[str, List[str]]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to get_the_odds_json or OddsClient"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out and hung up
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                match = server._PATH.match(parsed.path)
+                route = f"{match['sport']}/{match['endpoint']}" if match else None
+                with server._lock:
+                    server.requests.append(parse_qs(parsed.query))
+                if server.faults(route or parsed.path):
+                    self._send(429, b'{"message": "Rate limited"}', {})
+                elif route not in server.responses:
+                    self._send(404, b'{"message": "Unknown route"}', {})
+                else:
+                    with server._lock:
+                        server.requests_used += 1
+                        requests_used = server.requests_used
+                    headers = {
+                        "x-requests-remaining": str(server.requests_quota - requests_used),
+                        "x-requests-used": str(requests_used),
+                    }
+                    self._send(200, server.responses[route], headers)
+
+        return Handler
+
+    def start(self) -> "FakeOddsServer":
+        """Start serving on a free local port in a background thread"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeOddsServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
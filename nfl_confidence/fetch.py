@@ -0,0 +1,370 @@
+import bisect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import requests
+from loguru import logger
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    Retrying,
+    before_sleep_log,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from nfl_confidence.archive import (
+    ArchiveEntry,
+    ResponseArchive,
+    SnapshotNotFoundError,
+    odds_params,
+)
+from nfl_confidence.cache import ResponseCache
+from nfl_confidence.odds import THE_ODDS_BASE_URL, THE_ODDS_TIMEOUT, get_the_odds_json
+
+# HTTP status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class OddsRequest(BaseModel):
+    sport: str = "americanfootball_nfl"
+    regions: str = "us"  # Comma separated bookmaker regions, e.g. "us,us2,uk,eu"
+    markets: str = "h2h"  # Comma separated markets, e.g. "h2h,spreads"
+    odds_format: str = "american"
+
+
+def is_retryable(exception: BaseException) -> bool:
+    """Whether a failed the-odds request should be retried
+
+    Args:
+        exception (BaseException): Exception raised by the request
+
+    Returns:
+        bool: True for connection errors, timeouts, rate limiting and 5xx responses
+    """
+    if isinstance(exception, requests.HTTPError):
+        response = exception.response
+        return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exception, (requests.ConnectionError, requests.Timeout))
+
+
+def merge_the_odds_json(responses: List[List[Dict]]) -> List[Dict]:
+    """Merge several the-odds responses into one game set. Games are matched by id, bookmakers by
+    key and markets by key, so the same game fetched for several regions or markets appears once
+    with the union of its bookmakers and markets.
+
+    Args:
+        responses (List[List[Dict]]): the-odds API responses
+
+    Returns:
+        List[Dict]: Merged response, games in order of first appearance
+    """
+    games: Dict[str, Dict] = {}
+    for response in responses:
+        for game in response:
+            merged_game = games.setdefault(game["id"], {**game, "bookmakers": []})
+            bookmakers = {bookmaker["key"]: bookmaker for bookmaker in merged_game["bookmakers"]}
+            for bookmaker in game["bookmakers"]:
+                if bookmaker["key"] not in bookmakers:
+                    merged_bookmaker = {**bookmaker, "markets": []}
+                    bookmakers[bookmaker["key"]] = merged_bookmaker
+                    merged_game["bookmakers"].append(merged_bookmaker)
+                merged_markets = bookmakers[bookmaker["key"]]["markets"]
+                market_keys = {market["key"] for market in merged_markets}
+                merged_markets.extend(
+                    market for market in bookmaker["markets"] if market["key"] not in market_keys
+                )
+    return list(games.values())
+
+
+def select_market(the_odds_json: List[Dict], market: str = "h2h") -> List[Dict]:
+    """Keep only a single market for every bookmaker, dropping bookmakers which do not offer it.
+    The result can be passed to parse_the_odds_json, which expects h2h odds only.
+
+    Args:
+        the_odds_json (List[Dict]): the-odds API response, possibly with several markets
+        market (str, optional): Market key to keep. Defaults to "h2h".
+
+    Returns:
+        List[Dict]: Response with one market per bookmaker
+    """
+    selected = []
+    for game in the_odds_json:
+        bookmakers = []
+        for bookmaker in game["bookmakers"]:
+            markets = [m for m in bookmaker["markets"] if m["key"] == market]
+            if markets:
+                bookmakers.append({**bookmaker, "markets": markets})
+        selected.append({**game, "bookmakers": bookmakers})
+    return selected
+
+
+class OddsClient:
+    """the-odds API client which reuses pooled connections, issues requests concurrently on a
+    thread pool and retries each request with exponential backoff"""
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[ResponseCache] = None,
+        max_workers: int = 8,
+        max_attempts: int = 5,
+        max_wait: float = 30.0,
+        base_url: str = THE_ODDS_BASE_URL,
+        archive: Optional[ResponseArchive] = None,
+        timeout: float = THE_ODDS_TIMEOUT,
+    ):
+        """
+        Args:
+            api_key (str): the-odds API key
+            cache (Optional[ResponseCache], optional): On-disk response cache. Defaults to None.
+            max_workers (int, optional): Maximum concurrent requests. Defaults to 8.
+            max_attempts (int, optional): Attempts per request before giving up. Defaults to 5.
+            max_wait (float, optional): Maximum seconds to back off between attempts. Defaults
+                to 30.
+            base_url (str, optional): API base URL. Defaults to THE_ODDS_BASE_URL.
+            archive (Optional[ResponseArchive], optional): Archive recording every response.
+                Defaults to None.
+            timeout (float, optional): Seconds to wait to connect or for data on each attempt.
+                Timed out attempts are retried. Defaults to THE_ODDS_TIMEOUT.
+        """
+        self.api_key = api_key
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.max_wait = max_wait
+        self.base_url = base_url
+        self.archive = archive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self) -> "OddsClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self.session.close()
+
+    def fetch(self, request: OddsRequest) -> List[Dict]:
+        """Fetch a single request, retrying transient failures with exponential backoff
+
+        Args:
+            request (OddsRequest): Request to make
+
+        Returns:
+            List[Dict]: the-odds response JSON
+        """
+        retrying = Retrying(
+            wait=wait_exponential(max=self.max_wait),
+            stop=stop_after_attempt(self.max_attempts),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=before_sleep_log(logger, logging.INFO),
+            reraise=True,
+        )
+        return retrying(
+            get_the_odds_json,
+            api_key=self.api_key,
+            odds_format=request.odds_format,
+            sport=request.sport,
+            regions=request.regions,
+            markets=request.markets,
+            cache=self.cache,
+            session=self.session,
+            base_url=self.base_url,
+            archive=self.archive,
+            timeout=self.timeout,
+        )
+
+    def fetch_all(self, odds_requests: List[OddsRequest]) -> List[List[Dict]]:
+        """Fetch several requests concurrently
+
+        Args:
+            odds_requests (List[OddsRequest]): Requests to make
+
+        Returns:
+            List[List[Dict]]: the-odds response JSON for each request, in request order
+        """
+        if not odds_requests:
+            return []
+        max_workers = min(self.max_workers, len(odds_requests))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.fetch, odds_requests))
+
+    def fetch_merged(self, odds_requests: List[OddsRequest]) -> List[Dict]:
+        """Fetch several requests concurrently and merge them into one game set
+
+        Args:
+            odds_requests (List[OddsRequest]): Requests to make
+
+        Returns:
+            List[Dict]: Merged the-odds response, see merge_the_odds_json
+        """
+        return merge_the_odds_json(self.fetch_all(odds_requests))
+
+
+class ReplayClient:
+    """Stand-in for OddsClient which serves archived responses instead of calling the-odds API:
+    each request gets the latest response recorded at or before the clock's current time.
+    """
+
+    def __init__(
+        self,
+        archive: ResponseArchive,
+        clock: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
+    ):
+        """
+        Args:
+            archive (ResponseArchive): Archive to replay
+            clock (Callable[[], datetime], optional): Returns the replay time, e.g. a fixed time
+                to reproduce a run or an advancing fake clock. Defaults to the system clock.
+        """
+        self.archive = archive
+        self.clock = clock
+        self._entries: Dict[str, Tuple[List[float], List[ArchiveEntry]]] = {}
+
+    def __enter__(self) -> "ReplayClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Nothing to close; for symmetry with OddsClient"""
+
+    def get(self, sport: str, params: Mapping[str, str]) -> List[Dict[str, Any]]:
+        """Return the latest archived response to a request at or before the replay time
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+
+        Raises:
+            SnapshotNotFoundError: If nothing was recorded for the request by the replay time
+
+        Returns:
+            List[Dict[str, Any]]: Archived response JSON
+        """
+        return self.archive.load(self._entry(sport=sport, params=params).digest)
+
+    def get_bytes(self, sport: str, params: Mapping[str, str]) -> bytes:
+        """Like get, but return the archived response body without decoding it
+
+        Args:
+            sport (str): the-odds sport key
+            params (Mapping[str, str]): Request params
+
+        Raises:
+            SnapshotNotFoundError: If nothing was recorded for the request by the replay time
+
+        Returns:
+            bytes: Canonical JSON of the archived response
+        """
+        return self.archive.load_bytes(self._entry(sport=sport, params=params).digest)
+
+    def _entry(self, sport: str, params: Mapping[str, str]) -> ArchiveEntry:
+        """Latest archive entry for a request at or before the replay time"""
+        key = ResponseCache.key(sport=sport, params=params)
+        if key not in self._entries:
+            entries = self.archive.entries(sport=sport, params=params)
+            self._entries[key] = ([entry.fetched_at.timestamp() for entry in entries], entries)
+        times, entries = self._entries[key]
+        now = self.clock()
+        idx = bisect.bisect_right(times, now.timestamp()) - 1
+        if idx < 0:
+            raise SnapshotNotFoundError(
+                f"No archived {sport} response to {dict(params)} at or before {now.isoformat()}"
+            )
+        return entries[idx]
+
+    def get_the_odds_json(
+        self,
+        odds_format: str = "american",
+        sport: str = "americanfootball_nfl",
+        regions: str = "us",
+        markets: str = "h2h",
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Replay counterpart of odds.get_the_odds_json, ignoring the API key, cache and session
+
+        Args:
+            odds_format (str, optional): Format for odds. Defaults to "american".
+            sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+            regions (str, optional): Comma separated bookmaker regions. Defaults to "us".
+            markets (str, optional): Comma separated markets. Defaults to "h2h".
+            **kwargs: Ignored arguments of odds.get_the_odds_json, e.g. api_key
+
+        Returns:
+            List[Dict[str, Any]]: Archived response JSON
+        """
+        params = odds_params(odds_format=odds_format, regions=regions, markets=markets)
+        return self.get(sport=sport, params=params)
+
+    def get_the_odds_bytes(
+        self,
+        odds_format: str = "american",
+        sport: str = "americanfootball_nfl",
+        regions: str = "us",
+        markets: str = "h2h",
+        **kwargs,
+    ) -> bytes:
+        """Replay counterpart of odds.get_the_odds_bytes, ignoring the API key, cache and session
+
+        Args:
+            odds_format (str, optional): Format for odds. Defaults to "american".
+            sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+            regions (str, optional): Comma separated bookmaker regions. Defaults to "us".
+            markets (str, optional): Comma separated markets. Defaults to "h2h".
+            **kwargs: Ignored arguments of odds.get_the_odds_bytes, e.g. api_key
+
+        Returns:
+            bytes: Canonical JSON of the archived response
+        """
+        params = odds_params(odds_format=odds_format, regions=regions, markets=markets)
+        return self.get_bytes(sport=sport, params=params)
+
+    def fetch(self, request: OddsRequest) -> List[Dict[str, Any]]:
+        """Replay a single request, like OddsClient.fetch
+
+        Args:
+            request (OddsRequest): Request to replay
+
+        Returns:
+            List[Dict[str, Any]]: Archived response JSON
+        """
+        return self.get_the_odds_json(
+            odds_format=request.odds_format,
+            sport=request.sport,
+            regions=request.regions,
+            markets=request.markets,
+        )
+
+    def fetch_all(self, odds_requests: List[OddsRequest]) -> List[List[Dict[str, Any]]]:
+        """Replay several requests, like OddsClient.fetch_all
+
+        Args:
+            odds_requests (List[OddsRequest]): Requests to replay
+
+        Returns:
+            List[List[Dict[str, Any]]]: Archived response JSON for each request, in request order
+        """
+        return [self.fetch(request) for request in odds_requests]
+
+    def fetch_merged(self, odds_requests: List[OddsRequest]) -> List[Dict[str, Any]]:
+        """Replay several requests and merge them into one game set, like OddsClient.fetch_merged
+
+        Args:
+            odds_requests (List[OddsRequest]): Requests to replay
+
+        Returns:
+            List[Dict[str, Any]]: Merged response, see merge_the_odds_json
+        """
+        return merge_the_odds_json(self.fetch_all(odds_requests))
@@ -0,0 +1,265 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Any, List, Optional, Union
+
+from loguru import logger
+
+from nfl_confidence.compact import TEAMS, CompactGame, compact_games
+from nfl_confidence.metrics import increment
+from nfl_confidence.odds import GameOdds, load_json_bytes, parse_the_odds_json
+from nfl_confidence.probability import OddsFormat
+
+# Bump when the stored representation changes, to invalidate every cached entry
+CACHE_FORMAT = 1
+
+# Default size cap of the cache directory
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# Bytes read at a time when hashing a file for its key
+HASH_CHUNK_SIZE = 2**20
+
+_ENTRY_SUFFIX = ".pkl"
+
+
+@functools.lru_cache(maxsize=None)
+def schema_fingerprint() -> str:
+    """Fingerprint of everything a cached parse depends on besides the response itself: the team
+    name mapping, the GameOdds validation schema, the team indices and the storage format
+
+    Returns:
+        str: Hex digest which changes whenever a cached parse could be stale
+    """
+    team_names_path = os.path.join(os.path.dirname(__file__), "assets", "team_names.json")
+    with open(team_names_path, "rb") as f:
+        team_names = f.read()
+    schema = json.dumps(GameOdds.model_json_schema(mode="validation"), sort_keys=True)
+    digest = hashlib.sha256(team_names)
+    digest.update(schema.encode())
+    digest.update(json.dumps([team.value for team in TEAMS]).encode())
+    digest.update(str(CACHE_FORMAT).encode())
+    return digest.hexdigest()
+
+
+class ParsedGameCache:
+    """Persistent cache of parsed games keyed by the hash of the raw response, so replaying the
+    same responses skips pydantic validation entirely. Entries are pickled CompactGame lists,
+    which load without any validation, and the least recently used entries are evicted once the
+    directory exceeds max_bytes. The whole cache is dropped when schema_fingerprint changes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Directory to store parsed games in
+            max_bytes (int, optional): Size cap of the stored entries. Defaults to 256 MiB.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fingerprint = schema_fingerprint()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._check_version()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["ParsedGameCache"]:
+        """Build the cache configured by the settings, or None if it is disabled
+
+        Args:
+            settings (Settings): nfl_confidence settings
+
+        Returns:
+            Optional[ParsedGameCache]: Parsed game cache, None if THE_ODDS_PARSED_CACHE_DIR is
+                unset
+        """
+        if not settings.THE_ODDS_PARSED_CACHE_DIR:
+            return None
+        return cls(
+            cache_dir=settings.THE_ODDS_PARSED_CACHE_DIR,
+            max_bytes=int(settings.THE_ODDS_PARSED_CACHE_MAX_MB * 2**20),
+        )
+
+    def _check_version(self) -> None:
+        """Drop every entry written under a different schema fingerprint"""
+        version_path = os.path.join(self.cache_dir, "VERSION")
+        if os.path.exists(version_path):
+            with open(version_path, "r") as f:
+                if f.read().strip() == self.fingerprint:
+                    return
+            logger.info("Team names or game schema changed, clearing the parsed game cache")
+        for path in self._entry_paths():
+            os.remove(path)
+        with open(version_path, "w") as f:
+            f.write(self.fingerprint)
+
+    def _entry_paths(self) -> List[str]:
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(_ENTRY_SUFFIX)
+        ]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{_ENTRY_SUFFIX}")
+
+    def key(self, raw: Union[bytes, str], *context: str) -> str:
+        """Cache key of a raw response
+
+        Args:
+            raw (Union[bytes, str]): Raw response, or any other parse input such as an archive
+            *context (str): Anything else the parse depends on, e.g. the odds format
+
+        Returns:
+            str: Hex digest identifying the parse
+        """
+        digest = self._digest(*context)
+        digest.update(raw.encode() if isinstance(raw, str) else raw)
+        return digest.hexdigest()
+
+    def file_key(self, path: str, *context: str) -> str:
+        """Cache key of a file's contents, the same as key of its bytes, hashed in fixed-size
+        chunks so multi-GB archives are never held in memory
+
+        Args:
+            path (str): Path to the file, e.g. a season archive
+            *context (str): Anything else the parse depends on
+
+        Returns:
+            str: Hex digest identifying the parse
+        """
+        digest = self._digest(*context)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _digest(self, *context: str) -> Any:
+        digest = hashlib.sha256(self.fingerprint.encode())
+        for part in context:
+            digest.update(f"\0{part}".encode())
+        digest.update(b"\0")
+        return digest
+
+    def get(self, key: str) -> Optional[List[CompactGame]]:
+        """Load the games stored under a key, marking the entry as recently used
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[List[CompactGame]]: Stored games, None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                games = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            increment("parsed_cache_misses")
+            return None
+        except (
+            OSError,
+            pickle.UnpicklingError,
+            EOFError,
+            ImportError,
+            AttributeError,
+            TypeError,
+            ValueError,
+        ) as e:
+            logger.warning(f"Dropping unreadable parsed game cache entry {key[:12]}: {e}")
+            os.remove(path)
+            increment("parsed_cache_misses")
+            return None
+        increment("parsed_cache_hits")
+        return games
+
+    def put(self, key: str, games: List[CompactGame]) -> None:
+        """Store games under a key, then evict least recently used entries over the size cap
+
+        Args:
+            key (str): Cache key
+            games (List[CompactGame]): Parsed games
+        """
+        data = pickle.dumps(list(games), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            logger.debug(f"Not caching {len(data)} bytes of games, over the cache's size cap")
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            for path in self._entry_paths():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                increment("parsed_cache_evictions")
+
+    def size(self) -> int:
+        """Total bytes of the stored entries
+
+        Returns:
+            int: Size of the cache
+        """
+        return sum(os.path.getsize(path) for path in self._entry_paths())
+
+    def parse_bytes(
+        self, raw: Union[bytes, str], odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN
+    ) -> List[CompactGame]:
+        """Parse a raw the-odds API response, or load it from the cache if it was parsed before
+
+        Args:
+            raw (Union[bytes, str]): Raw response body
+            odds_format (Union[OddsFormat, str], optional): Format the odds were requested in.
+                Defaults to American.
+
+        Returns:
+            List[CompactGame]: Parsed games
+        """
+        key = self.key(raw, OddsFormat(odds_format).value)
+        games = self.get(key)
+        if games is None:
+            games = compact_games(parse_the_odds_json(load_json_bytes(raw), odds_format))
+            self.put(key, games)
+        return games
+
+
+def parse_games(
+    raw: Union[bytes, str],
+    odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN,
+    cache: Optional[ParsedGameCache] = None,
+) -> List[CompactGame]:
+    """Parse a raw the-odds API response into compact games, through the cache when there is one
+
+    Args:
+        raw (Union[bytes, str]): Raw response body
+        odds_format (Union[OddsFormat, str], optional): Format the odds were requested in.
+            Defaults to American.
+        cache (Optional[ParsedGameCache], optional): Parsed game cache. Defaults to None.
+
+    Returns:
+        List[CompactGame]: Parsed games
+    """
+    if cache is None:
+        return compact_games(parse_the_odds_json(load_json_bytes(raw), odds_format=odds_format))
+    return cache.parse_bytes(raw, odds_format=odds_format)
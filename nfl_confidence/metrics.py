@@ -0,0 +1,217 @@
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from loguru import logger
+from tenacity import RetryCallState, before_sleep_log
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = "nfl_confidence"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Metrics:
+    """Thread-safe registry of timing spans and counters for one run of the pipeline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one timed call to a span
+
+        Args:
+            name (str): Span name, e.g. "fetch"
+            seconds (float): Duration of the call
+        """
+        with self._lock:
+            span = self.spans.setdefault(
+                name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            span["count"] += 1
+            span["total_seconds"] += seconds
+            span["max_seconds"] = max(span["max_seconds"], seconds)
+
+    def increment(self, name: str, value: float = 1.0) -> None:
+        """Add to a counter
+
+        Args:
+            name (str): Counter name, e.g. "retries"
+            value (float, optional): Amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Clear every span and counter"""
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Snapshot of the spans and counters, as written by write_json
+
+        Returns:
+            Dict[str, Dict]: {"spans": {name: stats}, "counters": {name: value}}
+        """
+        with self._lock:
+            return {
+                "spans": {name: dict(span) for name, span in self.spans.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text, e.g. for the node_exporter textfile collector
+        """
+        snapshot = self.to_dict()
+        lines = []
+        span_metrics = [
+            ("span_seconds_total", "total_seconds", "counter", "Seconds spent in each stage"),
+            ("span_calls_total", "count", "counter", "Calls of each stage"),
+            ("span_max_seconds", "max_seconds", "gauge", "Slowest call of each stage"),
+        ]
+        for metric, key, metric_type, help_text in span_metrics:
+            if not snapshot["spans"]:
+                break
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {metric_type}")
+            for name, span in sorted(snapshot["spans"].items()):
+                lines.append(f'{PROMETHEUS_PREFIX}_{metric}{{span="{name}"}} {span[key]}')
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{PROMETHEUS_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        """Write the metrics to a JSON file
+
+        Args:
+            path (str): Destination path
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the metrics to a Prometheus textfile. The file is replaced atomically so a
+        collector never reads it half written.
+
+        Args:
+            path (str): Destination path, conventionally ending in .prom
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def log_summary(self) -> None:
+        """Log one line with every span's calls and time, and every counter"""
+        snapshot = self.to_dict()
+        parts = [
+            f"{name} {span['count']}x {span['total_seconds'] * 1e3:.1f} ms"
+            for name, span in snapshot["spans"].items()
+        ]
+        parts += [f"{name}={value:g}" for name, value in snapshot["counters"].items()]
+        if parts:
+            logger.info(f"Timings: {', '.join(parts)}")
+
+
+# Registry used by the pipeline's built-in spans and counters
+METRICS = Metrics()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as one call of a span in METRICS
+
+    Args:
+        name (str): Span name
+
+    Yields:
+        Iterator[None]: Nothing
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        METRICS.record(name, seconds)
+        logger.debug(f"{name} took {seconds * 1e3:.2f} ms")
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator timing every call of a function as a span in METRICS
+
+    Args:
+        name (str): Span name
+
+    Returns:
+        Callable[[F], F]: Decorator
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def increment(name: str, value: float = 1.0) -> None:
+    """Add to a counter in METRICS
+
+    Args:
+        name (str): Counter name
+        value (float, optional): Amount to add. Defaults to 1.
+    """
+    METRICS.increment(name, value)
+
+
+def before_sleep_count(log_level: int = logging.INFO) -> Callable[[RetryCallState], None]:
+    """tenacity before_sleep hook which logs each retry like before_sleep_log and counts the
+    retry and its backoff in METRICS
+
+    Args:
+        log_level (int, optional): Level to log retries at. Defaults to logging.INFO.
+
+    Returns:
+        Callable[[RetryCallState], None]: before_sleep hook
+    """
+    log_retry = before_sleep_log(logger, log_level)
+
+    def hook(retry_state: RetryCallState) -> None:
+        log_retry(retry_state)
+        increment("retries")
+        increment("retry_sleep_seconds", retry_state.next_action.sleep)
+
+    return hook
+
+
+def export(json_path: Optional[str] = None, textfile_path: Optional[str] = None) -> None:
+    """Log a summary of METRICS and write it to the requested files
+
+    Args:
+        json_path (Optional[str], optional): JSON file to write. Defaults to none.
+        textfile_path (Optional[str], optional): Prometheus textfile to write. Defaults to none.
+    """
+    METRICS.log_summary()
+    if json_path is not None:
+        METRICS.write_json(json_path)
+        logger.info(f"Wrote metrics to {json_path}")
+    if textfile_path is not None:
+        METRICS.write_prometheus(textfile_path)
+        logger.info(f"Wrote Prometheus metrics to {textfile_path}")
@@ -1,15 +1,52 @@
+import functools
 import json
 import os
-from datetime import datetime, timedelta
+from abc import abstractmethod
+from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Set
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
 
 import numpy as np
 import requests
-from pydantic import BaseModel, Field, computed_field, field_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationInfo,
+    computed_field,
+    field_validator,
+)
 from pytz import timezone
 from typing_extensions import Annotated
 
+from nfl_confidence.archive import ResponseArchive, canonical_json, odds_params
+from nfl_confidence.cache import ResponseCache, request_cost
+from nfl_confidence.metrics import increment, timed
+from nfl_confidence.probability import (
+    DevigMethod,
+    OddsFormat,
+    decimal_to_american,
+    implied_probabilities,
+    remove_vig,
+)
+from nfl_confidence.schedule import this_week_window
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def get_valid_team_names() -> Set[str]:
     """Return a set containing all valid team names
@@ -49,6 +86,74 @@ def add_timezone(date_str: str) -> str:
     return date_str.replace("Z", "+00:00")
 
 
+def is_trusted(info: ValidationInfo) -> bool:
+    """Whether the data being validated was marked as trusted (already validated) by the caller
+
+    Args:
+        info (ValidationInfo): Validation info passed to a field validator
+
+    Returns:
+        bool: True if validation was run with context {"trusted": True}
+    """
+    return bool(info.context and info.context.get("trusted"))
+
+
+# Key of the memoized derived values in a MemoizedModel's __dict__
+MEMOIZED_KEY = "_memoized"
+
+
+def memoized_property(func: Callable[[Any], Any]) -> property:
+    """Property decorator which memoizes the derived value on the model instance, keyed by the
+    model's fingerprint (the inputs the value is derived from). The value is recomputed only when
+    those inputs change, whether a field is reassigned or a nested model or list is mutated in
+    place.
+
+    Args:
+        func (Callable[[Any], Any]): Getter of a MemoizedModel subclass
+
+    Returns:
+        property: Memoized property, which can be wrapped with pydantic's computed_field
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def getter(self):
+        fingerprint = self._fingerprint()
+        memoized = self.__dict__.setdefault(MEMOIZED_KEY, {})
+        if name in memoized and memoized[name][0] == fingerprint:
+            return memoized[name][1]
+        value = func(self)
+        memoized[name] = (fingerprint, value)
+        return value
+
+    return property(getter)
+
+
+class MemoizedModel(BaseModel):
+    """Base model for objects with memoized derived fields. Memoized values live in the instance
+    __dict__ under MEMOIZED_KEY, which pydantic leaves out of equality and serialization.
+    """
+
+    @abstractmethod
+    def _fingerprint(self) -> Hashable:
+        """Return a hashable summary of every input the derived fields depend on"""
+
+    def __copy__(self):
+        copied = super().__copy__()
+        if MEMOIZED_KEY in self.__dict__:
+            copied.__dict__[MEMOIZED_KEY] = dict(self.__dict__[MEMOIZED_KEY])
+        return copied
+
+    def clear_memoized(self) -> None:
+        """Forget the memoized values of this model and of the models nested in it, e.g. to time
+        computing them from scratch"""
+        self.__dict__.pop(MEMOIZED_KEY, None)
+        for value in self.__dict__.values():
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, MemoizedModel):
+                    item.clear_memoized()
+
+
 # Create an enum of valid team names
 class StrEnum(str, Enum):
     pass
@@ -60,7 +165,7 @@ HeadToHeadEnum = StrEnum("HeadToHeadEnum", [("h2h", "h2h")])
 
 class Outcome(BaseModel, extra="allow"):
     name: TeamNameEnum
-    price: int
+    price: Union[int, float]  # American odds; decimal odds are converted when parsed
 
     @computed_field
     @property
@@ -69,9 +174,18 @@ class Outcome(BaseModel, extra="allow"):
 
     @field_validator("name", mode="before")
     @classmethod
-    def convert_to_valid_team_name(cls, value):
+    def convert_to_valid_team_name(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
         return convert_team_name(name=value)
 
+    @field_validator("price")
+    @classmethod
+    def convert_decimal_to_american(cls, value, info: ValidationInfo):
+        if info.context and info.context.get("odds_format") == OddsFormat.DECIMAL:
+            return float(decimal_to_american(value))
+        return value
+
 
 class HeadToHeadOdds(BaseModel, extra="allow"):
     key: HeadToHeadEnum
@@ -79,20 +193,25 @@ class HeadToHeadOdds(BaseModel, extra="allow"):
     outcomes: Annotated[List[Outcome], Field(min_length=2, max_length=2)]
 
 
-class BookMakerOdds(BaseModel, extra="allow"):
+class BookMakerOdds(MemoizedModel, extra="allow"):
     title: str
     last_update: datetime
     markets: Annotated[List[HeadToHeadOdds], Field(min_length=1, max_length=1)]
 
+    def _fingerprint(self) -> Hashable:
+        return tuple(
+            (outcome.name, outcome.price) for market in self.markets for outcome in market.outcomes
+        )
+
     @computed_field
-    @property
+    @memoized_property
     def win_probability(self) -> float:
         raw_probs = np.array([outcome.raw_win_probability for outcome in self.markets[0].outcomes])
         normalized_probs = raw_probs / np.sum(raw_probs)
         return np.max(normalized_probs)
 
     @computed_field
-    @property
+    @memoized_property
     def predicted_winner(self) -> Optional[TeamNameEnum]:
         raw_probs = [outcome.raw_win_probability for outcome in self.markets[0].outcomes]
 
@@ -104,7 +223,7 @@ class BookMakerOdds(BaseModel, extra="allow"):
         return self.markets[0].outcomes[max_idx].name
 
 
-class GameOdds(BaseModel, extra="allow"):
+class GameOdds(MemoizedModel, extra="allow"):
     # Input fields
     id: str
     home_team: TeamNameEnum
@@ -112,8 +231,15 @@ class GameOdds(BaseModel, extra="allow"):
     commence_time: datetime
     bookmakers: List[BookMakerOdds]
 
+    def _fingerprint(self) -> Hashable:
+        return (
+            self.home_team,
+            self.away_team,
+            tuple(bookmaker._fingerprint() for bookmaker in self.bookmakers),
+        )
+
     @computed_field
-    @property
+    @memoized_property
     def home_team_win_prob(self) -> float:
         home_prob = 0.0
         for bookmaker in self.bookmakers:
@@ -126,12 +252,12 @@ class GameOdds(BaseModel, extra="allow"):
         return home_prob / len(self.bookmakers)
 
     @computed_field
-    @property
+    @memoized_property
     def away_team_win_prob(self) -> float:
         return 1.0 - self.home_team_win_prob
 
     @computed_field
-    @property
+    @memoized_property
     def predicted_winner(self) -> TeamNameEnum:
         if self.home_team_win_prob >= self.away_team_win_prob:
             return self.home_team
@@ -139,16 +265,17 @@ class GameOdds(BaseModel, extra="allow"):
             return self.away_team
 
     @computed_field
-    @property
+    @memoized_property
     def win_probability(self) -> float:
         return max(self.home_team_win_prob, self.away_team_win_prob)
 
     @computed_field
-    @property
+    @memoized_property
     def win_probability_variance(self) -> float:
+        predicted_winner = self.predicted_winner
         bookmaker_probs = []
         for bookmaker in self.bookmakers:
-            if bookmaker.predicted_winner == self.predicted_winner:
+            if bookmaker.predicted_winner == predicted_winner:
                 prob = bookmaker.win_probability
             elif bookmaker.predicted_winner == self.away_team:
                 prob = 1.0 - bookmaker.win_probability
@@ -158,71 +285,440 @@ class GameOdds(BaseModel, extra="allow"):
         return np.var(bookmaker_probs)
 
     @computed_field
-    @property
+    @memoized_property
     def oddsmaker_agreement(self) -> float:
-        agree = [
-            bookmaker.predicted_winner == self.predicted_winner for bookmaker in self.bookmakers
-        ]
+        predicted_winner = self.predicted_winner
+        agree = [bookmaker.predicted_winner == predicted_winner for bookmaker in self.bookmakers]
         return np.mean(agree)
 
     @field_validator("home_team", mode="before")
     @classmethod
-    def convert_home_to_valid_team_name(cls, value):
+    def convert_home_to_valid_team_name(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
         return convert_team_name(name=value)
 
     @field_validator("away_team", mode="before")
     @classmethod
-    def convert_away_to_valid_team_name(cls, value):
+    def convert_away_to_valid_team_name(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
         return convert_team_name(name=value)
 
     @field_validator("commence_time", mode="before")
     @classmethod
-    def add_tz_to_commence_time(cls, value):
+    def add_tz_to_commence_time(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
         return add_timezone(date_str=value)
 
 
-def get_the_odds_json(api_key: str, odds_format: str = "american") -> List[Dict]:
+class OddsTable:
+    """Dense, columnar view of a list of GameOdds objects.
+
+    Prices are stored in a (games x bookmakers x 2) array where the last axis is ordered
+    (home, away) and missing bookmakers are NaN. Every per-game metric exposed by GameOdds is
+    computed once, in a single vectorized pass, when the table is built. GameOdds removes the
+    bookmakers' margin proportionally; the table can use any DevigMethod instead, and can weight
+    each bookmaker's probability by its reliability (see nfl_confidence.weights).
+    """
+
+    HOME = 0
+    AWAY = 1
+    TIE = -1
+
+    def __init__(
+        self,
+        game_ids: List[str],
+        home_teams: List[TeamNameEnum],
+        away_teams: List[TeamNameEnum],
+        commence_times: List[datetime],
+        bookmakers: List[str],
+        prices: np.ndarray,
+        odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN,
+        devig_method: Union[DevigMethod, str] = DevigMethod.PROPORTIONAL,
+        bookmaker_weights: Optional[Mapping[str, float]] = None,
+    ):
+        """Build the table from already-aligned columns
+
+        Args:
+            game_ids (List[str]): Game IDs, one per game
+            home_teams (List[TeamNameEnum]): Home team, one per game
+            away_teams (List[TeamNameEnum]): Away team, one per game
+            commence_times (List[datetime]): Commence time, one per game
+            bookmakers (List[str]): Bookmaker titles, one per column of prices
+            prices (np.ndarray): Odds of shape (games, bookmakers, 2), NaN if missing
+            odds_format (Union[OddsFormat, str], optional): Format of prices. Defaults to
+                American.
+            devig_method (Union[DevigMethod, str], optional): Method used to remove each
+                bookmaker's margin. Defaults to proportional.
+            bookmaker_weights (Optional[Mapping[str, float]], optional): Weight of each
+                bookmaker in the home win probability, 1.0 for bookmakers not listed. Defaults to
+                an unweighted mean.
+        """
+        prices = np.asarray(prices, dtype=float)
+        if prices.shape != (len(game_ids), len(bookmakers), 2):
+            raise ValueError(
+                f"Expected prices of shape {(len(game_ids), len(bookmakers), 2)}, "
+                f"got {prices.shape}"
+            )
+        self.game_ids = np.array(game_ids, dtype=object)
+        self.home_team = np.array(home_teams, dtype=object)
+        self.away_team = np.array(away_teams, dtype=object)
+        self.commence_time = np.array(commence_times, dtype=object)
+        self.bookmakers = list(bookmakers)
+        self.prices = prices
+        self.odds_format = OddsFormat(odds_format)
+        self.devig_method = DevigMethod(devig_method)
+        self.bookmaker_weights = (
+            None
+            if bookmaker_weights is None
+            else np.array([bookmaker_weights.get(title, 1.0) for title in self.bookmakers])
+        )
+        self._compute()
+
+    @classmethod
+    @timed("aggregate")
+    def from_games(
+        cls,
+        games: List[GameOdds],
+        devig_method: Union[DevigMethod, str] = DevigMethod.PROPORTIONAL,
+        bookmaker_weights: Optional[Mapping[str, float]] = None,
+    ) -> "OddsTable":
+        """Build an OddsTable from a list of parsed GameOdds objects
+
+        Args:
+            games (List[GameOdds]): Parsed games, e.g. from parse_the_odds_json
+            devig_method (Union[DevigMethod, str], optional): Method used to remove each
+                bookmaker's margin. Defaults to proportional, matching GameOdds.
+            bookmaker_weights (Optional[Mapping[str, float]], optional): Weight of each
+                bookmaker in the home win probability. Defaults to an unweighted mean, matching
+                GameOdds.
+
+        Returns:
+            OddsTable: Columnar table with one row per game
+        """
+        # Assign each bookmaker a column in order of first appearance
+        bookmaker_idx: Dict[str, int] = {}
+        for game in games:
+            for bookmaker in game.bookmakers:
+                bookmaker_idx.setdefault(bookmaker.title, len(bookmaker_idx))
+
+        # Fill the dense price array, aligning outcomes to (home, away)
+        prices = np.full((len(games), len(bookmaker_idx), 2), np.nan)
+        for i, game in enumerate(games):
+            for bookmaker in game.bookmakers:
+                j = bookmaker_idx[bookmaker.title]
+                for outcome in bookmaker.markets[0].outcomes:
+                    if outcome.name == game.home_team:
+                        prices[i, j, cls.HOME] = outcome.price
+                    elif outcome.name == game.away_team:
+                        prices[i, j, cls.AWAY] = outcome.price
+
+        return cls(
+            game_ids=[game.id for game in games],
+            home_teams=[game.home_team for game in games],
+            away_teams=[game.away_team for game in games],
+            commence_times=[game.commence_time for game in games],
+            bookmakers=list(bookmaker_idx),
+            prices=prices,
+            devig_method=devig_method,
+            bookmaker_weights=bookmaker_weights,
+        )
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def _compute(self) -> None:
+        """Compute all per-bookmaker and per-game metrics from the price array"""
+        prices = self.prices
+        present = ~np.isnan(prices).any(axis=-1)
+
+        # Per-bookmaker implied and fair probabilities
+        raw_probs = implied_probabilities(prices, odds_format=self.odds_format)
+        normalized_probs = remove_vig(raw_probs, method=self.devig_method)
+        self.raw_probs = raw_probs
+        self.bookmaker_home_prob = normalized_probs[..., self.HOME]
+        self.bookmaker_win_probability = np.max(normalized_probs, axis=-1)
+        self.bookmaker_predicted_winner = np.where(
+            raw_probs[..., self.HOME] == raw_probs[..., self.AWAY],
+            self.TIE,
+            np.argmax(np.nan_to_num(raw_probs, nan=-1.0), axis=-1),
+        )
+        self.bookmaker_predicted_winner[~present] = self.TIE
+        self.bookmaker_count = present.sum(axis=-1)
+
+        # Each bookmaker's home probability is its normalized home probability (0.5 on a tie)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self.bookmaker_weights is None:
+                self.home_team_win_prob = (
+                    np.nansum(self.bookmaker_home_prob, axis=-1) / self.bookmaker_count
+                )
+            else:
+                self.home_team_win_prob = np.nansum(
+                    self.bookmaker_home_prob * self.bookmaker_weights, axis=-1
+                ) / (present @ self.bookmaker_weights)
+        self.away_team_win_prob = 1.0 - self.home_team_win_prob
+        self.win_probability = np.maximum(self.home_team_win_prob, self.away_team_win_prob)
+        winner_is_home = self.home_team_win_prob >= self.away_team_win_prob
+        self.predicted_winner_idx = np.where(winner_is_home, self.HOME, self.AWAY)
+        self.predicted_winner = np.where(winner_is_home, self.home_team, self.away_team)
+
+        # Per-bookmaker probability assigned to the predicted winner, matching GameOdds
+        agrees = self.bookmaker_predicted_winner == self.predicted_winner_idx[:, None]
+        winner_probs = np.where(
+            agrees,
+            self.bookmaker_win_probability,
+            np.where(
+                self.bookmaker_predicted_winner == self.AWAY,
+                1.0 - self.bookmaker_win_probability,
+                0.5,
+            ),
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_winner_prob = np.sum(winner_probs * present, axis=-1) / self.bookmaker_count
+            squared_error = (winner_probs - mean_winner_prob[:, None]) ** 2
+            self.win_probability_variance = (
+                np.sum(np.where(present, squared_error, 0.0), axis=-1) / self.bookmaker_count
+            )
+            self.oddsmaker_agreement = np.sum(agrees & present, axis=-1) / self.bookmaker_count
+
+
+GameOddsListAdapter = TypeAdapter(List[GameOdds])
+
+THE_ODDS_BASE_URL = "https://api.the-odds-api.com"
+
+# Seconds to wait for the-odds API to accept a connection or send data before giving up
+THE_ODDS_TIMEOUT = 10.0
+
+
+@timed("fetch")
+def get_the_odds_json(
+    api_key: str,
+    odds_format: str = "american",
+    sport: str = "americanfootball_nfl",
+    regions: str = "us",
+    markets: str = "h2h",
+    cache: Optional[ResponseCache] = None,
+    session: Optional[requests.Session] = None,
+    base_url: str = THE_ODDS_BASE_URL,
+    archive: Optional[ResponseArchive] = None,
+    timeout: float = THE_ODDS_TIMEOUT,
+) -> List[Dict]:
     """Make request to the-odds API for bookmaker odds
 
     Args:
         api_key (str): The-odds API key
-        odds_format (str, optional): Format for odds, one of "american" or "decimal" All downstream
-        functions require "american" format. Defaults to "american".
+        odds_format (str, optional): Format for odds, one of "american" or "decimal". Pass the
+            same format to parse_the_odds_json. Defaults to "american".
+        sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+        regions (str, optional): Comma separated bookmaker regions. Defaults to "us".
+        markets (str, optional): Comma separated markets. Defaults to "h2h".
+        cache (Optional[ResponseCache], optional): On-disk response cache. A fresh cached response
+            skips the request entirely, and the cache's quota check runs before any request.
+            Defaults to None.
+        session (Optional[requests.Session], optional): Session to reuse pooled connections.
+            Defaults to None.
+        base_url (str, optional): API base URL, e.g. of a local stand-in server. Defaults to
+            THE_ODDS_BASE_URL.
+        archive (Optional[ResponseArchive], optional): Archive recording every response fetched
+            from the API, for offline replay with fetch.ReplayClient. Defaults to None.
+        timeout (float, optional): Seconds to wait to connect or for data before raising
+            requests.Timeout. Defaults to THE_ODDS_TIMEOUT.
 
     Returns:
         List[Dict]: The-odds response JSON
     """
-    url = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/odds/"
-    params = {
-        "regions": "us",
-        "apiKey": api_key,
-        "markets": "h2h",
-        "oddsFormat": odds_format,
-    }
-    resp = requests.get(url, params)
-    resp.raise_for_status()
-    return resp.json()
+    params = odds_params(odds_format=odds_format, regions=regions, markets=markets)
+    if cache is not None:
+        cached = cache.get(sport=sport, params=params)
+        if cached is not None:
+            increment("fetch_cache_hits")
+            return cached
+        cache.check_quota(cost=request_cost(params=params))
+
+    resp = _request_odds(
+        api_key=api_key,
+        sport=sport,
+        params=params,
+        session=session,
+        base_url=base_url,
+        timeout=timeout,
+    )
+    the_odds_json = resp.json()
+    _store_response(
+        sport=sport,
+        params=params,
+        resp=resp,
+        the_odds_json=the_odds_json,
+        cache=cache,
+        archive=archive,
+    )
+    return the_odds_json
+
+
+def get_the_odds_bytes(
+    api_key: str,
+    odds_format: str = "american",
+    sport: str = "americanfootball_nfl",
+    regions: str = "us",
+    markets: str = "h2h",
+    cache: Optional[ResponseCache] = None,
+    session: Optional[requests.Session] = None,
+    base_url: str = THE_ODDS_BASE_URL,
+    archive: Optional[ResponseArchive] = None,
+    timeout: float = THE_ODDS_TIMEOUT,
+) -> bytes:
+    """Make request to the-odds API for bookmaker odds, returning the raw response body so a
+    ParsedGameCache can key it without re-serializing the decoded JSON. A fresh response cache
+    hit has no raw body, so it is returned as its canonical JSON.
 
+    Args:
+        api_key (str): The-odds API key
+        odds_format (str, optional): Format for odds. Defaults to "american".
+        sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+        regions (str, optional): Comma separated bookmaker regions. Defaults to "us".
+        markets (str, optional): Comma separated markets. Defaults to "h2h".
+        cache (Optional[ResponseCache], optional): On-disk response cache. Defaults to None.
+        session (Optional[requests.Session], optional): Session to reuse pooled connections.
+            Defaults to None.
+        base_url (str, optional): API base URL. Defaults to THE_ODDS_BASE_URL.
+        archive (Optional[ResponseArchive], optional): Archive recording every response fetched
+            from the API. Defaults to None.
+        timeout (float, optional): Seconds to wait to connect or for data before raising
+            requests.Timeout. Defaults to THE_ODDS_TIMEOUT.
 
-def parse_the_odds_json(the_odds_json: List[Dict]) -> List[GameOdds]:
+    Returns:
+        bytes: Raw response body
+    """
+    params = odds_params(odds_format=odds_format, regions=regions, markets=markets)
+    if cache is not None:
+        cached = cache.get(sport=sport, params=params)
+        if cached is not None:
+            increment("fetch_cache_hits")
+            return canonical_json(cached)
+        cache.check_quota(cost=request_cost(params=params))
+
+    resp = _request_odds(
+        api_key=api_key,
+        sport=sport,
+        params=params,
+        session=session,
+        base_url=base_url,
+        timeout=timeout,
+    )
+    if cache is not None or archive is not None:
+        _store_response(
+            sport=sport,
+            params=params,
+            resp=resp,
+            the_odds_json=load_json_bytes(resp.content),
+            cache=cache,
+            archive=archive,
+        )
+    return resp.content
+
+
+def _request_odds(
+    api_key: str,
+    sport: str,
+    params: Dict[str, str],
+    session: Optional[requests.Session],
+    base_url: str,
+    timeout: float,
+) -> requests.Response:
+    """Send a the-odds odds request, raising for error responses"""
+    url = f"{base_url}/v4/sports/{sport}/odds/"
+    resp = (session or requests).get(url, {**params, "apiKey": api_key}, timeout=timeout)
+    increment("fetch_requests")
+    resp.raise_for_status()
+    return resp
+
+
+def _store_response(
+    sport: str,
+    params: Dict[str, str],
+    resp: requests.Response,
+    the_odds_json: List[Dict],
+    cache: Optional[ResponseCache],
+    archive: Optional[ResponseArchive],
+) -> None:
+    """Put a fetched response in the response cache and archive, when there are any"""
+    if cache is not None:
+        cache.put(sport=sport, params=params, response=the_odds_json, headers=resp.headers)
+    if archive is not None:
+        archive.record(sport=sport, params=params, response=the_odds_json, headers=resp.headers)
+
+
+@timed("parse")
+def parse_the_odds_json(
+    the_odds_json: List[Dict], odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN
+) -> List[GameOdds]:
     """Parse the-odds JSON response into a list of GameOdds objects
 
     Args:
         the_odds_json (List[Dict]): the-odds API response
+        odds_format (Union[OddsFormat, str], optional): Format the odds were requested in.
+            Decimal odds are converted to American. Defaults to American.
+
+    Returns:
+        List[GameOdds]: the-odds API response parsed into a list of GameOdds objects
+    """
+    return GameOddsListAdapter.validate_python(
+        the_odds_json, context={"odds_format": OddsFormat(odds_format)}
+    )
+
+
+def load_json_bytes(raw: Union[bytes, str]) -> Any:
+    """Decode raw JSON, using orjson when it is installed and the standard library otherwise
+
+    Args:
+        raw (Union[bytes, str]): Raw JSON document
+
+    Returns:
+        Any: Decoded JSON document
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@timed("parse")
+def parse_the_odds_bytes(
+    raw: Union[bytes, str],
+    odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN,
+    trusted: bool = False,
+) -> List[GameOdds]:
+    """Bulk parse a raw the-odds API response into a list of GameOdds objects. The whole list is
+    validated in a single TypeAdapter call. In trusted mode the Python field validators, which
+    normalize team names and timestamps, are skipped.
+
+    Args:
+        raw (Union[bytes, str]): Raw the-odds API response body
+        odds_format (Union[OddsFormat, str], optional): Format the odds were requested in.
+            Decimal odds are converted to American. Defaults to American.
+        trusted (bool, optional): Skip the field validators for data that was already validated,
+            e.g. archived GameOdds.model_dump(mode="json") snapshots. Defaults to False.
 
     Returns:
         List[GameOdds]: the-odds API response parsed into a list of GameOdds objects
     """
-    return [GameOdds(**game) for game in the_odds_json]
+    # pydantic-core builds the nested models faster than model_construct can from Python, so
+    # trusted data is still validated, just without the Python validators
+    context = {"odds_format": OddsFormat(odds_format), "trusted": trusted}
+    if orjson is not None:
+        return GameOddsListAdapter.validate_python(orjson.loads(raw), context=context)
+    return GameOddsListAdapter.validate_json(raw, context=context)
 
 
 def filter_games_by_date(
-    games: List[GameOdds], after: datetime = datetime.min, before: datetime = datetime.max
+    games: Iterable[GameOdds], after: datetime = datetime.min, before: datetime = datetime.max
 ) -> List[GameOdds]:
     """Filter the list of games down to only those with a commence_time between the given range.
 
     Args:
-        games (List[GameOdds]): List of GameOdds objects
+        games (Iterable[GameOdds]): List of GameOdds objects, or a stream of them such as
+            nfl_confidence.stream.iter_games
         after (datetime, optional): Keep only games with commence_time strictly greater than after.
             Defaults to datetime.min.
         before (datetime, optional): Keep only games with commence_time strictly less than after.
@@ -234,33 +730,21 @@ def filter_games_by_date(
     return [game for game in games if after < game.commence_time < before]
 
 
-def get_this_weeks_games(games: List[GameOdds]) -> List[GameOdds]:
+def get_this_weeks_games(
+    games: Iterable[GameOdds], now: Optional[datetime] = None
+) -> List[GameOdds]:
     """Filter games list to only those between now and the coming Tuesday (since Monday Night
     Football is the last game of the week)
 
     Args:
-        games (List[GameOdds]): List of games
+        games (Iterable[GameOdds]): List of games, or a stream of them
+        now (Optional[datetime], optional): Current time. Defaults to the system clock.
 
     Returns:
         List[GameOdds]: Filtered list of games
     """
-    # Compute the number of days until Tuesday
-    now = datetime.now(tz=timezone("US/Eastern"))
-    today = now.weekday()
-    tuesday = 1  # Tuesday has int value 1 in datetime
-    days_til_tuesday = (tuesday - today) % 7
-
-    # If today is Tuesday, get a week from today
-    if days_til_tuesday == 0:
-        days_til_tuesday = 7
-
-    # Keep only games between now and the coming Tuesday
-    next_tuesday = now + timedelta(days=days_til_tuesday)
-    return filter_games_by_date(
-        games=games,
-        after=now,
-        before=next_tuesday,
-    )
+    after, before = this_week_window(now or datetime.now(tz=timezone("US/Eastern")))
+    return filter_games_by_date(games=games, after=after, before=before)
 
 
 def convert_odds_to_probs(odds: float) -> float:
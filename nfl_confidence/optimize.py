@@ -0,0 +1,280 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel
+
+from nfl_confidence.simulate import greedy_assignment, iter_favorite_wins
+
+
+class Opponent(BaseModel):
+    name: str  # Rival's name, as in the league results columns
+    points: int = 0  # Season points so far
+    noise: float = 0.5  # Std of the rival's error, in log-odds, when judging each game
+
+
+class OptimizedPicks(BaseModel):
+    picks_home: List[bool]  # Whether each game's pick is the home team
+    confidence: List[int]  # Confidence value of each game
+    win_probability: float  # P(finish first) of these picks on held-out simulations
+    greedy_win_probability: float  # P(finish first) of the expected-points picks, same sims
+
+
+def load_standings(csv_path: str) -> Dict[str, int]:
+    """Total each player's points in a league results file
+
+    Args:
+        csv_path (str): Tab separated league results, one column per player and one row per week
+
+    Returns:
+        Dict[str, int]: Season points by player
+    """
+    df = pd.read_csv(csv_path, sep="\t")
+    return {str(name): int(points) for name, points in df.sum().items()}
+
+
+def opponents_from_standings(
+    standings: Dict[str, int], me: str, noise: float = 0.5
+) -> Tuple[int, List[Opponent]]:
+    """Split league standings into my points and my rivals
+
+    Args:
+        standings (Dict[str, int]): Season points by player, e.g. from load_standings
+        me (str): My name in the standings
+        noise (float, optional): Every rival's judging error, see Opponent. Defaults to 0.5.
+
+    Returns:
+        Tuple[int, List[Opponent]]: My points and the other players
+    """
+    if me not in standings:
+        raise ValueError(f"{me} is not in the standings: {sorted(standings)}")
+    opponents = [
+        Opponent(name=name, points=points, noise=noise)
+        for name, points in standings.items()
+        if name != me
+    ]
+    return standings[me], opponents
+
+
+class PickScenarios:
+    """Simulated weeks against which candidate assignments are compared: every game's outcome
+    and, for each outcome, the best rival total after the week. Rivals pick the team they judge
+    more likely to win and rank their picks by that judgement, where each judgement is the
+    consensus log-odds plus the rival's own noise.
+    """
+
+    def __init__(
+        self,
+        home_win_probability: np.ndarray,
+        opponents: List[Opponent],
+        max_confidence: int = 16,
+        n_sims: int = 20_000,
+        seed: int = 0,
+        correlation: Union[float, np.ndarray] = 0.0,
+    ):
+        """
+        Args:
+            home_win_probability (np.ndarray): Home team win probability of each game
+            opponents (List[Opponent]): Rivals in the league
+            max_confidence (int, optional): Confidence value of the most confident game.
+                Defaults to 16.
+            n_sims (int, optional): Number of simulated weeks. Defaults to 20,000.
+            seed (int, optional): Random seed. Defaults to 0.
+            correlation (Union[float, np.ndarray], optional): Correlation between favorites'
+                outcomes, see simulate.iter_favorite_wins. Defaults to independent games.
+        """
+        home_win_probability = np.asarray(home_win_probability, dtype=float)
+        n_games = len(home_win_probability)
+        self.favorite_is_home = home_win_probability >= 0.5
+        favorite_probability = np.where(
+            self.favorite_is_home, home_win_probability, 1 - home_win_probability
+        )
+        favorite_wins = np.concatenate(
+            list(
+                iter_favorite_wins(
+                    favorite_probability=favorite_probability,
+                    n_sims=n_sims,
+                    seed=seed,
+                    correlation=correlation,
+                )
+            )
+        )
+        self.favorite_wins = favorite_wins.astype(np.float32)
+        self.min_confidence = max_confidence - n_games + 1
+
+        # Rivals' picks and confidence in every simulated week, judged independently of outcomes
+        rng = np.random.default_rng([seed, 1])
+        noise = np.array([opponent.noise for opponent in opponents])[None, :, None]
+        logit = np.log(home_win_probability) - np.log1p(-home_win_probability)
+        judged = logit + noise * rng.standard_normal((n_sims, len(opponents), n_games))
+        rank = np.argsort(np.argsort(np.abs(judged), axis=-1), axis=-1)
+        home_wins = favorite_wins == self.favorite_is_home
+        correct = (judged > 0) == home_wins[:, None, :]
+        rival_points = np.sum(correct * (rank + self.min_confidence), axis=-1)
+        totals = rival_points + np.array([opponent.points for opponent in opponents], dtype=int)
+        if opponents:
+            self.rival_best = totals.max(axis=1)
+            self.rival_ties = (totals == self.rival_best[:, None]).sum(axis=1)
+        else:
+            self.rival_best = np.full(n_sims, -np.inf)
+            self.rival_ties = np.zeros(n_sims)
+
+    def win_probability(
+        self, picks_favorite: np.ndarray, confidence: np.ndarray, points: int = 0
+    ) -> np.ndarray:
+        """P(finish first) of many candidate assignments at once, sharing a tied first place
+
+        Args:
+            picks_favorite (np.ndarray): (candidates, games) booleans, True where the pick is the
+                favorite
+            confidence (np.ndarray): (candidates, games) confidence values
+            points (int, optional): My points before the week. Defaults to 0.
+
+        Returns:
+            np.ndarray: P(finish first) of each candidate
+        """
+        # Points are the confidence of picked underdogs that won plus picked favorites that won,
+        # i.e. the underdogs' confidence plus the favorites' outcomes weighted by +/- confidence
+        signed = np.where(picks_favorite, confidence, -confidence).astype(np.float32)
+        base = np.sum(np.where(picks_favorite, 0, confidence), axis=-1)
+        totals = self.favorite_wins @ signed.T + (base + points)
+        share = (totals > self.rival_best[:, None]) + (totals == self.rival_best[:, None]) / (
+            self.rival_ties[:, None] + 1
+        )
+        return share.mean(axis=0)
+
+
+def neighbors(picks_favorite: np.ndarray, confidence: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Every assignment one move away: swapping two games' confidence or flipping one pick
+
+    Args:
+        picks_favorite (np.ndarray): Picks of the current assignment, True for the favorite
+        confidence (np.ndarray): Confidence values of the current assignment
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (candidates, games) picks and confidence values
+    """
+    n_games = len(confidence)
+    first, second = np.triu_indices(n_games, k=1)
+    n_swaps = len(first)
+    swap_picks = np.tile(picks_favorite, (n_swaps, 1))
+    swap_confidence = np.tile(confidence, (n_swaps, 1))
+    rows = np.arange(n_swaps)
+    swap_confidence[rows, first] = confidence[second]
+    swap_confidence[rows, second] = confidence[first]
+
+    flip_picks = np.tile(picks_favorite, (n_games, 1))
+    flip_picks[np.arange(n_games), np.arange(n_games)] ^= True
+    flip_confidence = np.tile(confidence, (n_games, 1))
+    return (
+        np.concatenate([swap_picks, flip_picks]),
+        np.concatenate([swap_confidence, flip_confidence]),
+    )
+
+
+def local_search(
+    start: Tuple[np.ndarray, np.ndarray],
+    scenarios: PickScenarios,
+    points: int = 0,
+    max_steps: int = 500,
+) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Hill climb from a starting assignment, taking the best neighbor while it improves
+
+    Args:
+        start (Tuple[np.ndarray, np.ndarray]): Starting picks (True for the favorite) and
+            confidence values
+        scenarios (PickScenarios): Simulated weeks to evaluate on
+        points (int, optional): My points before the week. Defaults to 0.
+        max_steps (int, optional): Maximum moves. Defaults to 500.
+
+    Returns:
+        Tuple[float, np.ndarray, np.ndarray]: P(finish first), picks and confidence reached
+    """
+    picks_favorite, confidence = (np.array(x) for x in start)
+    best = float(scenarios.win_probability(picks_favorite[None], confidence[None], points)[0])
+    for _ in range(max_steps):
+        candidate_picks, candidate_confidence = neighbors(picks_favorite, confidence)
+        values = scenarios.win_probability(candidate_picks, candidate_confidence, points)
+        idx = int(np.argmax(values))
+        if values[idx] <= best:
+            break
+        best = float(values[idx])
+        picks_favorite, confidence = candidate_picks[idx], candidate_confidence[idx]
+    return best, picks_favorite, confidence
+
+
+def optimize_picks(
+    home_win_probability: np.ndarray,
+    opponents: List[Opponent],
+    points: int = 0,
+    max_confidence: int = 16,
+    n_sims: int = 20_000,
+    restarts: int = 8,
+    max_workers: Optional[int] = None,
+    seed: int = 0,
+    correlation: Union[float, np.ndarray] = 0.0,
+) -> OptimizedPicks:
+    """Search picks and confidence values, upsets included, for the highest chance of leading
+    the league after this week. Hill climbs start from the expected-points assignment and from
+    random perturbations of it, one restart per worker process, all on the same simulated weeks.
+    The winner is then scored on a fresh set of simulations, since its search score is biased up.
+
+    Args:
+        home_win_probability (np.ndarray): Home team win probability of each game
+        opponents (List[Opponent]): Rivals in the league
+        points (int, optional): My points before the week. Defaults to 0.
+        max_confidence (int, optional): Confidence value of the most confident game. Defaults to
+            16.
+        n_sims (int, optional): Simulated weeks to search and to score on. Defaults to 20,000.
+        restarts (int, optional): Hill climbs to run. Defaults to 8.
+        max_workers (Optional[int], optional): Worker processes. Defaults to one per restart, up
+            to the number of CPUs. With 1, restarts run in this process.
+        seed (int, optional): Random seed. Defaults to 0.
+        correlation (Union[float, np.ndarray], optional): Correlation between favorites'
+            outcomes, see simulate.iter_favorite_wins. Defaults to independent games.
+
+    Returns:
+        OptimizedPicks: Best picks found with their held-out P(finish first)
+    """
+    home_win_probability = np.asarray(home_win_probability, dtype=float)
+    picks_home, confidence = greedy_assignment(home_win_probability, max_confidence=max_confidence)
+    favorite_is_home = home_win_probability >= 0.5
+    greedy = (picks_home == favorite_is_home, confidence)
+
+    # Random starts flip a few picks towards close games and shuffle some confidence values
+    rng = np.random.default_rng([seed, 2])
+    underdog_probability = np.minimum(home_win_probability, 1 - home_win_probability)
+    starts = [greedy]
+    for _ in range(restarts - 1):
+        flips = rng.random(len(confidence)) < underdog_probability / 2
+        start_confidence = confidence.copy()
+        shuffled = np.flatnonzero(rng.random(len(confidence)) < 0.3)
+        start_confidence[shuffled] = rng.permutation(start_confidence[shuffled])
+        starts.append((greedy[0] ^ flips, start_confidence))
+
+    kwargs = dict(max_confidence=max_confidence, n_sims=n_sims, correlation=correlation)
+    scenarios = PickScenarios(home_win_probability, opponents, seed=seed, **kwargs)
+    search = partial(local_search, scenarios=scenarios, points=points)
+    if max_workers == 1 or len(starts) <= 1:
+        climbs = [search(start) for start in starts]
+    else:
+        max_workers = max_workers or min(len(starts), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            climbs = list(executor.map(search, starts))
+    _, best_picks, best_confidence = max(climbs, key=lambda climb: climb[0])
+    logger.info(f"Search P(first) by restart: {[round(climb[0], 4) for climb in climbs]}")
+
+    holdout = PickScenarios(home_win_probability, opponents, seed=seed + 1, **kwargs)
+    values = holdout.win_probability(
+        np.stack([best_picks, greedy[0]]), np.stack([best_confidence, greedy[1]]), points
+    )
+    return OptimizedPicks(
+        picks_home=(best_picks == favorite_is_home).tolist(),
+        confidence=best_confidence.tolist(),
+        win_probability=float(values[0]),
+        greedy_win_probability=float(values[1]),
+    )
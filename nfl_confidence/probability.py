@@ -0,0 +1,177 @@
+from enum import Enum
+from typing import Callable, Union
+
+import numpy as np
+
+# Iteration limits for the power (Newton) and Shin (bisection, beyond two outcomes) solvers
+NEWTON_ITERATIONS = 50
+BISECTION_ITERATIONS = 64
+
+
+class OddsFormat(str, Enum):
+    AMERICAN = "american"
+    DECIMAL = "decimal"
+
+
+class DevigMethod(str, Enum):
+    PROPORTIONAL = "proportional"  # Scale the implied probabilities to sum to 1
+    ADDITIVE = "additive"  # Subtract an equal share of the overround from every outcome
+    POWER = "power"  # Raise the implied probabilities to the power k that makes them sum to 1
+    SHIN = "shin"  # Shin's model of a bookmaker facing a share z of insider money
+
+
+def american_to_implied(prices: np.ndarray) -> np.ndarray:
+    """Convert American odds to implied probabilities, elementwise. E.g. -150 -> 0.6, +150 -> 0.4
+
+    Args:
+        prices (np.ndarray): American odds, NaN where missing
+
+    Returns:
+        np.ndarray: Implied probabilities, including the bookmaker's margin
+    """
+    prices = np.asarray(prices, dtype=float)
+    return np.where(prices < 0, -prices, 100.0) / (np.abs(prices) + 100)
+
+
+def decimal_to_implied(prices: np.ndarray) -> np.ndarray:
+    """Convert decimal odds to implied probabilities, elementwise. E.g. 2.5 -> 0.4
+
+    Args:
+        prices (np.ndarray): Decimal odds, NaN where missing
+
+    Returns:
+        np.ndarray: Implied probabilities, including the bookmaker's margin
+    """
+    return 1.0 / np.asarray(prices, dtype=float)
+
+
+def decimal_to_american(prices: np.ndarray) -> np.ndarray:
+    """Convert decimal odds to American odds, elementwise. E.g. 2.5 -> 150, 1.5 -> -200
+
+    Args:
+        prices (np.ndarray): Decimal odds
+
+    Returns:
+        np.ndarray: American odds
+    """
+    prices = np.asarray(prices, dtype=float)
+    with np.errstate(divide="ignore"):
+        return np.where(prices >= 2, (prices - 1) * 100, -100 / (prices - 1))
+
+
+def implied_probabilities(
+    prices: np.ndarray, odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN
+) -> np.ndarray:
+    """Convert a whole matrix of odds to implied probabilities in one call
+
+    Args:
+        prices (np.ndarray): Odds of any shape, NaN where missing
+        odds_format (Union[OddsFormat, str], optional): Format of the odds. Defaults to American.
+
+    Returns:
+        np.ndarray: Implied probabilities with the same shape as prices
+    """
+    if OddsFormat(odds_format) == OddsFormat.DECIMAL:
+        return decimal_to_implied(prices)
+    return american_to_implied(prices)
+
+
+def _bisect(
+    total: Callable[[np.ndarray], np.ndarray], low: np.ndarray, high: np.ndarray
+) -> np.ndarray:
+    """Solve total(x) = 1 independently for every element, for total decreasing in x"""
+    for _ in range(BISECTION_ITERATIONS):
+        mid = (low + high) / 2
+        too_low = total(mid) > 1
+        low = np.where(too_low, mid, low)
+        high = np.where(too_low, high, mid)
+    return (low + high) / 2
+
+
+def _power_exponent(implied: np.ndarray) -> np.ndarray:
+    """Solve sum(implied ** k) = 1 for k in every market with Newton's method. The sum is convex
+    and decreasing in k, so starting from k = 1 the iterates approach the root from one side."""
+    k = np.ones(implied.shape[:-1] + (1,))
+    log_implied = np.log(implied)
+    for _ in range(NEWTON_ITERATIONS):
+        powered = implied**k
+        step = (np.sum(powered, axis=-1, keepdims=True) - 1) / np.sum(
+            powered * log_implied, axis=-1, keepdims=True
+        )
+        k = k - step
+        if not np.nanmax(np.abs(step), initial=0.0) > 1e-12:
+            break
+    return k
+
+
+def remove_vig(
+    implied: np.ndarray,
+    method: Union[DevigMethod, str] = DevigMethod.PROPORTIONAL,
+    axis: int = -1,
+) -> np.ndarray:
+    """Remove the bookmaker's margin from implied probabilities so each market sums to 1. Every
+    market along the other axes is solved at once; markets with a missing outcome are NaN.
+
+    Args:
+        implied (np.ndarray): Implied probabilities, e.g. from implied_probabilities
+        method (Union[DevigMethod, str], optional): De-vigging method. Defaults to proportional.
+        axis (int, optional): Axis holding the outcomes of each market. Defaults to -1.
+
+    Returns:
+        np.ndarray: Fair probabilities with the same shape as implied
+    """
+    method = DevigMethod(method)
+    implied = np.moveaxis(np.asarray(implied, dtype=float), axis, -1)
+    n_outcomes = implied.shape[-1]
+    booksum = np.sum(implied, axis=-1, keepdims=True)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == DevigMethod.PROPORTIONAL:
+            fair = implied / booksum
+        elif method == DevigMethod.ADDITIVE:
+            # Longshots can go negative when the margin is large, so clip and renormalize
+            fair = np.clip(implied - (booksum - 1) / n_outcomes, 0, None)
+            fair = fair / np.sum(fair, axis=-1, keepdims=True)
+        elif method == DevigMethod.POWER:
+            fair = implied ** _power_exponent(implied)
+        else:
+
+            def shin(z: np.ndarray) -> np.ndarray:
+                return (np.sqrt(z**2 + 4 * (1 - z) * implied**2 / booksum) - z) / (2 * (1 - z))
+
+            # The insider share z is 0 for a market without margin and below 1 otherwise. Two
+            # outcome markets have a closed form; others are solved by bisection.
+            if n_outcomes == 2:
+                diff_squared = (implied[..., :1] - implied[..., 1:]) ** 2
+                z = (booksum - 1) * (diff_squared - booksum) / (booksum * (diff_squared - 1))
+            else:
+                z = _bisect(
+                    lambda z: np.sum(shin(z), axis=-1, keepdims=True),
+                    low=np.zeros_like(booksum),
+                    high=np.full_like(booksum, 1.0 - 1e-12),
+                )
+            fair = np.where(booksum > 1, shin(z), implied / booksum)
+
+    return np.moveaxis(fair, -1, axis)
+
+
+def devig(
+    prices: np.ndarray,
+    odds_format: Union[OddsFormat, str] = OddsFormat.AMERICAN,
+    method: Union[DevigMethod, str] = DevigMethod.PROPORTIONAL,
+    axis: int = -1,
+) -> np.ndarray:
+    """Convert a matrix of odds straight to fair win probabilities
+
+    Args:
+        prices (np.ndarray): Odds, NaN where missing
+        odds_format (Union[OddsFormat, str], optional): Format of the odds. Defaults to American.
+        method (Union[DevigMethod, str], optional): De-vigging method. Defaults to proportional.
+        axis (int, optional): Axis holding the outcomes of each market. Defaults to -1.
+
+    Returns:
+        np.ndarray: Fair probabilities with the same shape as prices
+    """
+    return remove_vig(
+        implied_probabilities(prices, odds_format=odds_format), method=method, axis=axis
+    )
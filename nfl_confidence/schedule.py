@@ -0,0 +1,111 @@
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+from pytz import timezone
+
+EASTERN = timezone("US/Eastern")
+TUESDAY = 1  # Tuesday has int value 1 in datetime
+
+# Anything with a commence_time, e.g. GameOdds or GameResult
+Game = TypeVar("Game")
+
+
+def nfl_week_start(commence_time: datetime) -> date:
+    """Return the Tuesday (US/Eastern) starting the NFL week a game belongs to, since Monday Night
+    Football is the last game of the week
+
+    Args:
+        commence_time (datetime): Game kickoff time
+
+    Returns:
+        date: Tuesday on or before the game's kickoff date
+    """
+    kickoff_date = commence_time.astimezone(EASTERN).date()
+    return kickoff_date - timedelta(days=(kickoff_date.weekday() - TUESDAY) % 7)
+
+
+def this_week_window(now: datetime) -> Tuple[datetime, datetime]:
+    """Return the window from now until the coming Tuesday, a full week ahead on a Tuesday
+
+    Args:
+        now (datetime): Current time
+
+    Returns:
+        Tuple[datetime, datetime]: Start and end of the window
+    """
+    days_til_tuesday = (TUESDAY - now.astimezone(EASTERN).weekday()) % 7 or 7
+    return now, now + timedelta(days=days_til_tuesday)
+
+
+class GameIndex(Generic[Game]):
+    """Games sorted once by commence_time, with their kickoffs in a parallel array so any time
+    range is found by binary search instead of scanning every game. Suited to whole-season
+    archives which are queried for many windows, e.g. backtests and multi-week views; for a
+    single window over a stream of games, odds.filter_games_by_date avoids the sort.
+    """
+
+    def __init__(
+        self,
+        games: Iterable[Game],
+        clock: Callable[[], datetime] = lambda: datetime.now(tz=EASTERN),
+    ):
+        """
+        Args:
+            games (Iterable[Game]): Games with a timezone-aware commence_time
+            clock (Callable[[], datetime], optional): Returns the current time, for this_week.
+                Defaults to the system clock.
+        """
+        # Sort on timestamps, since comparing timezone-aware datetimes is comparatively slow
+        self.games: List[Game] = sorted(games, key=lambda x: (x.commence_time.timestamp(), x.id))
+        self.kickoffs = np.array([game.commence_time.timestamp() for game in self.games])
+        self.clock = clock
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def between(
+        self, after: Optional[datetime] = None, before: Optional[datetime] = None
+    ) -> List[Game]:
+        """Games with commence_time strictly between after and before, matching
+        odds.filter_games_by_date
+
+        Args:
+            after (Optional[datetime], optional): Exclusive start. Defaults to unbounded.
+            before (Optional[datetime], optional): Exclusive end. Defaults to unbounded.
+
+        Returns:
+            List[Game]: Games in the range, in kickoff order
+        """
+        start = 0 if after is None else np.searchsorted(self.kickoffs, after.timestamp(), "right")
+        end = len(self) if before is None else np.searchsorted(self.kickoffs, before.timestamp())
+        return self.games[start:end]
+
+    def this_week(self, now: Optional[datetime] = None) -> List[Game]:
+        """Games between now and the coming Tuesday, matching odds.get_this_weeks_games
+
+        Args:
+            now (Optional[datetime], optional): Current time. Defaults to the index's clock.
+
+        Returns:
+            List[Game]: This week's remaining games
+        """
+        after, before = this_week_window(now or self.clock())
+        return self.between(after=after, before=before)
+
+    def weeks(self) -> Dict[date, List[Game]]:
+        """Group every game into its NFL week in one pass. Games are already sorted, so each
+        week is a contiguous slice ending at the next Tuesday midnight (US/Eastern).
+
+        Returns:
+            Dict[date, List[Game]]: Games keyed by the Tuesday starting their week, in week order
+        """
+        weeks = {}
+        start = 0
+        while start < len(self):
+            week_start = nfl_week_start(self.games[start].commence_time)
+            week_end = EASTERN.localize(datetime.combine(week_start + timedelta(days=7), time()))
+            end = int(np.searchsorted(self.kickoffs, week_end.timestamp()))
+            weeks[week_start] = self.games[start:end]
+            start = end
+        return weeks
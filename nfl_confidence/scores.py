@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+from pydantic import BaseModel, TypeAdapter, ValidationInfo, field_validator
+
+from nfl_confidence.metrics import increment
+from nfl_confidence.odds import (
+    THE_ODDS_BASE_URL,
+    THE_ODDS_TIMEOUT,
+    TeamNameEnum,
+    add_timezone,
+    convert_team_name,
+    is_trusted,
+)
+from nfl_confidence.stream import iter_json_values
+
+
+class TeamScore(BaseModel, extra="allow"):
+    name: TeamNameEnum
+    score: int  # the-odds returns scores as strings, e.g. "24"
+
+    @field_validator("name", mode="before")
+    @classmethod
+    def convert_to_valid_team_name(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
+        return convert_team_name(name=value)
+
+
+class GameResult(BaseModel, extra="allow"):
+    """A game from the-odds API scores endpoint"""
+
+    id: str
+    commence_time: datetime
+    completed: bool
+    home_team: TeamNameEnum
+    away_team: TeamNameEnum
+    scores: Optional[List[TeamScore]] = None
+
+    @property
+    def home_score(self) -> Optional[int]:
+        return self._score(self.home_team)
+
+    @property
+    def away_score(self) -> Optional[int]:
+        return self._score(self.away_team)
+
+    def _score(self, team: TeamNameEnum) -> Optional[int]:
+        for team_score in self.scores or []:
+            if team_score.name == team:
+                return team_score.score
+        return None
+
+    @property
+    def winner(self) -> Optional[TeamNameEnum]:
+        """Winning team of a completed game, None for ties and games not yet completed"""
+        if not self.completed or self.home_score is None or self.away_score is None:
+            return None
+        if self.home_score == self.away_score:
+            return None
+        return self.home_team if self.home_score > self.away_score else self.away_team
+
+    @field_validator("home_team", "away_team", mode="before")
+    @classmethod
+    def convert_to_valid_team_name(cls, value, info: ValidationInfo):
+        if is_trusted(info):
+            return value
+        return convert_team_name(name=value)
+
+    @field_validator("commence_time", mode="before")
+    @classmethod
+    def add_tz_to_commence_time(cls, value, info: ValidationInfo):
+        if is_trusted(info) or not isinstance(value, str):
+            return value
+        return add_timezone(date_str=value)
+
+
+GameResultListAdapter = TypeAdapter(List[GameResult])
+
+
+def parse_scores_json(scores_json: List[Dict]) -> List[GameResult]:
+    """Parse a the-odds scores endpoint response into GameResult objects
+
+    Args:
+        scores_json (List[Dict]): the-odds scores API response
+
+    Returns:
+        List[GameResult]: Parsed games
+    """
+    return GameResultListAdapter.validate_python(scores_json)
+
+
+def get_scores_json(
+    api_key: str,
+    sport: str = "americanfootball_nfl",
+    days_from: Optional[int] = 3,
+    session: Optional[requests.Session] = None,
+    base_url: str = THE_ODDS_BASE_URL,
+    timeout: float = THE_ODDS_TIMEOUT,
+) -> List[Dict]:
+    """Make request to the-odds API scores endpoint for live and recently completed games
+
+    Args:
+        api_key (str): The-odds API key
+        sport (str, optional): the-odds sport key. Defaults to "americanfootball_nfl".
+        days_from (Optional[int], optional): Include games completed up to this many days ago,
+            1 to 3. None returns only live and upcoming games, at half the quota cost. Defaults
+            to 3.
+        session (Optional[requests.Session], optional): Session to reuse pooled connections.
+            Defaults to None.
+        base_url (str, optional): API base URL, e.g. of a local stand-in server. Defaults to
+            THE_ODDS_BASE_URL.
+        timeout (float, optional): Seconds to wait to connect or for data before raising
+            requests.Timeout. Defaults to THE_ODDS_TIMEOUT.
+
+    Returns:
+        List[Dict]: The-odds scores response JSON
+    """
+    params = {"apiKey": api_key}
+    if days_from is not None:
+        params["daysFrom"] = days_from
+    url = f"{base_url}/v4/sports/{sport}/scores/"
+    resp = (session or requests).get(url, params, timeout=timeout)
+    increment("fetch_requests")
+    resp.raise_for_status()
+    return resp.json()
+
+
+def read_scores_json(path: str) -> List[Dict]:
+    """Read every game from a JSON or JSON-lines archive of the-odds scores responses, gzip
+    included, as a local stand-in for the scores endpoint
+
+    Args:
+        path (str): Path to the (optionally gzipped) archive
+
+    Returns:
+        List[Dict]: Games in the order they appear, as raw JSON
+    """
+    return list(iter_json_values(path=path, stream_arrays=True))
+
+
+def load_results(path: str) -> Dict[str, GameResult]:
+    """Load final results from a JSON or JSON-lines archive of the-odds scores responses, gzip
+    included. When a game appears more than once the last entry wins, so an archive of repeated
+    fetches resolves to each game's latest state.
+
+    Args:
+        path (str): Path to the (optionally gzipped) archive
+
+    Returns:
+        Dict[str, GameResult]: Results keyed by game ID
+    """
+    results = {}
+    for game in iter_json_values(path=path, stream_arrays=True):
+        result = GameResult.model_validate(game)
+        results[result.id] = result
+    return results
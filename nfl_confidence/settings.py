@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import SecretStr
+from pydantic import AwareDatetime, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +8,14 @@ class Settings(BaseSettings):
     # Settings values
     THE_ODDS_API_KEY: SecretStr
     GOOGLE_SHEETS_SECRET_PATH: Optional[str]
+    THE_ODDS_CACHE_DIR: Optional[str] = None  # Set to a directory to cache the-odds responses
+    THE_ODDS_CACHE_TTL: float = 300.0  # Seconds a cached the-odds response stays fresh
+    THE_ODDS_MIN_REQUESTS_REMAINING: int = 0  # the-odds requests to always keep in reserve
+    THE_ODDS_ARCHIVE_DIR: Optional[str] = None  # Record every the-odds response here for replay
+    THE_ODDS_REPLAY_AT: Optional[AwareDatetime] = None  # Replay the archive as of this time
+    THE_ODDS_PARSED_CACHE_DIR: Optional[str] = None  # Set to a directory to cache parsed games
+    THE_ODDS_PARSED_CACHE_MAX_MB: float = 256.0  # Size cap of the parsed game cache
+    BOOKMAKER_WEIGHTS_PATH: Optional[str] = None  # Fitted bookmaker weights, see fit-weights
 
     # Settings config
     model_config = SettingsConfigDict(extra="ignore", env_file=".env")
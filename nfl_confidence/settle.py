@@ -0,0 +1,303 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+from loguru import logger
+from pydantic import BaseModel
+
+from nfl_confidence.metrics import increment
+from nfl_confidence.odds import add_timezone
+from nfl_confidence.scores import GameResult, parse_scores_json
+from nfl_confidence.sheets import SheetWriter, format_cell_value
+
+# Columns describing each settled game, written once per game whatever the pick sets
+RESULT_COLUMNS = ["home_score", "away_score", "winner"]
+
+# Version of a game in a the-odds scores response: whether it completed, and each team's score
+ResultVersion = Tuple[bool, Tuple[Tuple[str, str], ...]]
+
+
+class PickSet(BaseModel):
+    """Columns of a week sheet holding one set of picks, and the columns its grades go to"""
+
+    winner_column: str = "predicted_winner"  # Column of the team picked to win each game
+    confidence_column: str = "confidence_rank"  # Column of the confidence value of each pick
+    correct_column: str = "was_correct"  # Column marking whether each pick won
+    points_column: str = "points"  # Column of the points each pick scored
+
+    @property
+    def grade_columns(self) -> List[str]:
+        return [self.correct_column, self.points_column]
+
+
+def result_version(game_json: Dict[str, Any]) -> ResultVersion:
+    """Identify the state of a game's result from the raw response, without parsing it
+
+    Args:
+        game_json (Dict[str, Any]): A single game from a the-odds scores response
+
+    Returns:
+        ResultVersion: Completed flag and sorted (team, score) pairs
+    """
+    scores = game_json.get("scores") or []
+    return (
+        bool(game_json.get("completed")),
+        tuple(sorted((str(score["name"]), str(score["score"])) for score in scores)),
+    )
+
+
+class Settler:
+    """Keeps the final results seen across successive scores snapshots, so each update only
+    parses and hands back the games which finished (or had their final score corrected) since the
+    last one. Live and upcoming games are skipped until they complete, but their commence times
+    are kept to tell when they age out of the scores endpoint's window.
+    """
+
+    def __init__(self):
+        self.versions: Dict[str, ResultVersion] = {}
+        self.results: Dict[str, GameResult] = {}
+        self.commence_times: Dict[str, datetime] = {}
+
+    def update(self, scores_json: List[Dict[str, Any]]) -> Dict[str, GameResult]:
+        """Apply a new snapshot and return the games which newly settled
+
+        Args:
+            scores_json (List[Dict[str, Any]]): the-odds scores response
+
+        Returns:
+            Dict[str, GameResult]: Newly settled games keyed by game ID
+        """
+        for game in scores_json:
+            if game["id"] not in self.commence_times and game.get("commence_time"):
+                self.commence_times[game["id"]] = datetime.fromisoformat(
+                    add_timezone(date_str=game["commence_time"])
+                )
+        changed = [
+            game
+            for game in scores_json
+            if game.get("completed") and self.versions.get(game["id"]) != result_version(game)
+        ]
+        settled = {}
+        for game, result in zip(changed, parse_scores_json(changed)):
+            self.versions[game["id"]] = result_version(game)
+            self.results[result.id] = result
+            settled[result.id] = result
+        return settled
+
+
+def grade_picks(
+    picks: np.ndarray, confidence: np.ndarray, winners: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Grade every pick set against the winners at once. A tie, or a missing pick, scores nothing.
+
+    Args:
+        picks (np.ndarray): (pick sets, games) team picked to win each game
+        confidence (np.ndarray): (pick sets, games) confidence value of each pick
+        winners (np.ndarray): (games,) winning team of each game, "" for ties
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (pick sets, games) whether each pick won, and its points
+    """
+    correct = (picks == winners) & (winners != "")
+    return correct, np.where(correct, confidence, 0)
+
+
+def settle_cells(
+    values: List[List[str]], results: Dict[str, GameResult], pick_sets: Sequence[PickSet]
+) -> Dict[Tuple[int, int], Any]:
+    """Result and grade cells of the week sheet rows whose games are in results. Result columns
+    missing from the sheet are added after its last column.
+
+    Args:
+        values (List[List[str]]): Current week sheet contents, with a header row and an "id"
+            column
+        results (Dict[str, GameResult]): Settled games keyed by game ID
+        pick_sets (Sequence[PickSet]): Pick sets on the sheet to grade
+
+    Raises:
+        ValueError: If the sheet is missing its id column or a pick set's columns
+
+    Returns:
+        Dict[Tuple[int, int], Any]: Cell values keyed by 1-indexed (row, col)
+    """
+    header = list(values[0])
+    required = ["id"] + [
+        column
+        for pick_set in pick_sets
+        for column in [pick_set.winner_column, pick_set.confidence_column]
+    ]
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise ValueError(f"Couldn't find required columns {missing} among {header}")
+
+    cells = {}
+    for column in RESULT_COLUMNS + [
+        column for pick_set in pick_sets for column in pick_set.grade_columns
+    ]:
+        if column not in header:
+            header.append(column)
+            cells[(1, len(header))] = column
+
+    # Grade every pick set on the settled rows in one pass
+    rows = [row[: len(header)] + [""] * (len(header) - len(row)) for row in values[1:]]
+    df = pd.DataFrame(rows, columns=header, dtype=object)
+    df.index += 2  # Sheet row of each game, accounting for 1-indexing and the header row
+    df = df[df["id"].isin(results)]
+    if df.empty:
+        return cells
+    game_results = [results[game_id] for game_id in df["id"]]
+    winners = np.array([result.winner.value if result.winner else "" for result in game_results])
+    picks = np.array([df[pick_set.winner_column].to_numpy(dtype=str) for pick_set in pick_sets])
+    confidence = np.array(
+        [
+            pd.to_numeric(df[pick_set.confidence_column].replace("", np.nan)).fillna(0)
+            for pick_set in pick_sets
+        ],
+        dtype=int,
+    )
+    correct, points = grade_picks(picks=picks, confidence=confidence, winners=winners)
+
+    col = {column: i for i, column in enumerate(header, start=1)}
+    for j, (row, result) in enumerate(zip(df.index, game_results)):
+        cells[(row, col["home_score"])] = result.home_score
+        cells[(row, col["away_score"])] = result.away_score
+        cells[(row, col["winner"])] = winners[j]
+        for i, pick_set in enumerate(pick_sets):
+            cells[(row, col[pick_set.correct_column])] = bool(correct[i, j])
+            cells[(row, col[pick_set.points_column])] = int(points[i, j])
+    return cells
+
+
+def push_results(
+    writer: SheetWriter,
+    results: Dict[str, GameResult],
+    pick_sets: Sequence[PickSet],
+    current_values: List[List[str]],
+) -> int:
+    """Write the results and grades of settled games to a week sheet in one batch, skipping cells
+    which already match. current_values is updated in place with the written cells, so the next
+    push diffs against the sheet without reading it again.
+
+    Args:
+        writer (SheetWriter): Writer for the week worksheet
+        results (Dict[str, GameResult]): Settled games keyed by game ID
+        pick_sets (Sequence[PickSet]): Pick sets on the sheet to grade
+        current_values (List[List[str]]): Current week sheet contents
+
+    Returns:
+        int: Number of cells written
+    """
+    cells = settle_cells(values=current_values, results=results, pick_sets=pick_sets)
+    for (row, col), value in cells.items():
+        writer.update_cell(row=row, col=col, value=value)
+    changed = writer.changed_cells(current_values=current_values)
+    n_written = writer.flush(current_values=current_values)
+    for (row, col), value in changed.items():
+        while len(current_values) < row:
+            current_values.append([])
+        cells_row = current_values[row - 1]
+        cells_row.extend([""] * (col - len(cells_row)))
+        cells_row[col - 1] = format_cell_value(value)
+    return n_written
+
+
+def settle(
+    fetch: Callable[[], List[Dict[str, Any]]],
+    settler: Settler,
+    on_settled: Callable[[Dict[str, GameResult]], Any],
+    game_ids: Optional[Iterable[str]] = None,
+    interval: float = 600.0,
+    max_polls: Optional[int] = None,
+    max_idle_polls: Optional[int] = None,
+    expire_after: Optional[timedelta] = None,
+    clock: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Poll for scores on a schedule and hand each batch of newly settled games to on_settled, so
+    the week is graded game by game as results come in. Polls where no game finished cost one
+    request and no parsing or sheet calls.
+
+    Polling stops once every game in game_ids settles, after max_polls polls, after
+    max_idle_polls polls in a row settle nothing, or once every unsettled game kicked off more
+    than expire_after ago and so can no longer appear in the response. Games left unsettled are
+    logged.
+
+    Args:
+        fetch (Callable[[], List[Dict[str, Any]]]): Returns the current the-odds scores response
+        settler (Settler): Results carried between polls
+        on_settled (Callable[[Dict[str, GameResult]], Any]): Called with the newly settled games,
+            e.g. a partial of push_results
+        game_ids (Optional[Iterable[str]], optional): Games to settle. Polling stops once all of
+            them have settled. Defaults to polling until max_polls.
+        interval (float, optional): Seconds between polls. Defaults to 600.
+        max_polls (Optional[int], optional): Stop after this many polls. Defaults to no limit.
+        max_idle_polls (Optional[int], optional): Stop after this many polls in a row settle no
+            game, including failed polls. Defaults to no limit.
+        expire_after (Optional[timedelta], optional): Give up on games which kicked off this
+            long ago, e.g. the scores endpoint's daysFrom. Only games seen in a response have a
+            known kick off. Defaults to never giving up.
+        clock (Callable[[], datetime], optional): Returns the current time, for expiring games.
+            Defaults to the system clock.
+        sleep (Callable[[float], None], optional): Sleep function. Defaults to time.sleep.
+
+    Returns:
+        int: Number of games settled
+    """
+    wanted = None if game_ids is None else set(game_ids)
+    remaining = None if wanted is None else set(wanted)
+    unsettled = set()
+    n_polls = 0
+    n_idle = 0
+    n_settled = 0
+    while remaining is None or remaining:
+        if max_polls is not None and n_polls >= max_polls:
+            logger.info(f"Stopping after {n_polls} polls")
+            break
+        if max_idle_polls is not None and n_idle >= max_idle_polls:
+            logger.warning(f"Stopping after {n_idle} polls in a row settled no games")
+            break
+        if n_polls:
+            sleep(interval)
+        n_polls += 1
+        n_idle += 1
+        try:
+            scores_json = fetch()
+        except requests.RequestException as e:
+            logger.warning(f"Poll {n_polls} failed, retrying in {interval:.0f}s: {e}")
+            continue
+        settled = settler.update(scores_json)
+        if wanted is not None:
+            settled = {game_id: result for game_id, result in settled.items() if game_id in wanted}
+            remaining -= set(settled)
+        if settled:
+            n_idle = 0
+            n_settled += len(settled)
+            increment("games_settled", len(settled))
+            logger.info(f"Poll {n_polls}: {len(settled)} games settled")
+            on_settled(settled)
+        else:
+            logger.debug(f"Poll {n_polls}: no games settled")
+
+        # Games which kicked off before the endpoint's window will never settle from it
+        if remaining and expire_after is not None:
+            cutoff = clock() - expire_after
+            expired = {
+                game_id
+                for game_id in remaining
+                if game_id in settler.commence_times and settler.commence_times[game_id] < cutoff
+            }
+            if expired:
+                logger.warning(
+                    f"Giving up on {len(expired)} games which kicked off over {expire_after} ago: "
+                    f"{sorted(expired)}"
+                )
+                remaining -= expired
+                unsettled.update(expired)
+    if remaining:
+        unsettled.update(remaining)
+    if unsettled:
+        logger.warning(f"{len(unsettled)} games left unsettled: {sorted(unsettled)}")
+    return n_settled
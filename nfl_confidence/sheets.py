@@ -0,0 +1,463 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import gspread
+import numpy as np
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import ValueRenderOption, rowcol_to_a1
+from loguru import logger
+from tenacity import after_log, retry, wait_exponential
+
+from nfl_confidence.metrics import before_sleep_count, increment, timed
+
+# Google Sheets allows 60 write requests per minute per user
+SHEETS_REQUESTS_PER_MINUTE = 60
+
+# Columns of the week sheets written by the update-sheet and watch commands
+WEEK_SHEET_COLUMNS = [
+    "id",
+    "home_team",
+    "away_team",
+    "predicted_winner",
+    "prob_variance",
+    "oddsmaker_agreement",
+    "confidence_prob",
+    "confidence_rank",
+]
+
+
+class TokenBucket:
+    """Token bucket rate limiter. Tokens refill continuously at a fixed rate up to a capacity, and
+    each API call spends one token, blocking until one is available."""
+
+    def __init__(
+        self,
+        rate_per_minute: float = SHEETS_REQUESTS_PER_MINUTE,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate_per_minute (float, optional): Sustained calls per minute. Defaults to
+                SHEETS_REQUESTS_PER_MINUTE.
+            capacity (Optional[float], optional): Maximum burst size. Defaults to rate_per_minute.
+            clock (Callable[[], float], optional): Monotonic clock in seconds. Defaults to
+                time.monotonic.
+            sleep (Callable[[float], None], optional): Sleep function. Defaults to time.sleep.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute if capacity is None else capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Spend tokens, sleeping until enough are available
+
+        Args:
+            tokens (float, optional): Number of tokens to spend. Defaults to 1.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                delay = (tokens - self.tokens) / self.rate
+                self.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= tokens
+        if waited:
+            increment("rate_limit_sleep_seconds", waited)
+        return waited
+
+
+def format_cell_value(value: Any) -> str:
+    """Format a value the way SheetWriter and SheetReader read it back from the Sheets API
+    (unformatted, as a string), for diffing
+
+    Args:
+        value (Any): Value to write to a cell, or an unformatted value read from one
+
+    Returns:
+        str: String representation of the value
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).upper()
+    return str(value)
+
+
+def cell_matches(value: Any, current: str) -> bool:
+    """Whether a cell already holds a value. Numbers match by value, since the sheet returns
+    e.g. 16 for a cell written as 16.0.
+
+    Args:
+        value (Any): Value to write to the cell
+        current (str): Current cell contents, as read by read_values
+
+    Returns:
+        bool: True if writing the value would not change the cell
+    """
+    formatted = format_cell_value(value)
+    if formatted == current:
+        return True
+    if isinstance(value, np.generic):
+        value = value.item()
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return float(current) == float(value)
+    except ValueError:
+        return False
+
+
+def render_values(values: List[List[Any]]) -> List[List[str]]:
+    """Convert unformatted values from the Sheets API to strings, so cells shown rounded on the
+    sheet still read back at full precision
+
+    Args:
+        values (List[List[Any]]): Unformatted cell values, row by row
+
+    Returns:
+        List[List[str]]: Cell values as strings, as format_cell_value writes them
+    """
+    return [[format_cell_value(value) for value in row] for row in values]
+
+
+class SheetWriter:
+    """Collects cell changes for a worksheet and writes them in a single batch_update call,
+    skipping cells whose current contents already match"""
+
+    def __init__(self, ws: gspread.Worksheet, limiter: Optional[TokenBucket] = None):
+        """
+        Args:
+            ws (gspread.Worksheet): Worksheet to write to
+            limiter (Optional[TokenBucket], optional): Rate limiter shared by every Sheets API
+                call. Defaults to a new TokenBucket at SHEETS_REQUESTS_PER_MINUTE.
+        """
+        self.ws = ws
+        self.limiter = limiter or TokenBucket()
+        self.pending: Dict[Tuple[int, int], Any] = {}
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        """Queue a cell update. Later updates to the same cell replace earlier ones.
+
+        Args:
+            row (int): 1-indexed row
+            col (int): 1-indexed column
+            value (Any): Value to write
+        """
+        self.pending[(row, col)] = value
+
+    @timed("sheet_read")
+    def read_values(self) -> List[List[str]]:
+        """Read the worksheet's current unformatted values in one API call
+
+        Returns:
+            List[List[str]]: Cell values, row by row
+        """
+        self.limiter.acquire()
+        return render_values(
+            self.ws.get_all_values(value_render_option=ValueRenderOption.unformatted)
+        )
+
+    def changed_cells(self, current_values: List[List[str]]) -> Dict[Tuple[int, int], Any]:
+        """Return the pending updates that differ from the current sheet contents
+
+        Args:
+            current_values (List[List[str]]): Current cell values, as from get_all_values
+
+        Returns:
+            Dict[Tuple[int, int], Any]: Pending updates keyed by (row, col)
+        """
+        changed = {}
+        for (row, col), value in self.pending.items():
+            current = ""
+            if row <= len(current_values) and col <= len(current_values[row - 1]):
+                current = current_values[row - 1][col - 1]
+            if not cell_matches(value, current):
+                changed[(row, col)] = value
+        return changed
+
+    @retry(
+        wait=wait_exponential(max=90),
+        before_sleep=before_sleep_count(logging.INFO),
+        after=after_log(logger, logging.INFO),
+    )
+    def _batch_update(self, data: List[Dict[str, Any]]) -> None:
+        """Write all ranges in a single API call, with retries to avoid write rate limiting"""
+        self.limiter.acquire()
+        self.ws.batch_update(data, value_input_option="USER_ENTERED")
+
+    @timed("sheet_write")
+    def flush(self, current_values: Optional[List[List[str]]] = None) -> int:
+        """Write every pending change which differs from the sheet in one batch_update call
+
+        Args:
+            current_values (Optional[List[List[str]]], optional): Current sheet contents, if
+                already known. Defaults to reading them from the sheet.
+
+        Returns:
+            int: Number of cells written
+        """
+        if not self.pending:
+            return 0
+        if current_values is None:
+            current_values = self.read_values()
+        changed = self.changed_cells(current_values=current_values)
+        if changed:
+            data = [
+                {"range": rowcol_to_a1(row, col), "values": [[value]]}
+                for (row, col), value in sorted(changed.items())
+            ]
+            self._batch_update(data)
+        increment("cells_written", len(changed))
+        logger.info(
+            f"Wrote {len(changed)} changed cells to '{self.ws.title}', "
+            f"skipped {len(self.pending) - len(changed)} unchanged"
+        )
+        self.pending = {}
+        return len(changed)
+
+
+def typed_frame(values: List[List[str]]) -> pd.DataFrame:
+    """Build a DataFrame from raw sheet values, with the first row as the header. Columns whose
+    non-empty cells are all numbers become numeric (float with NaN for empty cells, int when
+    none are empty), TRUE/FALSE columns become bool and everything else stays str.
+
+    Args:
+        values (List[List[str]]): Cell values, row by row, as from get_all_values
+
+    Returns:
+        pd.DataFrame: One row per sheet row below the header
+    """
+    if not values:
+        return pd.DataFrame()
+    header = values[0]
+    rows = [row[: len(header)] + [""] * (len(header) - len(row)) for row in values[1:]]
+    df = pd.DataFrame(rows, columns=header, dtype=object)
+    for column in header:
+        cells = df[column]
+        filled = cells[cells != ""]
+        if len(filled) and filled.isin(["TRUE", "FALSE"]).all() and len(filled) == len(cells):
+            df[column] = cells == "TRUE"
+            continue
+        try:
+            numbers = pd.to_numeric(filled)
+        except (ValueError, TypeError):
+            df[column] = cells.astype(str)
+            continue
+        if len(filled) == len(cells):
+            df[column] = numbers
+        else:
+            df[column] = pd.to_numeric(cells.replace("", np.nan))
+    return df
+
+
+class SheetReader:
+    """Reads worksheets of a spreadsheet for the life of a run. Every tab not read yet is fetched
+    in a single values_batch_get call, and values are cached so later reads of the same tabs cost
+    no API calls.
+    """
+
+    def __init__(self, sh: gspread.Spreadsheet, limiter: Optional[TokenBucket] = None):
+        """
+        Args:
+            sh (gspread.Spreadsheet): Spreadsheet to read
+            limiter (Optional[TokenBucket], optional): Rate limiter shared by every Sheets API
+                call. Defaults to a new TokenBucket at SHEETS_REQUESTS_PER_MINUTE.
+        """
+        self.sh = sh
+        self.limiter = limiter or TokenBucket()
+        self._worksheets: Optional[Dict[str, gspread.Worksheet]] = None
+        self._values: Dict[str, List[List[str]]] = {}
+
+    def worksheets(self) -> Dict[str, gspread.Worksheet]:
+        """Worksheets by title, listed once per run
+
+        Returns:
+            Dict[str, gspread.Worksheet]: Every worksheet of the spreadsheet
+        """
+        if self._worksheets is None:
+            self.limiter.acquire()
+            self._worksheets = {ws.title: ws for ws in self.sh.worksheets()}
+        return self._worksheets
+
+    def titles(self) -> List[str]:
+        """Titles of every worksheet
+
+        Returns:
+            List[str]: Worksheet titles, in tab order
+        """
+        return list(self.worksheets())
+
+    def worksheet(self, title: str) -> gspread.Worksheet:
+        """Look up a worksheet without an API call of its own
+
+        Args:
+            title (str): Worksheet title
+
+        Raises:
+            WorksheetNotFound: If the spreadsheet has no such worksheet
+
+        Returns:
+            gspread.Worksheet: The worksheet
+        """
+        worksheets = self.worksheets()
+        if title not in worksheets:
+            raise WorksheetNotFound(title)
+        return worksheets[title]
+
+    def add_worksheet(self, title: str, **kwargs) -> gspread.Worksheet:
+        """Create a worksheet, which starts empty
+
+        Args:
+            title (str): Worksheet title
+            **kwargs: Passed to Spreadsheet.add_worksheet, e.g. rows and cols
+
+        Returns:
+            gspread.Worksheet: The new worksheet
+        """
+        self.limiter.acquire()
+        ws = self.sh.add_worksheet(title=title, **kwargs)
+        self.worksheets()[title] = ws
+        self._values[title] = []
+        return ws
+
+    @retry(
+        wait=wait_exponential(max=90),
+        before_sleep=before_sleep_count(logging.INFO),
+        after=after_log(logger, logging.INFO),
+    )
+    def _batch_get(self, titles: List[str]) -> List[List[List[str]]]:
+        """Read whole worksheets in a single API call, with retries to avoid rate limiting"""
+        self.limiter.acquire()
+        ranges = ["'{}'".format(title.replace("'", "''")) for title in titles]
+        response = self.sh.values_batch_get(
+            ranges, params={"valueRenderOption": ValueRenderOption.unformatted.value}
+        )
+        return [
+            render_values(value_range.get("values", [])) for value_range in response["valueRanges"]
+        ]
+
+    @timed("sheet_read")
+    def read(self, titles: Iterable[str]) -> Dict[str, List[List[str]]]:
+        """Raw values of several worksheets, fetching the ones not cached yet in one call
+
+        Args:
+            titles (Iterable[str]): Worksheet titles
+
+        Raises:
+            WorksheetNotFound: If the spreadsheet has no worksheet with one of the titles
+
+        Returns:
+            Dict[str, List[List[str]]]: Cell values of each worksheet, row by row, as from
+                get_all_values
+        """
+        titles = list(dict.fromkeys(titles))
+        missing = [title for title in titles if title not in self._values]
+        for title in missing:
+            self.worksheet(title)
+        if missing:
+            for title, values in zip(missing, self._batch_get(missing)):
+                self._values[title] = values
+            increment("sheets_read", len(missing))
+        return {title: self._values[title] for title in titles}
+
+    def values(self, title: str) -> List[List[str]]:
+        """Raw values of one worksheet
+
+        Args:
+            title (str): Worksheet title
+
+        Returns:
+            List[List[str]]: Cell values, row by row
+        """
+        return self.read([title])[title]
+
+    def frames(self, titles: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Typed DataFrames of several worksheets, see typed_frame
+
+        Args:
+            titles (Iterable[str]): Worksheet titles
+
+        Returns:
+            Dict[str, pd.DataFrame]: DataFrame of each worksheet
+        """
+        return {title: typed_frame(values) for title, values in self.read(titles).items()}
+
+    def frame(self, title: str) -> pd.DataFrame:
+        """Typed DataFrame of one worksheet, see typed_frame
+
+        Args:
+            title (str): Worksheet title
+
+        Returns:
+            pd.DataFrame: One row per sheet row below the header
+        """
+        return typed_frame(self.values(title))
+
+    def invalidate(self, title: Optional[str] = None) -> None:
+        """Forget cached values, e.g. after writing to a worksheet
+
+        Args:
+            title (Optional[str], optional): Worksheet to forget. Defaults to every worksheet.
+        """
+        if title is None:
+            self._values = {}
+        else:
+            self._values.pop(title, None)
+
+
+def push_rows(
+    writer: SheetWriter,
+    rows: Dict[str, List[Any]],
+    current_values: Optional[List[List[str]]] = None,
+) -> int:
+    """Write changed rows to a week sheet, matching existing rows by game ID and appending new
+    games below them. Only cells which differ from the sheet are written, in one batch.
+
+    Args:
+        writer (SheetWriter): Writer for the week worksheet
+        rows (Dict[str, List[Any]]): Rows in WEEK_SHEET_COLUMNS order keyed by game ID
+        current_values (Optional[List[List[str]]], optional): Current sheet contents, if
+            already known, e.g. from a SheetReader. Defaults to reading them from the sheet.
+
+    Returns:
+        int: Number of cells written
+    """
+    if not rows:
+        return 0
+    if current_values is None:
+        current_values = writer.read_values()
+    if not current_values:
+        for col, column in enumerate(WEEK_SHEET_COLUMNS, start=1):
+            writer.update_cell(row=1, col=col, value=column)
+    header = current_values[0] if current_values else WEEK_SHEET_COLUMNS
+    id_col = header.index("id")
+    row_idx = {values[id_col]: i for i, values in enumerate(current_values[1:], start=2)}
+    next_row = max(len(current_values), 1) + 1
+    for game_id, row in rows.items():
+        if game_id not in row_idx:
+            row_idx[game_id] = next_row
+            next_row += 1
+        for column, value in zip(WEEK_SHEET_COLUMNS, row):
+            writer.update_cell(row=row_idx[game_id], col=header.index(column) + 1, value=value)
+    return writer.flush(current_values=current_values)
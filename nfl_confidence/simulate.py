@@ -0,0 +1,235 @@
+from statistics import NormalDist
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from nfl_confidence.utils import assign_confidence
+
+# Simulations drawn at a time; memory use is about chunk_size x games x 9 bytes
+CHUNK_SIZE = 2**17
+
+# A confidence assignment: whether each game's pick is the home team, and its confidence value
+Assignment = Tuple[np.ndarray, np.ndarray]
+
+
+class ScoreDistribution:
+    """Exact distribution of integer league points, stored as counts per point total so memory
+    does not grow with the number of simulations"""
+
+    def __init__(self, counts: np.ndarray):
+        """
+        Args:
+            counts (np.ndarray): Number (or weight) of simulations scoring each point total,
+                indexed by points
+        """
+        self.counts = np.asarray(counts, dtype=float)
+        self.n_sims = int(round(self.counts.sum()))
+        self.points = np.arange(len(self.counts))
+        self.pmf = self.counts / self.n_sims
+
+    @classmethod
+    def from_points(cls, points: np.ndarray, max_points: int) -> "ScoreDistribution":
+        """Build a distribution from simulated point totals
+
+        Args:
+            points (np.ndarray): Simulated point totals
+            max_points (int): Largest possible point total
+
+        Returns:
+            ScoreDistribution: Distribution of the point totals
+        """
+        return cls(np.bincount(points, minlength=max_points + 1))
+
+    @property
+    def mean(self) -> float:
+        return float(np.dot(self.points, self.pmf))
+
+    @property
+    def var(self) -> float:
+        return float(np.dot((self.points - self.mean) ** 2, self.pmf))
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+    def cdf(self, points: int) -> float:
+        """Probability of scoring at most the given points"""
+        return float(self.pmf[: max(points + 1, 0)].sum())
+
+    def prob_at_least(self, points: int) -> float:
+        """Probability of scoring at least the given points"""
+        return 1.0 - self.cdf(points - 1)
+
+    def quantile(self, q: float) -> int:
+        """Smallest point total x with P(points <= x) >= q"""
+        return int(np.searchsorted(np.cumsum(self.pmf), q - 1e-12))
+
+    def expected_shortfall(self, q: float = 0.05) -> float:
+        """Mean points over the worst q fraction of outcomes (lower tail risk)"""
+        cumulative = np.cumsum(self.pmf)
+        weights = np.clip(q - (cumulative - self.pmf), 0, self.pmf)
+        return float(np.dot(self.points, weights) / q)
+
+    def summary(self) -> Dict[str, float]:
+        """Expected points, spread and tail risk
+
+        Returns:
+            Dict[str, float]: Mean, standard deviation, 5th/50th/95th percentiles and the mean of
+                the worst 5% of outcomes
+        """
+        return {
+            "mean": self.mean,
+            "std": self.std,
+            "p5": self.quantile(0.05),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "expected_shortfall_5": self.expected_shortfall(0.05),
+        }
+
+
+def season_distribution(weeks: List[ScoreDistribution]) -> ScoreDistribution:
+    """Distribution of season points from independent weekly distributions, by convolution
+
+    Args:
+        weeks (List[ScoreDistribution]): Weekly point distributions
+
+    Returns:
+        ScoreDistribution: Distribution of the total, weighted as the smallest weekly sample
+    """
+    pmf = np.ones(1)
+    for week in weeks:
+        pmf = np.convolve(pmf, week.pmf)
+    n_sims = min((week.n_sims for week in weeks), default=1)
+    return ScoreDistribution(pmf * n_sims)
+
+
+def greedy_assignment(home_win_probability: np.ndarray, max_confidence: int = 16) -> Assignment:
+    """The README strategy: pick every favorite and rank the picks by win probability
+
+    Args:
+        home_win_probability (np.ndarray): Home team win probability of each game
+        max_confidence (int, optional): Confidence value of the most confident game. Defaults to
+            16.
+
+    Returns:
+        Assignment: Picks (True for the home team) and confidence values
+    """
+    home_win_probability = np.asarray(home_win_probability, dtype=float)
+    picks_home = home_win_probability >= 0.5
+    win_probability = np.where(picks_home, home_win_probability, 1 - home_win_probability)
+    return picks_home, assign_confidence(values=win_probability, max_confidence=max_confidence)
+
+
+def iter_favorite_wins(
+    favorite_probability: np.ndarray,
+    n_sims: int,
+    seed: Optional[int] = 0,
+    correlation: Union[float, np.ndarray] = 0.0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[np.ndarray]:
+    """Draw game outcomes in chunks. Correlated outcomes use a Gaussian copula, so with a shared
+    correlation rho every game's favorite has the same marginal win probability but favorites
+    tend to win (or be upset) together, like a chaotic week.
+
+    Args:
+        favorite_probability (np.ndarray): Favorite's win probability in each game
+        n_sims (int): Number of simulated weeks
+        seed (Optional[int], optional): Random seed; the same seed gives the same outcomes for
+            any chunk_size. Defaults to 0.
+        correlation (Union[float, np.ndarray], optional): Correlation shared by every pair of
+            games, or a full games x games correlation matrix. Defaults to independent games.
+        chunk_size (int, optional): Simulations per chunk. Defaults to CHUNK_SIZE.
+
+    Yields:
+        Iterator[np.ndarray]: Boolean (chunk, games) arrays, True where the favorite won
+    """
+    favorite_probability = np.asarray(favorite_probability, dtype=float)
+    n_games = len(favorite_probability)
+    rng = np.random.default_rng(seed)
+    correlated = np.ndim(correlation) > 0 or correlation != 0
+    if correlated:
+        thresholds = np.array(
+            [NormalDist().inv_cdf(min(max(p, 1e-12), 1 - 1e-12)) for p in favorite_probability]
+        )
+        if np.ndim(correlation) == 0:
+            matrix = np.full((n_games, n_games), float(correlation))
+            np.fill_diagonal(matrix, 1.0)
+        else:
+            matrix = np.asarray(correlation, dtype=float)
+        cholesky = np.linalg.cholesky(matrix)
+
+    for start in range(0, n_sims, chunk_size):
+        size = min(chunk_size, n_sims - start)
+        if correlated:
+            latent = rng.standard_normal((size, n_games)) @ cholesky.T
+            yield latent < thresholds
+        else:
+            yield rng.random((size, n_games)) < favorite_probability
+
+
+def simulate_assignments(
+    home_win_probability: np.ndarray,
+    assignments: Mapping[str, Assignment],
+    n_sims: int = 1_000_000,
+    seed: Optional[int] = 0,
+    correlation: Union[float, np.ndarray] = 0.0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Dict[str, ScoreDistribution]:
+    """Simulate a week's point distribution for several confidence assignments. Every assignment
+    is scored against the same simulated outcomes, so differences between them are not noise
+    from separate draws.
+
+    Args:
+        home_win_probability (np.ndarray): Home team win probability of each game
+        assignments (Mapping[str, Assignment]): Picks and confidence values by name
+        n_sims (int, optional): Number of simulated weeks. Defaults to 1,000,000.
+        seed (Optional[int], optional): Random seed. Defaults to 0.
+        correlation (Union[float, np.ndarray], optional): Correlation between favorites'
+            outcomes, see iter_favorite_wins. Defaults to independent games.
+        chunk_size (int, optional): Simulations per chunk. Defaults to CHUNK_SIZE.
+
+    Returns:
+        Dict[str, ScoreDistribution]: Point distribution of each assignment
+    """
+    home_win_probability = np.asarray(home_win_probability, dtype=float)
+    favorite_is_home = home_win_probability >= 0.5
+    favorite_probability = np.where(
+        favorite_is_home, home_win_probability, 1 - home_win_probability
+    )
+
+    # A pick is correct when the favorite won and the pick is the favorite, or vice versa
+    picks_favorite = {
+        name: (np.asarray(picks_home) == favorite_is_home, np.asarray(confidence, dtype=np.int64))
+        for name, (picks_home, confidence) in assignments.items()
+    }
+    counts = {
+        name: np.zeros(int(confidence.sum()) + 1, dtype=np.int64)
+        for name, (_, confidence) in picks_favorite.items()
+    }
+    chunks = iter_favorite_wins(
+        favorite_probability=favorite_probability,
+        n_sims=n_sims,
+        seed=seed,
+        correlation=correlation,
+        chunk_size=chunk_size,
+    )
+    for favorite_wins in chunks:
+        for name, (picked_favorite, confidence) in picks_favorite.items():
+            points = (favorite_wins == picked_favorite) @ confidence
+            counts[name] += np.bincount(points, minlength=len(counts[name]))
+    return {name: ScoreDistribution(name_counts) for name, name_counts in counts.items()}
+
+
+def compare_assignments(distributions: Mapping[str, ScoreDistribution]) -> pd.DataFrame:
+    """Tabulate expected points, variance and tail risk of simulated assignments
+
+    Args:
+        distributions (Mapping[str, ScoreDistribution]): Output of simulate_assignments
+
+    Returns:
+        pd.DataFrame: One row of ScoreDistribution.summary per assignment
+    """
+    return pd.DataFrame(
+        {name: distribution.summary() for name, distribution in distributions.items()}
+    ).T
@@ -0,0 +1,144 @@
+import gzip
+import json
+import re
+from typing import Any, Iterable, Iterator, List, TextIO
+
+from nfl_confidence.odds import GameOdds, GameOddsListAdapter, OddsTable
+
+# Number of characters read from an archive at a time
+CHUNK_SIZE = 2**16
+
+# Whitespace and commas separating top-level JSON values
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def open_archive(path: str) -> TextIO:
+    """Open a JSON or JSON-lines archive for reading as text, transparently decompressing gzip
+
+    Args:
+        path (str): Path to the archive
+
+    Returns:
+        TextIO: Text file object
+    """
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_json_values(
+    path: str, stream_arrays: bool = True, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Any]:
+    """Lazily decode the JSON values in an archive, reading it chunk by chunk so memory is bounded
+    by the size of the largest value rather than the size of the archive. Handles a single JSON
+    document as well as JSON-lines (or any whitespace separated JSON values). A value spanning
+    many chunks is read in geometrically growing chunks, so it is only decoded a logarithmic
+    number of times.
+
+    Args:
+        path (str): Path to the (optionally gzipped) archive
+        stream_arrays (bool, optional): Step into arrays and yield their elements one at a time
+            instead of yielding each array whole. Defaults to True.
+        chunk_size (int, optional): Number of characters to read at a time. Defaults to
+            CHUNK_SIZE.
+
+    Yields:
+        Iterator[Any]: Decoded JSON values
+    """
+    decoder = json.JSONDecoder()
+    with open_archive(path) as f:
+        buffer, pos, eof, partial = "", 0, False, False
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if pos < len(buffer):
+                if stream_arrays and buffer[pos] in "[]":
+                    pos += 1
+                    continue
+                try:
+                    value, pos_end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The value may continue in the next chunk
+                    if eof:
+                        raise
+                    partial = True
+                else:
+                    yield value
+                    pos = pos_end
+                    partial = False
+                    continue
+            elif eof:
+                return
+
+            # Drop everything already decoded and read the next chunk, at least doubling a
+            # partial value so it is decoded again only once it may be complete
+            read_size = max(chunk_size, len(buffer) - pos) if partial else chunk_size
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def iter_games(
+    path: str, trusted: bool = False, chunk_size: int = CHUNK_SIZE
+) -> Iterator[GameOdds]:
+    """Stream GameOdds objects one game at a time from a JSON or JSON-lines archive of the-odds API
+    responses, gzip included
+
+    Args:
+        path (str): Path to the (optionally gzipped) archive
+        trusted (bool, optional): Skip the field validators for archives that were already
+            validated. Defaults to False.
+        chunk_size (int, optional): Number of characters to read at a time. Defaults to
+            CHUNK_SIZE.
+
+    Yields:
+        Iterator[GameOdds]: Parsed games, in archive order
+    """
+    context = {"trusted": trusted}
+    for game in iter_json_values(path=path, stream_arrays=True, chunk_size=chunk_size):
+        yield GameOdds.model_validate(game, context=context)
+
+
+def iter_snapshots(
+    path: str, trusted: bool = False, chunk_size: int = CHUNK_SIZE
+) -> Iterator[List[GameOdds]]:
+    """Stream an archive one the-odds API response (snapshot) at a time, e.g. a JSON-lines file
+    with one response per line. Memory is bounded by the size of the largest snapshot.
+
+    Args:
+        path (str): Path to the (optionally gzipped) archive
+        trusted (bool, optional): Skip the field validators for archives that were already
+            validated. Defaults to False.
+        chunk_size (int, optional): Number of characters to read at a time. Defaults to
+            CHUNK_SIZE.
+
+    Yields:
+        Iterator[List[GameOdds]]: Parsed games of each snapshot
+    """
+    context = {"trusted": trusted}
+    for snapshot in iter_json_values(path=path, stream_arrays=False, chunk_size=chunk_size):
+        if not isinstance(snapshot, list):
+            snapshot = [snapshot]
+        yield GameOddsListAdapter.validate_python(snapshot, context=context)
+
+
+def iter_odds_tables(games: Iterable[GameOdds], chunk_size: int = 1024) -> Iterator[OddsTable]:
+    """Group a stream of games into columnar OddsTable chunks of bounded size
+
+    Args:
+        games (Iterable[GameOdds]): Stream of games, e.g. from iter_games
+        chunk_size (int, optional): Maximum number of games per table. Defaults to 1024.
+
+    Yields:
+        Iterator[OddsTable]: Columnar tables of at most chunk_size games
+    """
+    chunk = []
+    for game in games:
+        chunk.append(game)
+        if len(chunk) == chunk_size:
+            yield OddsTable.from_games(games=chunk)
+            chunk = []
+    if chunk:
+        yield OddsTable.from_games(games=chunk)
@@ -1,12 +1,14 @@
 import logging
-from typing import Any, List
+from typing import Any, List, Mapping, Optional, Sequence
 
 import gspread
 import numpy as np
 import yaml
 from loguru import logger
 from pydantic import BaseModel
-from tenacity import after_log, before_sleep_log, retry, wait_exponential
+from tenacity import after_log, retry, wait_exponential
+
+from nfl_confidence.metrics import before_sleep_count, timed
 
 
 def get_ranks(values: List[float], zero_indexed: bool = False) -> List[int]:
@@ -25,6 +27,52 @@ def get_ranks(values: List[float], zero_indexed: bool = False) -> List[int]:
     return offset + np.argsort(np.argsort(values))
 
 
+@timed("rank")
+def assign_confidence(
+    values: Sequence[float],
+    max_confidence: int = 16,
+    locked: Optional[Mapping[int, int]] = None,
+) -> np.ndarray:
+    """Assign the week's confidence values (max_confidence - n + 1 up to max_confidence for n
+    games) by rank of the input values, keeping locked games at their fixed values. The values
+    left over are handed out to the unlocked games in order, so re-ranking after some games have
+    kicked off never moves a locked value.
+
+    Args:
+        values (Sequence[float]): Value to rank each game by, e.g. win probability. Ignored for
+            locked games.
+        max_confidence (int, optional): Confidence value of the most confident game. Defaults to
+            16.
+        locked (Optional[Mapping[int, int]], optional): Fixed confidence value by game index.
+            Defaults to no locked games.
+
+    Raises:
+        ValueError: If locked values repeat or are not among the week's confidence values
+
+    Returns:
+        np.ndarray: Confidence value of each game
+    """
+    values = np.asarray(values, dtype=float)
+    locked = dict(locked or {})
+    week_values = set(range(max_confidence - len(values) + 1, max_confidence + 1))
+    if len(set(locked.values())) != len(locked):
+        raise ValueError(f"Locked confidence values must be unique, got {sorted(locked.values())}")
+    invalid = set(locked.values()) - week_values
+    if invalid:
+        raise ValueError(
+            f"Locked confidence values {sorted(invalid)} are outside the week's values "
+            f"{min(week_values)}-{max(week_values)}"
+        )
+    free_values = np.array(sorted(week_values - set(locked.values())), dtype=int)
+    unlocked = np.array([i for i in range(len(values)) if i not in locked], dtype=int)
+
+    confidence = np.empty(len(values), dtype=int)
+    confidence[list(locked)] = list(locked.values())
+    if len(unlocked):
+        confidence[unlocked] = free_values[get_ranks(values[unlocked], zero_indexed=True)]
+    return confidence
+
+
 def read_config(config_path: str, config_class: BaseModel) -> BaseModel:
     """Read the yaml config from the config_path and return an instance of the given config_class
 
@@ -40,9 +88,10 @@ def read_config(config_path: str, config_class: BaseModel) -> BaseModel:
     return config_class(**config_dict)
 
 
+@timed("sheet_write")
 @retry(
     wait=wait_exponential(max=90),
-    before_sleep=before_sleep_log(logger, logging.INFO),
+    before_sleep=before_sleep_count(logging.INFO),
     after=after_log(logger, logging.INFO),
 )
 def update_cell(ws: gspread.Worksheet, row: int, col: int, value: Any) -> None:
@@ -0,0 +1,253 @@
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from loguru import logger
+
+from nfl_confidence.odds import GameOdds, get_this_weeks_games, parse_the_odds_json
+from nfl_confidence.schedule import nfl_week_start
+from nfl_confidence.utils import assign_confidence
+from nfl_confidence.weights import BookmakerWeights, build_table
+
+# Version of a game in a the-odds response: (bookmaker title, last_update) for every bookmaker
+GameVersion = Tuple[Tuple[str, str], ...]
+
+
+def game_version(game_json: Dict[str, Any]) -> GameVersion:
+    """Identify the state of a game's odds from the raw response, without parsing it. Bookmakers
+    bump last_update whenever their line moves, so equal versions mean equal odds.
+
+    Args:
+        game_json (Dict[str, Any]): A single game from a the-odds API response
+
+    Returns:
+        GameVersion: Sorted (bookmaker title, last_update) pairs
+    """
+    return tuple(
+        sorted(
+            (bookmaker["title"], bookmaker["last_update"]) for bookmaker in game_json["bookmakers"]
+        )
+    )
+
+
+class OddsWatcher:
+    """Keeps the ranked confidence rows for a week of games across successive the-odds snapshots.
+    Each update only parses and recomputes the games whose bookmaker odds changed, then re-ranks
+    and returns the rows that differ from the previous update.
+
+    Games which drop out of the snapshot or out of game_filter (e.g. once they kick off) keep
+    their last odds, and games which have kicked off are locked at their last confidence value,
+    so only the remaining games are re-ranked. Games which kicked off before the watcher started
+    can be added to locked by the caller, e.g. from the week sheet; they hold their confidence
+    values without being ranked. Games from outside the current NFL week are forgotten once it
+    turns over on Tuesday.
+    """
+
+    def __init__(
+        self,
+        max_confidence: int = 16,
+        game_filter: Optional[Callable[[List[GameOdds]], List[GameOdds]]] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
+        bookmaker_weights: Optional[BookmakerWeights] = None,
+    ):
+        """
+        Args:
+            max_confidence (int, optional): Maximum confidence value for the week. Defaults to 16.
+            game_filter (Callable[[List[GameOdds]], List[GameOdds]], optional): Selects the games
+                to rank from each batch of changed games. Defaults to get_this_weeks_games at the
+                time given by clock.
+            clock (Callable[[], datetime], optional): Returns the current time, for choosing
+                this week's games and locking games which have kicked off. Defaults to the system
+                clock.
+            bookmaker_weights (Optional[BookmakerWeights], optional): Fitted weights for
+                averaging the bookmakers. Defaults to a plain average.
+        """
+        self.max_confidence = max_confidence
+        self.game_filter = game_filter or (
+            lambda games: get_this_weeks_games(games=games, now=self.clock())
+        )
+        self.clock = clock
+        self.bookmaker_weights = bookmaker_weights
+        self.versions: Dict[str, GameVersion] = {}
+        self.games: Dict[str, GameOdds] = {}
+        self.metrics: Dict[str, List[Any]] = {}
+        self.rows: Dict[str, List[Any]] = {}
+        self.locked: Dict[str, int] = {}
+        self.week_start: Optional[date] = None
+
+    def lock_started_games(self, now: datetime) -> None:
+        """Lock every ranked game which has kicked off at its current confidence value
+
+        Args:
+            now (datetime): Current time
+        """
+        for game_id, game in self.games.items():
+            if game_id in self.rows and game_id not in self.locked and game.commence_time <= now:
+                self.locked[game_id] = self.rows[game_id][-1]
+                logger.info(f"Locked game {game_id} at confidence {self.locked[game_id]}")
+
+    def prune(self, now: datetime) -> int:
+        """Forget every game outside the current NFL week, so a watcher left running past Tuesday
+        ranks only the new week's games
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            int: Number of games forgotten
+        """
+        week_start = nfl_week_start(now)
+        stale = [
+            game_id
+            for game_id, game in self.games.items()
+            if nfl_week_start(game.commence_time) != week_start
+        ]
+        # Locked games without odds have no kickoff to go by, so they go when the week turns
+        if self.week_start is not None and self.week_start != week_start:
+            stale += [game_id for game_id in self.locked if game_id not in self.games]
+        self.week_start = week_start
+        for game_id in stale:
+            for state in (self.games, self.metrics, self.rows, self.locked, self.versions):
+                state.pop(game_id, None)
+        if stale:
+            logger.info(f"Dropped {len(stale)} games outside the week starting {week_start}")
+        return len(stale)
+
+    def changed_games(self, the_odds_json: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the games in a snapshot which are new or whose odds changed since the last update
+
+        Args:
+            the_odds_json (List[Dict[str, Any]]): the-odds API response
+
+        Returns:
+            List[Dict[str, Any]]: Changed games, as raw JSON
+        """
+        return [
+            game for game in the_odds_json if self.versions.get(game["id"]) != game_version(game)
+        ]
+
+    def update(self, the_odds_json: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Apply a new snapshot and return the sheet rows which changed
+
+        Args:
+            the_odds_json (List[Dict[str, Any]]): the-odds API response
+
+        Returns:
+            Dict[str, List[Any]]: Changed rows, in WEEK_SHEET_COLUMNS order, keyed by game ID
+        """
+        now = self.clock()
+        n_pruned = self.prune(now=now)
+        changed = self.changed_games(the_odds_json)
+        if not changed and not n_pruned:
+            return {}
+
+        # Recompute the metrics of the changed games only, leaving locked games as they were.
+        # Games the filter drops are not marked as seen, so they are picked up once they enter it.
+        self.lock_started_games(now=now)
+        accepted = self.game_filter(parse_the_odds_json(the_odds_json=changed)) if changed else []
+        raw_games = {game["id"]: game for game in changed}
+        for game in accepted:
+            self.versions[game.id] = game_version(raw_games[game.id])
+        games = [game for game in accepted if game.id not in self.locked]
+        logger.info(f"{len(changed)} games changed, {len(games)} to recompute")
+        if not games and not n_pruned:
+            return {}
+        if games:
+            self.set_metrics(games)
+
+        # Re-rank every game and keep only the rows whose contents moved
+        rows = self.rank()
+        changed_rows = {
+            game_id: row for game_id, row in rows.items() if self.rows.get(game_id) != row
+        }
+        self.rows = rows
+        return changed_rows
+
+    def set_metrics(self, games: List[GameOdds]) -> None:
+        """Compute and store the sheet metrics of games in one vectorized pass
+
+        Args:
+            games (List[GameOdds]): Games to recompute
+        """
+        table = build_table(games=games, weights=self.bookmaker_weights)
+        for i, game in enumerate(games):
+            self.games[game.id] = game
+            self.metrics[game.id] = [
+                game.home_team.value,
+                game.away_team.value,
+                table.predicted_winner[i].value,
+                table.win_probability_variance[i],
+                table.oddsmaker_agreement[i],
+                table.win_probability[i],
+            ]
+
+    def rank(self) -> Dict[str, List[Any]]:
+        """Assign confidence values to every known game by win probability, keeping locked games
+        at their locked values. Locked games without odds hold their values but get no row.
+
+        Returns:
+            Dict[str, List[Any]]: Rows in WEEK_SHEET_COLUMNS order keyed by game ID, ordered by
+                commence time then ID
+        """
+        game_ids = sorted(self.games, key=lambda x: (self.games[x].commence_time, x))
+        kicked_off = [game_id for game_id in self.locked if game_id not in self.games]
+        win_probability = [self.metrics[game_id][-1] for game_id in game_ids]
+        win_probability += [0.0] * len(kicked_off)
+        locked = {
+            i: self.locked[game_id]
+            for i, game_id in enumerate(game_ids + kicked_off)
+            if game_id in self.locked
+        }
+        confidence_ranks = assign_confidence(
+            values=win_probability, max_confidence=self.max_confidence, locked=locked
+        )
+        return {
+            game_id: [game_id, *self.metrics[game_id], int(rank)]
+            for game_id, rank in zip(game_ids, confidence_ranks)
+        }
+
+
+def watch(
+    fetch: Callable[[], List[Dict[str, Any]]],
+    watcher: OddsWatcher,
+    on_change: Callable[[Dict[str, List[Any]]], Any],
+    interval: float = 300.0,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Poll the-odds API on a schedule and hand each set of changed rows to on_change. Polls that
+    change nothing cost one request and no parsing or sheet calls.
+
+    Args:
+        fetch (Callable[[], List[Dict[str, Any]]]): Returns the current the-odds response
+        watcher (OddsWatcher): Ranking state carried between polls
+        on_change (Callable[[Dict[str, List[Any]]], Any]): Called with the changed rows, e.g. a
+            partial of push_rows
+        interval (float, optional): Seconds between polls. Defaults to 300.
+        max_polls (Optional[int], optional): Stop after this many polls. Defaults to polling
+            forever.
+        sleep (Callable[[float], None], optional): Sleep function. Defaults to time.sleep.
+
+    Returns:
+        int: Number of polls which changed at least one row
+    """
+    n_polls = 0
+    n_changed = 0
+    while max_polls is None or n_polls < max_polls:
+        if n_polls:
+            sleep(interval)
+        n_polls += 1
+        try:
+            the_odds_json = fetch()
+        except requests.RequestException as e:
+            logger.warning(f"Poll {n_polls} failed, retrying in {interval:.0f}s: {e}")
+            continue
+        rows = watcher.update(the_odds_json)
+        if rows:
+            n_changed += 1
+            logger.info(f"Poll {n_polls}: {len(rows)} rows changed")
+            on_change(rows)
+        else:
+            logger.debug(f"Poll {n_polls}: no changes")
+    return n_changed
@@ -0,0 +1,182 @@
+from enum import Enum
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from nfl_confidence.compact import CompactGame, compact_table
+from nfl_confidence.odds import GameOdds, OddsTable
+from nfl_confidence.probability import DevigMethod
+
+# Probabilities are clipped this far from 0 and 1 before taking logs
+EPSILON = 1e-6
+
+# Optimizer settings for fit_bookmaker_weights
+FIT_ITERATIONS = 500
+LEARNING_RATE = 0.05
+
+
+class ScoringRule(str, Enum):
+    LOG_LOSS = "log_loss"
+    BRIER = "brier"
+
+
+class BookmakerWeights(BaseModel):
+    weights: Dict[str, float]  # Weight of each bookmaker, averaging 1.0 over fitted bookmakers
+    devig_method: DevigMethod = DevigMethod.PROPORTIONAL  # De-vig method used in the fit
+    scoring_rule: ScoringRule = ScoringRule.LOG_LOSS  # Loss the weights minimize
+    games: int = 0  # Games in the fit
+    loss: Optional[float] = None  # In-sample loss with these weights
+    unweighted_loss: Optional[float] = None  # In-sample loss of the plain average
+
+    def save(self, path: str) -> None:
+        """Write the weights to a JSON file
+
+        Args:
+            path (str): Destination path
+        """
+        with open(path, "w") as f:
+            f.write(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: str) -> "BookmakerWeights":
+        """Read weights written by save
+
+        Args:
+            path (str): JSON file path
+
+        Returns:
+            BookmakerWeights: The stored weights
+        """
+        with open(path, "r") as f:
+            return cls.model_validate_json(f.read())
+
+
+def build_table(
+    games: Sequence[Union[GameOdds, CompactGame]], weights: Optional[BookmakerWeights] = None
+) -> OddsTable:
+    """Build an OddsTable, averaging the bookmakers with fitted weights when there are any
+
+    Args:
+        games (Sequence[Union[GameOdds, CompactGame]]): Parsed games, either all GameOdds or all
+            CompactGame
+        weights (Optional[BookmakerWeights], optional): Fitted weights. Defaults to a plain
+            average with proportional de-vigging.
+
+    Returns:
+        OddsTable: Columnar table with one row per game
+    """
+    from_games = OddsTable.from_games
+    if games and isinstance(games[0], CompactGame):
+        from_games = compact_table
+    if weights is None:
+        return from_games(games=list(games))
+    return from_games(
+        games=list(games), devig_method=weights.devig_method, bookmaker_weights=weights.weights
+    )
+
+
+def score_probabilities(
+    probabilities: np.ndarray,
+    home_won: np.ndarray,
+    rule: Union[ScoringRule, str] = ScoringRule.LOG_LOSS,
+    axis: int = 0,
+) -> np.ndarray:
+    """Mean loss of home win probabilities against outcomes, ignoring NaN probabilities
+
+    Args:
+        probabilities (np.ndarray): Home win probabilities of any shape, NaN where missing
+        home_won (np.ndarray): Whether the home team won, broadcastable to probabilities
+        rule (Union[ScoringRule, str], optional): Scoring rule. Defaults to log loss.
+        axis (int, optional): Axis of the games to average over. Defaults to 0.
+
+    Returns:
+        np.ndarray: Mean loss along axis
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    home_won = np.asarray(home_won, dtype=float)
+    if ScoringRule(rule) == ScoringRule.BRIER:
+        losses = (probabilities - home_won) ** 2
+    else:
+        clipped = np.clip(probabilities, EPSILON, 1 - EPSILON)
+        losses = -(home_won * np.log(clipped) + (1 - home_won) * np.log1p(-clipped))
+    return np.nanmean(losses, axis=axis)
+
+
+def score_bookmakers(
+    table: OddsTable, home_won: np.ndarray, rule: Union[ScoringRule, str] = ScoringRule.LOG_LOSS
+) -> Dict[str, float]:
+    """Mean loss of each bookmaker over the games it priced
+
+    Args:
+        table (OddsTable): Games, e.g. several seasons of closing lines in one table
+        home_won (np.ndarray): Whether the home team won each game
+        rule (Union[ScoringRule, str], optional): Scoring rule. Defaults to log loss.
+
+    Returns:
+        Dict[str, float]: Loss by bookmaker title
+    """
+    losses = score_probabilities(
+        table.bookmaker_home_prob, np.asarray(home_won)[:, None], rule=rule, axis=0
+    )
+    return dict(zip(table.bookmakers, losses.tolist()))
+
+
+def fit_bookmaker_weights(
+    table: OddsTable,
+    home_won: np.ndarray,
+    rule: Union[ScoringRule, str] = ScoringRule.LOG_LOSS,
+    shrinkage: float = 0.001,
+) -> BookmakerWeights:
+    """Fit the bookmaker weights which minimize the loss of the weighted average home win
+    probability. Weights are exp(theta) for unconstrained theta, fitted with Adam on the whole
+    games x bookmakers matrix at once, and shrunk towards equal weights by an L2 penalty on theta.
+
+    Args:
+        table (OddsTable): Games with known outcomes, e.g. several seasons of closing lines
+        home_won (np.ndarray): Whether the home team won each game
+        rule (Union[ScoringRule, str], optional): Scoring rule. Defaults to log loss.
+        shrinkage (float, optional): Strength of the penalty towards equal weights. Defaults to
+            0.001.
+
+    Returns:
+        BookmakerWeights: Weights by bookmaker title, normalized to average 1.0
+    """
+    rule = ScoringRule(rule)
+    home_won = np.asarray(home_won, dtype=float)
+    present = ~np.isnan(table.bookmaker_home_prob)
+    probs = np.where(present, table.bookmaker_home_prob, 0.0)
+    present = present.astype(float)
+
+    theta = np.zeros(len(table.bookmakers))
+    first_moment = np.zeros_like(theta)
+    second_moment = np.zeros_like(theta)
+    for step in range(1, FIT_ITERATIONS + 1):
+        weights = np.exp(theta)
+        denominator = present @ weights
+        p = np.clip((probs @ weights) / denominator, EPSILON, 1 - EPSILON)
+        if rule == ScoringRule.BRIER:
+            dloss_dp = 2 * (p - home_won)
+        else:
+            dloss_dp = (p - home_won) / (p * (1 - p))
+        # dp_i / dw_j = present_ij * (prob_ij - p_i) / denominator_i
+        dp_dw = present * (probs - p[:, None]) / denominator[:, None]
+        gradient = weights * (dloss_dp @ dp_dw) / len(p) + shrinkage * theta
+
+        first_moment = 0.9 * first_moment + 0.1 * gradient
+        second_moment = 0.999 * second_moment + 0.001 * gradient**2
+        corrected_first = first_moment / (1 - 0.9**step)
+        corrected_second = second_moment / (1 - 0.999**step)
+        theta = theta - LEARNING_RATE * corrected_first / (np.sqrt(corrected_second) + 1e-8)
+
+    weights = np.exp(theta - theta.mean())
+    weights = weights / weights.mean()
+    fitted = np.nansum(table.bookmaker_home_prob * weights, axis=-1) / (present @ weights)
+    return BookmakerWeights(
+        weights=dict(zip(table.bookmakers, weights.tolist())),
+        devig_method=table.devig_method,
+        scoring_rule=rule,
+        games=len(table),
+        loss=float(score_probabilities(fitted, home_won, rule=rule)),
+        unweighted_loss=float(score_probabilities(table.home_team_win_prob, home_won, rule=rule)),
+    )
@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import timeit
+
+from nfl_confidence.odds import parse_the_odds_json
+
+parser = argparse.ArgumentParser(description="Micro-benchmark for GameOdds computed fields")
+parser.add_argument(
+    "--path",
+    type=str,
+    default=os.path.join("tests", "assets", "the_odds_american.json"),
+    help="Path to a the-odds API response JSON",
+)
+parser.add_argument("--repeats", type=int, default=50, help="Number of timing repeats")
+args = parser.parse_args()
+
+# Load the raw response once
+with open(args.path, "r") as f:
+    the_odds_json = json.load(f)
+n_games = len(the_odds_json)
+fields = [
+    "predicted_winner",
+    "win_probability_variance",
+    "oddsmaker_agreement",
+    "win_probability",
+]
+
+
+def read_fields(games):
+    for game in games:
+        for field in fields:
+            getattr(game, field)
+
+
+# Cold: every repeat reads the fields of freshly parsed games
+cold_total = 0.0
+for _ in range(args.repeats):
+    games = parse_the_odds_json(the_odds_json=the_odds_json)
+    for game in games:
+        game.clear_memoized()
+    cold_total += timeit.timeit(lambda: read_fields(games), number=1)
+
+# Warm: the same games are read over and over, as when a DataFrame is built repeatedly
+games = parse_the_odds_json(the_odds_json=the_odds_json)
+read_fields(games)
+warm_total = timeit.timeit(lambda: read_fields(games), number=args.repeats)
+
+print(f"games: {n_games}; fields per game: {len(fields)}; repeats: {args.repeats}")
+print(f"cold read: {1e6 * cold_total / (args.repeats * n_games):.1f} us/game")
+print(f"warm read: {1e6 * warm_total / (args.repeats * n_games):.1f} us/game")
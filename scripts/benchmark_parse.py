@@ -0,0 +1,40 @@
+import argparse
+import json
+import os
+import timeit
+
+from nfl_confidence.odds import GameOdds, parse_the_odds_bytes, parse_the_odds_json
+
+parser = argparse.ArgumentParser(description="Benchmark for parsing the-odds API responses")
+parser.add_argument(
+    "--path",
+    type=str,
+    default=os.path.join("tests", "assets", "the_odds_american.json"),
+    help="Path to a the-odds API response JSON",
+)
+parser.add_argument("--copies", type=int, default=20, help="Copies of the response to parse")
+parser.add_argument("--repeats", type=int, default=20, help="Number of timing repeats")
+args = parser.parse_args()
+
+# Build a large raw response plus an archive of already-validated games
+with open(args.path, "r") as f:
+    the_odds_json = json.load(f) * args.copies
+raw = json.dumps(the_odds_json).encode()
+archive = json.dumps(
+    [game.model_dump(mode="json") for game in parse_the_odds_json(the_odds_json)]
+).encode()
+n_games = len(the_odds_json)
+
+benchmarks = {
+    "json.loads + GameOdds(**game) per game": lambda: [
+        GameOdds(**game) for game in json.loads(raw)
+    ],
+    "json.loads + parse_the_odds_json": lambda: parse_the_odds_json(json.loads(raw)),
+    "parse_the_odds_bytes": lambda: parse_the_odds_bytes(raw),
+    "parse_the_odds_bytes (archive)": lambda: parse_the_odds_bytes(archive),
+    "parse_the_odds_bytes (archive, trusted)": lambda: parse_the_odds_bytes(archive, trusted=True),
+}
+print(f"games: {n_games}; repeats: {args.repeats}")
+for name, func in benchmarks.items():
+    seconds = min(timeit.repeat(func, number=1, repeat=args.repeats))
+    print(f"{name}: {n_games / seconds:,.0f} games/s")
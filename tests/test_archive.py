@@ -0,0 +1,107 @@
+import copy
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from nfl_confidence.archive import ResponseArchive, SnapshotNotFoundError, odds_params
+from nfl_confidence.backtest import closing_lines
+from nfl_confidence.fakes import FakeOddsServer
+from nfl_confidence.fetch import OddsClient, OddsRequest, ReplayClient
+from nfl_confidence.odds import get_the_odds_bytes, parse_the_odds_json
+from nfl_confidence.stream import iter_json_values
+
+START = datetime(2023, 10, 19, 12, tzinfo=timezone.utc)
+SPORT = "americanfootball_nfl"
+
+
+@pytest.fixture
+def moved_resp_json(the_odds_resp_json):
+    moved = copy.deepcopy(the_odds_resp_json)
+    moved[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] += 5
+    return moved
+
+
+def record(archive, response, minutes, remaining=100):
+    return archive.record(
+        sport=SPORT,
+        params={**odds_params(), "apiKey": "secret"},
+        response=response,
+        headers={"x-requests-remaining": str(remaining), "x-requests-used": "1"},
+        now=START + timedelta(minutes=minutes),
+    )
+
+
+def test_record_deduplicates_consecutive_snapshots(tmp_path, the_odds_resp_json, moved_resp_json):
+    archive = ResponseArchive(archive_dir=str(tmp_path))
+    assert record(archive, the_odds_resp_json, 0)
+    assert not record(archive, copy.deepcopy(the_odds_resp_json), 5)
+    assert record(archive, moved_resp_json, 10)
+    assert record(archive, the_odds_resp_json, 15)
+
+    # Returning to an earlier response is a new entry, but its body is stored once
+    entries = archive.entries(sport=SPORT, params=odds_params())
+    assert [entry.fetched_at - START for entry in entries] == [
+        timedelta(minutes=minutes) for minutes in (0, 10, 15)
+    ]
+    assert entries[0].digest == entries[2].digest
+    assert entries[0].quota.requests_remaining == 100
+    assert "apiKey" not in entries[0].params
+    n_objects = sum(len(files) for _, _, files in os.walk(tmp_path / "objects"))
+    assert n_objects == 2
+    assert archive.load(entries[1].digest) == moved_resp_json
+
+    # A new process picks up where the index left off
+    reopened = ResponseArchive(archive_dir=str(tmp_path))
+    assert not record(reopened, the_odds_resp_json, 20)
+    assert archive.entries(params=odds_params(regions="uk")) == []
+
+
+def test_replay_serves_snapshots_by_time(tmp_path, the_odds_resp_json, moved_resp_json):
+    archive = ResponseArchive(archive_dir=str(tmp_path))
+    record(archive, the_odds_resp_json, 0)
+    record(archive, moved_resp_json, 10)
+
+    now = [START - timedelta(seconds=1)]
+    client = ReplayClient(archive=archive, clock=lambda: now[0])
+    with pytest.raises(SnapshotNotFoundError):
+        client.fetch(OddsRequest())
+    for minutes, expected in [(0, the_odds_resp_json), (9, the_odds_resp_json)]:
+        now[0] = START + timedelta(minutes=minutes)
+        assert client.fetch(OddsRequest()) == expected
+    now[0] = START + timedelta(days=1)
+    assert client.get_the_odds_json(api_key="ignored") == moved_resp_json
+    assert json.loads(client.get_the_odds_bytes(api_key="ignored")) == moved_resp_json
+    assert client.fetch_merged([OddsRequest(), OddsRequest()]) == moved_resp_json
+    with pytest.raises(SnapshotNotFoundError):
+        client.fetch(OddsRequest(regions="uk"))
+
+
+def test_export_feeds_backtest(tmp_path, the_odds_resp_json, moved_resp_json):
+    archive = ResponseArchive(archive_dir=str(tmp_path / "archive"))
+    record(archive, the_odds_resp_json, 0)
+    record(archive, moved_resp_json, 10)
+
+    path = str(tmp_path / "odds.jsonl.gz")
+    assert archive.export(path=path) == 2
+    snapshots = list(iter_json_values(path=path, stream_arrays=False))
+    assert snapshots == [the_odds_resp_json, moved_resp_json]
+    assert archive.export(path=path, after=START + timedelta(minutes=1)) == 1
+    assert len(closing_lines(path)) == len(parse_the_odds_json(moved_resp_json))
+
+
+def test_clients_record_network_responses(tmp_path, the_odds_file_path, the_odds_resp_json):
+    archive = ResponseArchive(archive_dir=str(tmp_path))
+    with FakeOddsServer({SPORT: the_odds_file_path}) as server:
+        raw = get_the_odds_bytes(api_key="key", base_url=server.url, archive=archive)
+        with OddsClient(api_key="key", base_url=server.url, archive=archive) as client:
+            client.fetch(OddsRequest())
+            client.fetch(OddsRequest(regions="uk"))
+
+    entries = archive.entries()
+    assert len(entries) == 2
+    assert [entry.quota.requests_remaining for entry in entries] == [499, 497]
+    assert json.loads(raw) == the_odds_resp_json
+    replayed = ReplayClient(archive=archive).fetch(OddsRequest())
+    assert replayed == the_odds_resp_json
@@ -0,0 +1,142 @@
+import copy
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from nfl_confidence.backtest import (
+    BacktestConfig,
+    Season,
+    backtest,
+    closing_lines,
+    summarize,
+    training_data,
+)
+from nfl_confidence.odds import OddsTable
+from nfl_confidence.schedule import nfl_week_start
+from nfl_confidence.utils import assign_confidence
+from nfl_confidence.weights import fit_bookmaker_weights
+
+
+def write_season(tmp_path, the_odds_resp_json, name):
+    """Archive two snapshots of the fixture plus a post-kickoff update, and results in which the
+    home team wins every game"""
+    snapshot = copy.deepcopy(the_odds_resp_json)
+    moved = copy.deepcopy(the_odds_resp_json)
+    for bookmaker in moved[0]["bookmakers"]:
+        bookmaker["last_update"] = "2023-10-19T20:00:00Z"
+        for outcome in bookmaker["markets"][0]["outcomes"]:
+            outcome["price"] = -900 if outcome["name"] == moved[0]["home_team"] else 600
+    live = copy.deepcopy(moved)
+    for bookmaker in live[0]["bookmakers"]:
+        bookmaker["last_update"] = "2023-10-20T01:00:00Z"
+        for outcome in bookmaker["markets"][0]["outcomes"]:
+            outcome["price"] = 900 if outcome["name"] == live[0]["home_team"] else -900
+    odds_path = tmp_path / f"odds_{name}.jsonl"
+    with open(odds_path, "w") as f:
+        for response in (snapshot, moved, live):
+            f.write(json.dumps(response) + "\n")
+
+    scores = [
+        {
+            "id": game["id"],
+            "commence_time": game["commence_time"],
+            "completed": True,
+            "home_team": game["home_team"],
+            "away_team": game["away_team"],
+            "scores": [
+                {"name": game["home_team"], "score": "21"},
+                {"name": game["away_team"], "score": "14"},
+            ],
+        }
+        for game in the_odds_resp_json
+    ]
+    scores_path = tmp_path / f"scores_{name}.json"
+    with open(scores_path, "w") as f:
+        json.dump(scores, f)
+    return Season(name=name, odds_path=str(odds_path), scores_path=str(scores_path))
+
+
+def test_closing_lines_skip_post_kickoff_odds(tmp_path, the_odds_resp_json):
+    season = write_season(tmp_path, the_odds_resp_json, "2023")
+    games = closing_lines(season.odds_path)
+    assert len(games) == len(the_odds_resp_json)
+    [moved] = [game for game in games if game.id == the_odds_resp_json[0]["id"]]
+    assert moved.bookmakers[0].markets[0].outcomes[0].price in (-900, 600)
+    assert moved.predicted_winner == moved.home_team
+
+
+def test_backtest_numbers_weeks_from_the_opener(tmp_path, the_odds_resp_json):
+    # Move the second week's games a week later, leaving a week without games
+    shifted = copy.deepcopy(the_odds_resp_json)
+    for game in shifted:
+        commence_time = datetime.fromisoformat(game["commence_time"].replace("Z", "+00:00"))
+        if str(nfl_week_start(commence_time)) == "2023-10-24":
+            game["commence_time"] = (commence_time + timedelta(days=7)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+    season = write_season(tmp_path, shifted, "2023")
+    weeks = backtest(seasons=[season], max_workers=1)
+    assert list(weeks.week) == [1, 3]
+    assert [str(week_start) for week_start in weeks.week_start] == ["2023-10-17", "2023-10-31"]
+
+
+def test_backtest_scores_with_confidence_rules(tmp_path, the_odds_resp_json):
+    season = write_season(tmp_path, the_odds_resp_json, "2023")
+    weeks = backtest(seasons=[season], max_workers=1)
+    assert list(weeks.week) == [1, 2]
+    assert weeks.games.sum() == len(the_odds_resp_json)
+
+    # Home teams won every game, so points are the confidence of every home team pick
+    games = closing_lines(season.odds_path)
+    week_games = [game for game in games if str(nfl_week_start(game.commence_time)) == "2023-10-17"]
+    table = OddsTable.from_games(week_games)
+    confidence = assign_confidence(table.win_probability, max_confidence=16)
+    home_picks = table.predicted_winner == table.home_team
+    assert weeks.points[0] == confidence[home_picks].sum()
+    assert weeks.possible_points[0] == confidence.sum()
+
+
+def test_backtest_parallel_seasons_and_configs(tmp_path, the_odds_resp_json):
+    seasons = [write_season(tmp_path, the_odds_resp_json, name) for name in ["2022", "2023"]]
+    configs = [
+        BacktestConfig(name=method, devig_method=method) for method in ["proportional", "shin"]
+    ]
+    weeks = backtest(seasons=seasons, configs=configs, max_workers=2)
+    assert len(weeks) == 2 * 2 * 2
+    summary = summarize(weeks).set_index(["config", "season"])
+    assert summary.loc[("shin", "all"), "points"] == summary.loc[("shin", "2022"), "points"] * 2
+    pd.testing.assert_series_equal(
+        weeks[weeks.season == "2022"].points.reset_index(drop=True),
+        weeks[weeks.season == "2023"].points.reset_index(drop=True),
+    )
+
+
+def test_training_data_and_weighted_config(tmp_path, the_odds_resp_json):
+    seasons = [write_season(tmp_path, the_odds_resp_json, name) for name in ["2022", "2023"]]
+    table, home_won = training_data(seasons)
+    assert len(table) == 2 * len(the_odds_resp_json)
+    assert home_won.all()
+
+    weights = fit_bookmaker_weights(table, home_won)
+    path = str(tmp_path / "weights.json")
+    weights.save(path)
+    configs = [BacktestConfig(), BacktestConfig(name="weighted", bookmaker_weights_path=path)]
+    weeks = backtest(seasons=seasons[:1], configs=configs)
+    assert list(weeks.config.unique()) == ["proportional", "weighted"]
+    assert weeks.games.sum() == 2 * len(the_odds_resp_json)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_warm_backtest_skips_parsing(tmp_path, mocker, the_odds_resp_json, max_workers):
+    seasons = [write_season(tmp_path, the_odds_resp_json, name) for name in ("2022", "2023")]
+    cache_dir = str(tmp_path / "parsed")
+    expected = backtest(seasons=seasons, max_workers=max_workers)
+    cold = backtest(seasons=seasons, max_workers=max_workers, cache_dir=cache_dir)
+    assert cold.equals(expected)
+
+    closing_lines = mocker.patch("nfl_confidence.backtest.closing_lines")
+    warm = backtest(seasons=seasons, max_workers=1, cache_dir=cache_dir)
+    closing_lines.assert_not_called()
+    assert warm.equals(expected)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_confidence.blend import pareto_front, search_blends, simplex_grid, stack_weeks
+from nfl_confidence.utils import get_ranks
+
+SOURCES = ["espn", "538", "vegas"]
+
+
+@pytest.fixture
+def frames():
+    # Uneven weeks, since bye weeks leave fewer games
+    rng = np.random.default_rng(0)
+    frames = {}
+    for week, n_games in enumerate([16, 14, 15, 16, 13], start=1):
+        df = pd.DataFrame(rng.random((n_games, len(SOURCES))), columns=SOURCES)
+        df["was_correct"] = rng.random(n_games) < 0.6
+        frames[f"Week {week}"] = df
+    return frames
+
+
+def loop_score(frames, weights):
+    weekly = []
+    for df in frames.values():
+        blended = df[SOURCES].to_numpy() @ weights
+        weekly.append(sum(get_ranks(values=blended) * df["was_correct"]))
+    return sum(weekly), np.var(weekly)
+
+
+def test_simplex_grid():
+    grid = simplex_grid(n_sources=3, resolution=0.01)
+    assert grid.shape == (5151, 3)
+    np.testing.assert_allclose(grid.sum(axis=1), 1)
+    assert grid.min() == 0 and grid.max() == 1
+    assert len(np.unique(np.round(grid * 100), axis=0)) == len(grid)
+    np.testing.assert_allclose(
+        simplex_grid(n_sources=2, resolution=0.25)[:, 0], [0, 0.25, 0.5, 0.75, 1]
+    )
+    assert simplex_grid(n_sources=1).tolist() == [[1.0]]
+    with pytest.raises(ValueError):
+        simplex_grid(n_sources=3, resolution=0.3)
+
+
+def test_search_matches_week_by_week_loop(frames):
+    probabilities, correct = stack_weeks(frames=frames, sources=SOURCES)
+    assert probabilities.shape == (5, 16, 3)
+    results = search_blends(probabilities, correct, sources=SOURCES, resolution=0.1)
+    assert len(results) == 66
+    for _, row in results.sample(10, random_state=0).iterrows():
+        points, variance = loop_score(frames, row[SOURCES].to_numpy(dtype=float))
+        assert row["points"] == points
+        assert row["variance"] == pytest.approx(variance)
+
+    # Chunking does not change the scores
+    chunked = search_blends(probabilities, correct, sources=SOURCES, resolution=0.1, chunk_size=7)
+    pd.testing.assert_frame_equal(chunked, results)
+
+
+def test_pareto_front_is_not_dominated(frames):
+    probabilities, correct = stack_weeks(frames=frames, sources=SOURCES)
+    results = search_blends(probabilities, correct, sources=SOURCES, resolution=0.05)
+    front = pareto_front(results)
+    assert list(front["points"]) == sorted(front["points"], reverse=True)
+    assert front["points"].iloc[0] == results["points"].max()
+    assert front["variance"].iloc[-1] == results["variance"].min()
+    for _, row in front.iterrows():
+        dominated = (results["points"] >= row["points"]) & (results["variance"] <= row["variance"])
+        dominated &= (results["points"] > row["points"]) | (results["variance"] < row["variance"])
+        assert not dominated.any()
+    for index in results.index.difference(front.index):
+        row = results.loc[index]
+        assert ((front["points"] >= row["points"]) & (front["variance"] <= row["variance"])).any()
+
+
+def test_stack_weeks_rejects_missing_values(frames):
+    frames["Week 2"].loc[3, "538"] = np.nan
+    with pytest.raises(ValueError, match="Week 2"):
+        stack_weeks(frames=frames, sources=SOURCES)
+    with pytest.raises(ValueError, match="fivethirtyeight"):
+        stack_weeks(frames=frames, sources=["espn", "fivethirtyeight"])
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from nfl_confidence.cache import QuotaExceededError, ResponseCache, request_cost
+from nfl_confidence.odds import get_the_odds_json
+
+
+@pytest.fixture
+def mock_get(mocker, the_odds_resp_json):
+    resp = mocker.MagicMock()
+    resp.json.return_value = the_odds_resp_json
+    resp.headers = {"x-requests-remaining": "10", "x-requests-used": "490"}
+    return mocker.patch("nfl_confidence.odds.requests.get", return_value=resp)
+
+
+def test_request_cost():
+    assert request_cost({"regions": "us,us2,uk", "markets": "h2h,spreads"}) == 6
+
+
+def test_cache_hit_skips_network(tmp_path, mock_get, the_odds_resp_json):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl=60)
+    first = get_the_odds_json(api_key="key", cache=cache)
+    second = get_the_odds_json(api_key="key", cache=cache)
+    assert first == second == the_odds_resp_json
+    assert mock_get.call_count == 1
+    assert cache.quota().requests_remaining == 10
+    assert cache.quota().requests_used == 490
+
+    # A different request is a miss
+    get_the_odds_json(api_key="key", odds_format="decimal", cache=cache)
+    assert mock_get.call_count == 2
+
+
+def test_cache_entry_expires(tmp_path, the_odds_resp_json):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl=60)
+    params = {"regions": "us", "markets": "h2h", "oddsFormat": "american"}
+    now = datetime(2023, 10, 19, tzinfo=timezone.utc)
+    cache.put(sport="nfl", params=params, response=the_odds_resp_json, headers={}, now=now)
+    assert cache.get(sport="nfl", params=params, now=now + timedelta(seconds=59)) is not None
+    assert cache.get(sport="nfl", params=params, now=now + timedelta(seconds=61)) is None
+
+
+def test_cache_refuses_when_quota_would_run_out(tmp_path, mock_get):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl=0, min_requests_remaining=9)
+    get_the_odds_json(api_key="key", cache=cache)
+    with pytest.raises(QuotaExceededError):
+        get_the_odds_json(api_key="key", regions="us,uk", cache=cache)
+    assert mock_get.call_count == 1
+
+    # Warn instead of raising
+    cache.raise_on_low_quota = False
+    get_the_odds_json(api_key="key", regions="us,uk", cache=cache)
+    assert mock_get.call_count == 2
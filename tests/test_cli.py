@@ -0,0 +1,150 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from nfl_confidence.cli import COMMANDS, build_parser, main
+from nfl_confidence.commands.common import confidence_dataframe, get_confidence_ranks
+from nfl_confidence.compact import compact_games
+from nfl_confidence.fakes import FakeClient
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.sheets import WEEK_SHEET_COLUMNS, typed_frame
+
+
+def test_parser_subcommands():
+    parser = build_parser()
+    args = parser.parse_args(["update-sheet", "--week", "3"])
+    assert args.command == "update-sheet"
+    assert args.week == 3
+    assert args.max_confidence == 16
+    args = parser.parse_args(["compare", "--mus", "0", "1"])
+    assert args.mus == [0.0, 1.0]
+    args = parser.parse_args(["compare", "--sources", "espn", "538", "vegas"])
+    assert (args.mus, args.sources, args.resolution) == (None, ["espn", "538", "vegas"], 0.01)
+    args = parser.parse_args(
+        ["backtest", "--season", "2022", "a.json", "b.json", "--season", "2023", "c", "d"]
+    )
+    assert args.seasons == [["2022", "a.json", "b.json"], ["2023", "c", "d"]]
+    args = parser.parse_args(["optimize", "--results_path", "r.csv", "--me", "Luke"])
+    assert (args.me, args.sims, args.restarts) == ("Luke", 20_000, 8)
+    args = parser.parse_args(["fit-weights", "--season", "2023", "a", "b", "--output", "w.json"])
+    assert (args.rule, args.devig, args.output) == ("log_loss", "proportional", "w.json")
+    args = parser.parse_args(["export-archive", "--output", "odds.jsonl.gz"])
+    assert (args.archive_dir, args.regions, args.after) == (None, "us", None)
+    args = parser.parse_args(["settle", "--week", "7", "--pick_set", "a", "b", "c", "d"])
+    assert (args.week, args.pick_sets, args.days_from) == (7, [["a", "b", "c", "d"]], 3)
+    with pytest.raises(SystemExit):
+        parser.parse_args([])
+
+
+def test_main_imports_only_the_chosen_command(mocker):
+    import_module = mocker.patch("nfl_confidence.cli.importlib.import_module")
+    main(["plot", "--year", "2022"])
+    import_module.assert_called_once_with(f"nfl_confidence.commands.{COMMANDS['plot']}")
+    [args] = import_module.return_value.run.call_args.args
+    assert args.year == 2022
+
+
+def test_help_skips_heavy_imports():
+    code = (
+        "import sys\n"
+        "from nfl_confidence.cli import build_parser\n"
+        "build_parser().format_help()\n"
+        "print(','.join(m for m in ('pandas', 'numpy', 'gspread', 'pydantic') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_confidence_dataframe(the_odds_resp_json):
+    table = OddsTable.from_games(games=parse_the_odds_json(the_odds_json=the_odds_resp_json))
+    confidence_ranks = get_confidence_ranks(table=table, max_confidence=16)
+    assert confidence_ranks.max() == 16
+    assert sorted(confidence_ranks) == list(range(17 - len(table), 17))
+    df = confidence_dataframe(table=table, confidence_ranks=confidence_ranks)
+    assert list(df.id) == list(table.game_ids)
+    assert np.allclose(df.confidence_prob, table.win_probability)
+
+
+def test_confidence_ranks_skip_locked_values(the_odds_resp_json):
+    table = OddsTable.from_games(games=parse_the_odds_json(the_odds_json=the_odds_resp_json[:10]))
+    unlocked = get_confidence_ranks(table=table, max_confidence=16)
+    confidence_ranks = get_confidence_ranks(table=table, max_confidence=16, locked_values=[16, 9])
+    assert set(confidence_ranks) == set(range(5, 17)) - {16, 9}
+    assert list(np.argsort(confidence_ranks)) == list(np.argsort(unlocked))
+
+
+@pytest.fixture
+def update_sheet_env(the_odds_resp_json, mocker, monkeypatch):
+    monkeypatch.setenv("THE_ODDS_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_SHEETS_SECRET_PATH", "secret.json")
+    sh = FakeClient().create("Confidence")
+    client = mocker.Mock(open=mocker.Mock(return_value=sh))
+    module = "nfl_confidence.commands.update_sheet"
+    mocker.patch(f"{module}.gs.service_account", return_value=client)
+    mocker.patch(f"{module}.check_system_time")
+    mocker.patch(f"{module}.confirm", return_value=True)
+    games = compact_games(parse_the_odds_json(the_odds_json=the_odds_resp_json[:10]))
+    mocker.patch(f"{module}.get_this_weeks_odds", return_value=games)
+    return sh
+
+
+def kicked_off_sheet(sh, confidence_ranks):
+    ws = sh.add_worksheet(title="Week 7")
+    rows = [
+        [f"kicked_off_{i}", "a", "b", "a", 0.0, 1.0, 0.6, rank]
+        for i, rank in enumerate(confidence_ranks)
+    ]
+    ws.update([WEEK_SHEET_COLUMNS] + rows)
+    return ws
+
+
+def test_update_sheet_skips_blank_locked_values(update_sheet_env):
+    ws = kicked_off_sheet(update_sheet_env, confidence_ranks=[16, ""])
+    main(["update-sheet", "--week", "7", "--sheet", "Confidence"])
+    df = typed_frame(ws.get_all_values())
+    assert df.confidence_rank.iloc[0] == 16
+    assert np.isnan(df.confidence_rank.iloc[1])
+    assert sorted(df.confidence_rank.iloc[2:]) == list(range(6, 16))
+
+
+def test_update_sheet_reports_invalid_locked_values(update_sheet_env):
+    ws = kicked_off_sheet(update_sheet_env, confidence_ranks=[16, 16])
+    with pytest.raises(SystemExit):
+        main(["update-sheet", "--week", "7", "--sheet", "Confidence"])
+    assert len(ws.get_all_values()) == 3
+
+
+def test_write_sheet_skips_blank_trailing_locked_values(
+    the_odds_resp_json, tmp_path, mocker, monkeypatch
+):
+    monkeypatch.setenv("THE_ODDS_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_SHEETS_SECRET_PATH", "secret.json")
+    sh = FakeClient().create("Confidence")
+    module = "nfl_confidence.commands.write_sheet"
+    mocker.patch(f"{module}.gs.service_account", return_value=mocker.Mock(open=lambda name: sh))
+    mocker.patch(f"{module}.check_system_time")
+    mocker.patch(f"{module}.confirm", return_value=True)
+    games = compact_games(parse_the_odds_json(the_odds_json=the_odds_resp_json[:10]))
+    mocker.patch(f"{module}.get_this_weeks_odds", return_value=games)
+    ws = sh.add_worksheet(title="Week 7")
+    ws.update(
+        [["Game ID", "Predicted Winner", "Confidence Rank"], ["kicked_off_0", "a", 16]]
+        + [["kicked_off_1", "b"]]
+        + [[game.id] for game in games]
+    )
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("week_number: 7\nsheet_name: Confidence\n")
+
+    main(["write-sheet", "--config_path", str(config_path)])
+    df = typed_frame(ws.get_all_values())
+    assert df["Confidence Rank"].iloc[0] == 16
+    assert np.isnan(df["Confidence Rank"].iloc[1])
+    assert sorted(df["Confidence Rank"].iloc[2:]) == list(range(6, 16))
+
+    # Locks outside the week's values are reported rather than raised
+    ws.update([["kicked_off_1", "b", 1]], "A3")
+    with pytest.raises(SystemExit):
+        main(["write-sheet", "--config_path", str(config_path)])
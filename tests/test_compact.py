@@ -0,0 +1,110 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from nfl_confidence.compact import (
+    LINEUP_CACHE_SIZE,
+    TEAMS,
+    CompactGame,
+    _intern_lineup,
+    _shared_lineup,
+    compact_games,
+    compact_table,
+    expand_games,
+)
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.schedule import GameIndex
+
+VALIDATED_FIELDS = {
+    "id": True,
+    "home_team": True,
+    "away_team": True,
+    "commence_time": True,
+    "bookmakers": {"__all__": {"title", "last_update"}},
+}
+
+
+def test_round_trip(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    compact = compact_games(games)
+    restored = expand_games(compact)
+    for game, restored_game in zip(games, restored):
+        assert restored_game.model_dump(include=VALIDATED_FIELDS) == game.model_dump(
+            include=VALIDATED_FIELDS
+        )
+        assert restored_game.home_team_win_prob == pytest.approx(game.home_team_win_prob)
+        assert restored_game.oddsmaker_agreement == game.oddsmaker_agreement
+    assert compact_games(restored) == compact
+
+
+def test_fields(the_odds_resp_json):
+    game = parse_the_odds_json(the_odds_resp_json)[0]
+    compact = CompactGame.from_game(game)
+    assert TEAMS[compact.home] == game.home_team == compact.home_team
+    assert compact.away_team == game.away_team
+    assert compact.commence_time == game.commence_time
+    assert compact.bookmakers == tuple(bookmaker.title for bookmaker in game.bookmakers)
+    assert compact.price_array.dtype == np.int32
+    assert compact.price_array.shape == (len(game.bookmakers), 2)
+    np.testing.assert_array_equal(compact.price_array, OddsTable.from_games([game]).prices[0])
+
+
+def test_frozen(the_odds_resp_json):
+    compact = CompactGame.from_game(parse_the_odds_json(the_odds_resp_json)[0])
+    with pytest.raises(AttributeError):
+        compact.home = 0
+    with pytest.raises(AttributeError):
+        compact.extra = 0
+    with pytest.raises(ValueError):
+        compact.price_array[0, 0] = 100
+    assert not hasattr(compact, "__dict__")
+    assert pickle.loads(pickle.dumps(compact)) == compact
+    assert hash(pickle.loads(pickle.dumps(compact))) == hash(compact)
+
+
+def test_shared_bookmaker_lineups(the_odds_resp_json):
+    compact = compact_games(parse_the_odds_json(the_odds_resp_json) * 2)
+    half = len(compact) // 2
+    assert all(a.bookmakers is b.bookmakers for a, b in zip(compact[:half], compact[half:]))
+
+
+def test_shared_lineups_are_bounded():
+    for i in range(LINEUP_CACHE_SIZE + 10):
+        _intern_lineup([f"book_{i}", "fanduel"])
+    assert _shared_lineup.cache_info().currsize == LINEUP_CACHE_SIZE
+
+
+def test_fractional_prices(the_odds_resp_json):
+    game_json = copy.deepcopy(the_odds_resp_json[0])
+    for bookmaker in game_json["bookmakers"]:
+        for outcome, price in zip(bookmaker["markets"][0]["outcomes"], [1.91, 1.95]):
+            outcome["price"] = price
+    game = parse_the_odds_json([game_json], odds_format="decimal")[0]
+    compact = CompactGame.from_game(game)
+    assert compact.dtype == np.float64
+    assert compact.to_game().model_dump(include=VALIDATED_FIELDS) == game.model_dump(
+        include=VALIDATED_FIELDS
+    )
+    assert compact.to_game().home_team_win_prob == game.home_team_win_prob
+
+
+def test_compact_table_matches_from_games(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    expected = OddsTable.from_games(games=games, devig_method="power")
+    table = compact_table(compact_games(games), devig_method="power")
+    assert table.bookmakers == expected.bookmakers
+    np.testing.assert_array_equal(table.prices, expected.prices)
+    np.testing.assert_allclose(table.home_team_win_prob, expected.home_team_win_prob)
+    assert list(table.predicted_winner) == list(expected.predicted_winner)
+    assert list(table.commence_time) == list(expected.commence_time)
+
+
+def test_game_index(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    weeks = GameIndex(compact_games(games)).weeks()
+    expected = GameIndex(games).weeks()
+    assert list(weeks) == list(expected)
+    for week in weeks:
+        assert [game.id for game in weeks[week]] == [game.id for game in expected[week]]
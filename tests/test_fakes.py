@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+from nfl_confidence.cache import ResponseCache
+from nfl_confidence.fakes import FakeClient, FakeOddsServer, FaultConfig, FaultInjector
+from nfl_confidence.fetch import OddsClient, OddsRequest
+from nfl_confidence.odds import get_the_odds_json, parse_the_odds_json
+from nfl_confidence.sheets import SheetWriter
+
+
+def test_fake_odds_server_serves_fixture(the_odds_file_path, the_odds_resp_json, tmp_path):
+    with FakeOddsServer({"americanfootball_nfl": the_odds_file_path}) as server:
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        the_odds_json = get_the_odds_json(api_key="key", cache=cache, base_url=server.url)
+        assert the_odds_json == the_odds_resp_json
+        assert server.requests[0]["apiKey"] == ["key"]
+        assert cache.quota().requests_remaining == 499
+        assert len(parse_the_odds_json(the_odds_json)) == 29
+
+
+def test_fake_odds_server_rate_limits(the_odds_file_path):
+    faults = FaultConfig(rate_limit_first=2)
+    with FakeOddsServer({"americanfootball_nfl": the_odds_file_path}, faults=faults) as server:
+        with pytest.raises(requests.HTTPError):
+            get_the_odds_json(api_key="key", base_url=server.url)
+        with OddsClient(api_key="key", max_wait=0, base_url=server.url) as client:
+            assert len(client.fetch(OddsRequest())) == 29
+        assert server.faults.rate_limited["americanfootball_nfl/odds"] == 2
+        assert server.requests_used == 1
+
+
+def test_fake_odds_server_counts_concurrent_requests(the_odds_file_path):
+    with FakeOddsServer({"americanfootball_nfl": the_odds_file_path}) as server:
+        url = f"{server.url}/v4/sports/americanfootball_nfl/odds/"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: requests.get(url, timeout=10), range(32)))
+    used = sorted(int(resp.headers["x-requests-used"]) for resp in responses)
+    assert used == list(range(1, 33))
+    assert server.requests_used == len(server.requests) == 32
+
+
+def test_fake_spreadsheet_surface():
+    gc = FakeClient()
+    sh = gc.create("Confidence")
+    ws = sh.add_worksheet(title="Week 1", rows=20, cols=15)
+    ws.update([["id", "confidence_rank"], ["a", 16], ["b", 15]])
+    assert [w.title for w in sh.worksheets()] == ["Week 1"]
+    assert gc.open("Confidence").worksheet("Week 1").get_all_records() == [
+        {"id": "a", "confidence_rank": 16},
+        {"id": "b", "confidence_rank": 15},
+    ]
+    ws.update_cell(3, 2, 14)
+    assert ws.get_all_values()[2] == ["b", "14"]
+    assert sh.values_batch_get(["'Week 1'!A:Z"])["valueRanges"][0]["values"][1] == ["a", "16"]
+
+
+def test_sheet_writer_retries_fake_rate_limit(mocker):
+    ws = FakeClient().create("Confidence").add_worksheet(title="Week 1")
+    faults = ws.faults = FaultInjector(FaultConfig(rate_limit_first=1))
+    mocker.patch.object(SheetWriter._batch_update.retry, "sleep")
+    writer = SheetWriter(ws=ws)
+    writer.update_cell(row=1, col=1, value="id")
+    assert writer.flush(current_values=[]) == 1
+    assert faults.calls["batch_update"] == 2
+    assert ws.get_all_values() == [["id"]]
+
+    with pytest.raises(APIError):
+        FakeClient(faults=FaultInjector(FaultConfig(rate_limit_first=1))).open("Confidence")
@@ -0,0 +1,105 @@
+import copy
+import time
+
+import pytest
+import requests
+
+from nfl_confidence.fakes import FakeOddsServer, FaultConfig
+from nfl_confidence.fetch import (
+    OddsClient,
+    OddsRequest,
+    merge_the_odds_json,
+    select_market,
+)
+from nfl_confidence.odds import get_the_odds_json, parse_the_odds_json
+
+
+def make_response(mocker, json_data, status_code=200):
+    resp = mocker.MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = json_data
+    resp.headers = {}
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
+    return resp
+
+
+@pytest.fixture
+def uk_resp_json(the_odds_resp_json):
+    uk_json = copy.deepcopy(the_odds_resp_json)
+    for game in uk_json:
+        for bookmaker in game["bookmakers"]:
+            bookmaker["key"] = f"{bookmaker['key']}_uk"
+            bookmaker["title"] = f"{bookmaker['title']} UK"
+    return uk_json
+
+
+def test_merge_the_odds_json(the_odds_resp_json, uk_resp_json):
+    merged = merge_the_odds_json([the_odds_resp_json, uk_resp_json, the_odds_resp_json])
+    assert len(merged) == 29
+    n_bookmakers = len(the_odds_resp_json[0]["bookmakers"])
+    assert len(merged[0]["bookmakers"]) == 2 * n_bookmakers
+    assert len(parse_the_odds_json(merged)) == 29
+
+
+def test_select_market(the_odds_resp_json):
+    game = copy.deepcopy(the_odds_resp_json[0])
+    spreads = {**game["bookmakers"][0]["markets"][0], "key": "spreads"}
+    game["bookmakers"][0]["markets"].append(spreads)
+    game["bookmakers"][1]["markets"] = [spreads]
+    [selected] = select_market([game], market="h2h")
+    assert len(selected["bookmakers"]) == len(game["bookmakers"]) - 1
+    assert parse_the_odds_json([selected])[0].id == game["id"]
+
+
+def test_fetch_all_is_concurrent(mocker, the_odds_resp_json):
+    def slow_get(url, params, timeout):
+        time.sleep(0.2)
+        return make_response(mocker, the_odds_resp_json)
+
+    with OddsClient(api_key="key", max_workers=4) as client:
+        mocker.patch.object(client.session, "get", side_effect=slow_get)
+        odds_requests = [OddsRequest(regions=region) for region in ["us", "us2", "uk", "eu"]]
+        start = time.perf_counter()
+        responses = client.fetch_all(odds_requests)
+        elapsed = time.perf_counter() - start
+    assert len(responses) == 4
+    assert elapsed < 0.6
+
+
+def test_fetch_retries_rate_limit(mocker, the_odds_resp_json):
+    client = OddsClient(api_key="key", max_wait=0)
+    mock_get = mocker.patch.object(
+        client.session,
+        "get",
+        side_effect=[
+            make_response(mocker, None, status_code=429),
+            make_response(mocker, None, status_code=503),
+            make_response(mocker, the_odds_resp_json),
+        ],
+    )
+    assert client.fetch(OddsRequest()) == the_odds_resp_json
+    assert mock_get.call_count == 3
+
+
+def test_fetch_does_not_retry_client_errors(mocker):
+    client = OddsClient(api_key="key", max_wait=0)
+    mock_get = mocker.patch.object(
+        client.session, "get", return_value=make_response(mocker, None, status_code=401)
+    )
+    with pytest.raises(requests.HTTPError):
+        client.fetch(OddsRequest())
+    assert mock_get.call_count == 1
+
+
+def test_fetch_times_out_stalled_requests(the_odds_file_path):
+    faults = FaultConfig(latency=1.0)
+    with FakeOddsServer({"americanfootball_nfl": the_odds_file_path}, faults=faults) as server:
+        with pytest.raises(requests.Timeout):
+            get_the_odds_json(api_key="key", base_url=server.url, timeout=0.1)
+        client = OddsClient(
+            api_key="key", base_url=server.url, max_attempts=2, max_wait=0, timeout=0.1
+        )
+        with client, pytest.raises(requests.Timeout):
+            client.fetch(OddsRequest())
+        assert server.faults.calls["americanfootball_nfl/odds"] == 3
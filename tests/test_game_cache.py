@@ -0,0 +1,94 @@
+import json
+import os
+
+import numpy as np
+
+from nfl_confidence.compact import compact_games
+from nfl_confidence.game_cache import ParsedGameCache, parse_games
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.weights import build_table
+
+
+def test_parse_bytes_hits_skip_parsing(tmp_path, mocker, the_odds_file_path):
+    with open(the_odds_file_path, "rb") as f:
+        raw = f.read()
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    games = cache.parse_bytes(raw)
+    assert games == compact_games(parse_the_odds_json(json.loads(raw)))
+
+    parse = mocker.patch("nfl_confidence.game_cache.parse_the_odds_json")
+    assert ParsedGameCache(cache_dir=str(tmp_path)).parse_bytes(raw) == games
+    parse.assert_not_called()
+
+    # The odds format is part of the key
+    assert cache.key(raw, "american") != cache.key(raw, "decimal")
+    assert cache.key(raw, "american") != cache.key(raw + b" ", "american")
+
+
+def test_parse_games_matches_uncached(tmp_path, the_odds_file_path, the_odds_resp_json):
+    with open(the_odds_file_path, "rb") as f:
+        raw = f.read()
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    expected = parse_games(raw)
+    assert expected == compact_games(parse_the_odds_json(the_odds_resp_json))
+    assert parse_games(raw, cache=cache) == expected
+    assert parse_games(raw, cache=cache) == expected
+    table = build_table(expected)
+    np.testing.assert_allclose(
+        table.home_team_win_prob,
+        OddsTable.from_games(parse_the_odds_json(the_odds_resp_json)).home_team_win_prob,
+    )
+
+
+def test_lru_eviction(tmp_path, the_odds_resp_json):
+    games = compact_games(parse_the_odds_json(the_odds_resp_json))
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    cache.put("a", games)
+    entry_size = cache.size()
+    cache.max_bytes = int(2.5 * entry_size)
+    cache.put("b", games)
+    os.utime(cache._path("a"), (1, 1))
+    os.utime(cache._path("b"), (2, 2))
+
+    # Reading a makes b the least recently used entry
+    assert cache.get("a") == games
+    cache.put("c", games)
+    assert cache.get("b") is None
+    assert cache.get("a") == games and cache.get("c") == games
+    assert cache.size() <= cache.max_bytes
+
+    # Entries bigger than the whole cache are not stored
+    cache.max_bytes = entry_size // 2
+    cache.put("d", games)
+    assert cache.get("d") is None
+
+
+def test_invalidated_by_schema_change(tmp_path, the_odds_resp_json):
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    cache.put("a", compact_games(parse_the_odds_json(the_odds_resp_json)))
+    assert ParsedGameCache(cache_dir=str(tmp_path)).get("a") is not None
+
+    with open(tmp_path / "VERSION", "w") as f:
+        f.write("stale")
+    reopened = ParsedGameCache(cache_dir=str(tmp_path))
+    assert reopened.get("a") is None
+    assert reopened.size() == 0
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    # Garbage, a class from a module which no longer exists and an unsupported protocol
+    for data in [b"not a pickle", b"cnfl_confidence_removed\nGame\n.", b"\x80\xff."]:
+        with open(cache._path("a"), "wb") as f:
+            f.write(data)
+        assert cache.get("a") is None
+        assert not os.path.exists(cache._path("a"))
+
+
+def test_file_key_matches_key_of_bytes(tmp_path, mocker, the_odds_file_path):
+    mocker.patch("nfl_confidence.game_cache.HASH_CHUNK_SIZE", 1000)
+    cache = ParsedGameCache(cache_dir=str(tmp_path))
+    with open(the_odds_file_path, "rb") as f:
+        raw = f.read()
+    assert len(raw) > 1000
+    assert cache.file_key(the_odds_file_path, "closing_lines") == cache.key(raw, "closing_lines")
@@ -0,0 +1,102 @@
+import json
+import pstats
+
+import pytest
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from nfl_confidence import metrics
+from nfl_confidence.cli import main
+from nfl_confidence.fakes import FakeWorksheet
+from nfl_confidence.metrics import METRICS, before_sleep_count, span, timed
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.sheets import SheetWriter, TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+def test_spans_and_counters():
+    @timed("work")
+    def work():
+        return 1
+
+    assert work() == 1
+    work()
+    with span("block"):
+        pass
+    metrics.increment("things", 2)
+    metrics.increment("things")
+    snapshot = METRICS.to_dict()
+    assert snapshot["spans"]["work"]["count"] == 2
+    assert snapshot["spans"]["block"]["total_seconds"] >= 0
+    assert snapshot["counters"] == {"things": 3}
+
+
+def test_pipeline_stages_are_timed(the_odds_resp_json):
+    OddsTable.from_games(parse_the_odds_json(the_odds_resp_json))
+    writer = SheetWriter(ws=FakeWorksheet(title="Week 1"))
+    writer.update_cell(row=1, col=1, value="id")
+    writer.flush()
+    snapshot = METRICS.to_dict()
+    assert {"parse", "aggregate", "sheet_read", "sheet_write"} <= set(snapshot["spans"])
+    assert snapshot["counters"]["cells_written"] == 1
+
+
+def test_retries_and_sleeps_are_counted():
+    attempts = []
+
+    @retry(wait=wait_fixed(0), stop=stop_after_attempt(3), before_sleep=before_sleep_count())
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("rate limited")
+
+    flaky()
+
+    # A fake clock which advances while the rate limiter sleeps
+    now = [0.0]
+    bucket = TokenBucket(
+        rate_per_minute=60,
+        capacity=1,
+        clock=lambda: now[0],
+        sleep=lambda delay: now.__setitem__(0, now[0] + delay),
+    )
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(1.0)
+    counters = METRICS.to_dict()["counters"]
+    assert counters["retries"] == 2
+    assert counters["retry_sleep_seconds"] == 0
+    assert counters["rate_limit_sleep_seconds"] == pytest.approx(1.0)
+
+
+def test_exports(tmp_path):
+    METRICS.record("fetch", 0.5)
+    METRICS.record("fetch", 1.5)
+    METRICS.increment("fetch_cache_hits")
+    json_path, prom_path = tmp_path / "metrics.json", tmp_path / "metrics.prom"
+    metrics.export(json_path=str(json_path), textfile_path=str(prom_path))
+    with open(json_path) as f:
+        assert json.load(f)["spans"]["fetch"] == {
+            "count": 2,
+            "total_seconds": 2.0,
+            "max_seconds": 1.5,
+        }
+    text = prom_path.read_text()
+    assert 'nfl_confidence_span_seconds_total{span="fetch"} 2.0' in text
+    assert 'nfl_confidence_span_calls_total{span="fetch"} 2' in text
+    assert "# TYPE nfl_confidence_fetch_cache_hits_total counter" in text
+    assert "nfl_confidence_fetch_cache_hits_total 1" in text
+
+
+def test_cli_profiles_and_exports(tmp_path, mocker):
+    import_module = mocker.patch("nfl_confidence.cli.importlib.import_module")
+    import_module.return_value.run.side_effect = lambda args: METRICS.record("fetch", 0.1)
+    profile_path, json_path = tmp_path / "run.prof", tmp_path / "metrics.json"
+    main(["plot", "--profile", str(profile_path), "--metrics_json", str(json_path)])
+    assert pstats.Stats(str(profile_path)).total_calls > 0
+    with open(json_path) as f:
+        assert json.load(f)["spans"]["fetch"]["count"] == 1
@@ -1,9 +1,15 @@
+import copy
+import json
 from datetime import datetime
 from math import isclose
 
+import numpy as np
+
 from nfl_confidence.odds import (
+    OddsTable,
     convert_team_name,
     get_this_weeks_games,
+    parse_the_odds_bytes,
     parse_the_odds_json,
 )
 
@@ -91,3 +97,107 @@ def test_game_id(the_odds_resp_json):
     assert games[0].home_team.value == "new-orleans-saints"
     assert games[0].away_team.value == "jacksonville-jaguars"
     assert games[0].id == "16143d5b3cfe34d32198da53771e14ee"
+
+
+def test_odds_table_matches_game_odds(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    table = OddsTable.from_games(games=games)
+    assert len(table) == 29
+    assert table.prices.shape == (29, len(table.bookmakers), 2)
+    assert np.allclose(table.home_team_win_prob, [game.home_team_win_prob for game in games])
+    assert np.allclose(table.win_probability, [game.win_probability for game in games])
+    assert np.allclose(
+        table.win_probability_variance, [game.win_probability_variance for game in games]
+    )
+    assert np.allclose(table.oddsmaker_agreement, [game.oddsmaker_agreement for game in games])
+    assert list(table.predicted_winner) == [game.predicted_winner for game in games]
+
+
+def test_odds_table_missing_bookmakers_are_nan(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    table = OddsTable.from_games(games=games)
+    assert list(table.bookmaker_count) == [len(game.bookmakers) for game in games]
+    assert np.isnan(table.prices).sum() == 2 * (
+        table.prices.shape[1] * 29 - sum(table.bookmaker_count)
+    )
+
+
+def test_derived_fields_are_memoized(the_odds_resp_json, mocker):
+    game = parse_the_odds_json(the_odds_resp_json)[0]
+    assert isclose(game.win_probability, 0.52400, abs_tol=0.00001)
+    spy = mocker.patch("nfl_confidence.odds.convert_odds_to_probs")
+    assert isclose(game.win_probability, 0.52400, abs_tol=0.00001)
+    assert isclose(game.win_probability_variance, 0.000009247330530489563)
+    spy.assert_not_called()
+
+
+def test_memoized_fields_are_serialized(the_odds_resp_json):
+    game = parse_the_odds_json(the_odds_resp_json)[0]
+    dumped = game.model_dump()
+    assert dumped["win_probability"] == game.win_probability
+    assert dumped["bookmakers"][0]["predicted_winner"] == game.bookmakers[0].predicted_winner
+
+
+def test_derived_fields_invalidated_on_mutation(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    game = games[0]
+    assert game.predicted_winner.value == "new-orleans-saints"
+
+    # Swap the prices of every bookmaker in place
+    for bookmaker in game.bookmakers:
+        outcomes = bookmaker.markets[0].outcomes
+        outcomes[0].price, outcomes[1].price = outcomes[1].price, outcomes[0].price
+    assert game.predicted_winner.value == "jacksonville-jaguars"
+
+    # Copies memoize separately, and reassigned or appended bookmakers are picked up
+    copied = game.model_copy(deep=True)
+    copied.bookmakers = parse_the_odds_json(the_odds_resp_json)[0].bookmakers
+    assert copied.predicted_winner.value == "new-orleans-saints"
+    assert game.predicted_winner.value == "jacksonville-jaguars"
+    n_agree = game.oddsmaker_agreement * len(game.bookmakers)
+    game.bookmakers.append(copied.bookmakers[0])
+    assert game.oddsmaker_agreement == n_agree / len(game.bookmakers)
+
+
+def test_memoized_fields_are_not_compared(the_odds_resp_json):
+    game, same = (
+        parse_the_odds_json(the_odds_resp_json)[0],
+        parse_the_odds_json(the_odds_resp_json)[0],
+    )
+    assert game.win_probability_variance > 0
+    assert game == same and game.bookmakers == same.bookmakers
+    game.clear_memoized()
+    assert game == same
+
+
+def test_parse_odds_bytes_matches_parse_odds(the_odds_file_path, the_odds_resp_json):
+    with open(the_odds_file_path, "rb") as f:
+        raw = f.read()
+    games = parse_the_odds_bytes(raw)
+    assert [game.model_dump() for game in games] == [
+        game.model_dump() for game in parse_the_odds_json(the_odds_resp_json)
+    ]
+
+
+def test_parse_odds_bytes_decimal_odds(the_odds_resp_json):
+    decimal_json = copy.deepcopy(the_odds_resp_json)
+    for game in decimal_json:
+        for bookmaker in game["bookmakers"]:
+            for outcome, price in zip(bookmaker["markets"][0]["outcomes"], [1.91, 1.95]):
+                outcome["price"] = price
+    expected = parse_the_odds_json(decimal_json, odds_format="decimal")
+    games = parse_the_odds_bytes(json.dumps(decimal_json), odds_format="decimal")
+    assert [game.model_dump() for game in games] == [game.model_dump() for game in expected]
+    assert isclose(games[0].bookmakers[0].markets[0].outcomes[0].price, -109.89, abs_tol=0.01)
+
+
+def test_parse_odds_bytes_trusted_archive(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    archive = json.dumps([game.model_dump(mode="json") for game in games]).encode()
+    trusted_games = parse_the_odds_bytes(archive, trusted=True)
+    assert len(trusted_games) == 29
+    assert trusted_games[0].home_team.value == "new-orleans-saints"
+    assert trusted_games[0].commence_time == games[0].commence_time
+    assert [game.win_probability for game in trusted_games] == [
+        game.win_probability for game in games
+    ]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from nfl_confidence.optimize import (
+    Opponent,
+    PickScenarios,
+    load_standings,
+    neighbors,
+    opponents_from_standings,
+    optimize_picks,
+)
+from nfl_confidence.simulate import greedy_assignment
+
+HOME_WIN_PROBABILITY = np.array([0.8, 0.3, 0.65, 0.55, 0.9, 0.4, 0.7, 0.6])
+
+
+def test_load_standings(tmp_path):
+    csv_path = tmp_path / "league_results_2023.csv"
+    csv_path.write_text("Luke\tAnn\tBob\n100\t90\t95\n80\t85\t70\n")
+    standings = load_standings(str(csv_path))
+    assert standings == {"Luke": 180, "Ann": 175, "Bob": 165}
+    points, opponents = opponents_from_standings(standings, me="Luke", noise=0.3)
+    assert points == 180
+    assert [(o.name, o.points, o.noise) for o in opponents] == [
+        ("Ann", 175, 0.3),
+        ("Bob", 165, 0.3),
+    ]
+    with pytest.raises(ValueError):
+        opponents_from_standings(standings, me="Zed")
+
+
+def test_neighbors_keep_confidence_values():
+    picks = np.array([True, False, True])
+    confidence = np.array([14, 15, 16])
+    candidate_picks, candidate_confidence = neighbors(picks, confidence)
+    assert len(candidate_picks) == 3 + 3
+    assert all(sorted(row) == [14, 15, 16] for row in candidate_confidence)
+    assert (candidate_picks != picks).sum(axis=1).tolist() == [0, 0, 0, 1, 1, 1]
+
+
+def test_scenarios_without_opponents_always_win():
+    scenarios = PickScenarios(HOME_WIN_PROBABILITY, opponents=[], n_sims=100)
+    picks = np.ones((1, len(HOME_WIN_PROBABILITY)), dtype=bool)
+    confidence = np.arange(9, 17)[None]
+    assert scenarios.win_probability(picks, confidence)[0] == 1.0
+
+
+def test_scenarios_score_points_like_the_league():
+    opponents = [Opponent(name="Ann", noise=0.0)]
+    scenarios = PickScenarios(HOME_WIN_PROBABILITY, opponents=opponents, n_sims=5000)
+    picks_home, confidence = greedy_assignment(HOME_WIN_PROBABILITY)
+    picks_favorite = (picks_home == scenarios.favorite_is_home)[None]
+    # A noiseless rival makes the same picks, so every week is a shared first place
+    assert scenarios.win_probability(picks_favorite, confidence[None])[0] == pytest.approx(0.5)
+    assert scenarios.win_probability(picks_favorite, confidence[None], points=1)[0] == 1.0
+
+
+def test_optimizer_takes_risks_when_behind():
+    ahead = [Opponent(name="Ann", points=20, noise=0.3), Opponent(name="Bob", noise=0.3)]
+    kwargs = dict(n_sims=5000, restarts=2, max_workers=1, max_confidence=8)
+    picks = optimize_picks(HOME_WIN_PROBABILITY, ahead, **kwargs)
+    assert sorted(picks.confidence) == list(range(1, 9))
+    assert len(picks.picks_home) == len(HOME_WIN_PROBABILITY)
+    assert picks.win_probability >= picks.greedy_win_probability
+    # Chalk can rarely make up 20 points on a rival who also picks chalk, so pick upsets
+    upsets = np.array(picks.picks_home) != (HOME_WIN_PROBABILITY >= 0.5)
+    assert upsets.any()
+
+
+def test_optimizer_is_reproducible_across_workers():
+    opponents = [Opponent(name=name) for name in ("Ann", "Bob", "Cat")]
+    kwargs = dict(n_sims=2000, restarts=3, seed=4)
+    inline = optimize_picks(HOME_WIN_PROBABILITY, opponents, max_workers=1, **kwargs)
+    parallel = optimize_picks(HOME_WIN_PROBABILITY, opponents, max_workers=2, **kwargs)
+    assert inline == parallel
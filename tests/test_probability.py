@@ -0,0 +1,90 @@
+import copy
+
+import numpy as np
+import pytest
+
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.probability import (
+    DevigMethod,
+    american_to_implied,
+    decimal_to_american,
+    decimal_to_implied,
+    devig,
+    remove_vig,
+)
+
+# Two bookmakers' (home, away) American odds for two games, one bookmaker missing a game
+PRICES = np.array([[[-150, 130], [-160, 140]], [[250, -300], [np.nan, np.nan]]])
+
+
+def test_odds_conversions():
+    assert np.allclose(american_to_implied([-150, 150, 100]), [0.6, 0.4, 0.5])
+    assert np.allclose(decimal_to_implied([2.5, 1.25]), [0.4, 0.8])
+    assert np.allclose(decimal_to_american([2.5, 1.5, 2.0]), [150, -200, 100])
+    decimal = np.array([1.3, 1.91, 2.0, 3.75])
+    assert np.allclose(american_to_implied(decimal_to_american(decimal)), 1 / decimal)
+
+
+@pytest.mark.parametrize("method", list(DevigMethod))
+def test_remove_vig_sums_to_one(method):
+    fair = devig(PRICES, method=method)
+    assert fair.shape == PRICES.shape
+    assert np.allclose(fair[:1].sum(axis=-1), 1)
+    assert np.allclose(fair[1, 0].sum(), 1)
+    assert np.isnan(fair[1, 1]).all()
+
+    # Markets without a margin are left alone
+    implied = np.array([0.3, 0.7])
+    assert np.allclose(remove_vig(implied, method=method), implied)
+
+
+def test_remove_vig_methods():
+    implied = american_to_implied(np.array([-300, 250]))
+    proportional = remove_vig(implied, method="proportional")
+    assert np.allclose(proportional, implied / implied.sum())
+    additive = remove_vig(implied, method="additive")
+    assert np.allclose(additive, implied - (implied.sum() - 1) / 2)
+
+    # Power and Shin shift more of the margin onto the longshot than proportional does
+    for method in ["power", "shin"]:
+        fair = remove_vig(implied, method=method)
+        assert fair[0] > proportional[0]
+        assert fair[1] < proportional[1]
+    power = remove_vig(implied, method="power")
+    k = np.log(power[0]) / np.log(implied[0])
+    assert np.allclose(power, implied**k)
+
+
+def test_remove_vig_axis():
+    fair = devig(np.moveaxis(PRICES, -1, 0), method="shin", axis=0)
+    assert np.allclose(np.moveaxis(fair, 0, -1), devig(PRICES, method="shin"), equal_nan=True)
+
+
+def test_odds_table_decimal_and_devig(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_json=the_odds_resp_json)
+    table = OddsTable.from_games(games=games)
+
+    # Decimal responses parse to the same American prices
+    decimal_json = copy.deepcopy(the_odds_resp_json)
+    for game in decimal_json:
+        for bookmaker in game["bookmakers"]:
+            for outcome in bookmaker["markets"][0]["outcomes"]:
+                price = outcome["price"]
+                outcome["price"] = 1 + (price / 100 if price > 0 else 100 / -price)
+    decimal_games = parse_the_odds_json(the_odds_json=decimal_json, odds_format="decimal")
+    decimal_table = OddsTable.from_games(games=decimal_games)
+    assert np.allclose(decimal_table.win_probability, table.win_probability)
+
+    # The de-vig method only changes the fair probabilities
+    shin_table = OddsTable.from_games(games=games, devig_method="shin")
+    assert np.allclose(shin_table.raw_probs, table.raw_probs, equal_nan=True)
+    assert list(shin_table.predicted_winner) == list(table.predicted_winner)
+    assert np.all(shin_table.win_probability >= table.win_probability - 1e-12)
+
+
+def test_shin_closed_form_matches_solver():
+    # Three outcome markets go through the bisection solver; compare against it by adding a
+    # zero-probability outcome, which leaves Shin's model unchanged
+    implied = american_to_implied(np.array([[-300, 250], [-120, 100], [150, -170]]))
+    padded = np.concatenate([implied, np.zeros((3, 1))], axis=-1)
+    assert np.allclose(remove_vig(padded, method="shin")[:, :2], remove_vig(implied, method="shin"))
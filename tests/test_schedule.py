@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from nfl_confidence.odds import (
+    filter_games_by_date,
+    get_this_weeks_games,
+    parse_the_odds_json,
+)
+from nfl_confidence.schedule import GameIndex, nfl_week_start
+
+
+def test_nfl_week_start(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    week_starts = {nfl_week_start(game.commence_time) for game in games}
+    assert sorted(str(week_start) for week_start in week_starts) == ["2023-10-17", "2023-10-24"]
+
+
+def test_between_matches_linear_filter(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    shuffled = games[:]
+    random.Random(0).shuffle(shuffled)
+    index = GameIndex(shuffled)
+    assert index.games == sorted(games, key=lambda x: (x.commence_time, x.id))
+    assert index.between() == index.games
+
+    # Bounds at, between and beyond kickoffs, which are exclusive at both ends
+    kickoffs = sorted({game.commence_time for game in games})
+    bounds = kickoffs + [kickoffs[0] - timedelta(days=1), kickoffs[3] + timedelta(minutes=1)]
+    for after in bounds:
+        for before in bounds:
+            expected = filter_games_by_date(games=index.games, after=after, before=before)
+            assert index.between(after=after, before=before) == expected
+    assert index.between(after=kickoffs[-1]) == []
+    assert len(index.between(before=kickoffs[1])) == sum(
+        game.commence_time == kickoffs[0] for game in games
+    )
+
+
+def test_weeks_group_in_kickoff_order(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    weeks = GameIndex(games).weeks()
+    assert [str(week_start) for week_start in weeks] == ["2023-10-17", "2023-10-24"]
+    assert sum(len(week) for week in weeks.values()) == len(games)
+    for week_start, week_games in weeks.items():
+        assert all(nfl_week_start(game.commence_time) == week_start for game in week_games)
+    assert GameIndex([]).weeks() == {}
+
+
+def test_this_week_uses_clock(the_odds_resp_json):
+    games = parse_the_odds_json(the_odds_resp_json)
+    for now in ["2023-10-17 20:06", "2023-10-18 20:06", "2023-10-20 20:06", "2023-10-23 20:06"]:
+        now = datetime.fromisoformat(now).replace(tzinfo=timezone.utc)
+        index = GameIndex(games, clock=lambda: now)
+        expected = get_this_weeks_games(games=games, now=now)
+        assert index.this_week() == sorted(expected, key=lambda x: (x.commence_time, x.id))
+        assert index.this_week(now=now) == index.this_week()
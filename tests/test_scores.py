@@ -0,0 +1,47 @@
+import json
+
+from nfl_confidence.scores import load_results, parse_scores_json
+
+SCORES_JSON = [
+    {
+        "id": "game_1",
+        "sport_key": "americanfootball_nfl",
+        "commence_time": "2023-10-20T00:16:00Z",
+        "completed": True,
+        "home_team": "New Orleans Saints",
+        "away_team": "Jacksonville Jaguars",
+        "scores": [
+            {"name": "New Orleans Saints", "score": "24"},
+            {"name": "Jacksonville Jaguars", "score": "31"},
+        ],
+        "last_update": "2023-10-20T03:30:00Z",
+    },
+    {
+        "id": "game_2",
+        "sport_key": "americanfootball_nfl",
+        "commence_time": "2023-10-22T17:00:00Z",
+        "completed": False,
+        "home_team": "Chicago Bears",
+        "away_team": "Las Vegas Raiders",
+        "scores": None,
+        "last_update": None,
+    },
+]
+
+
+def test_parse_scores_json():
+    finished, upcoming = parse_scores_json(SCORES_JSON)
+    assert finished.home_score == 24
+    assert finished.away_score == 31
+    assert finished.winner.value == "jacksonville-jaguars"
+    assert upcoming.winner is None
+
+
+def test_load_results_keeps_latest_entry(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    earlier = [dict(SCORES_JSON[0], completed=False)]
+    with open(path, "w") as f:
+        f.write(json.dumps(earlier) + "\n" + json.dumps(SCORES_JSON) + "\n")
+    results = load_results(str(path))
+    assert set(results) == {"game_1", "game_2"}
+    assert results["game_1"].completed
@@ -19,3 +19,11 @@ def test_access_api_key_value():
         THE_ODDS_API_KEY="test123",
     )
     assert settings.THE_ODDS_API_KEY.get_secret_value() == "test123"
+
+
+def test_caches_are_opt_in(monkeypatch):
+    monkeypatch.delenv("THE_ODDS_CACHE_DIR", raising=False)
+    monkeypatch.delenv("THE_ODDS_PARSED_CACHE_DIR", raising=False)
+    settings = Settings(_env_file=None, THE_ODDS_API_KEY="test123", GOOGLE_SHEETS_SECRET_PATH=None)
+    assert settings.THE_ODDS_CACHE_DIR is None
+    assert settings.THE_ODDS_PARSED_CACHE_DIR is None
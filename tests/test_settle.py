@@ -0,0 +1,216 @@
+import copy
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from nfl_confidence.cli import main
+from nfl_confidence.fakes import FakeClient, FakeOddsServer
+from nfl_confidence.scores import get_scores_json, read_scores_json
+from nfl_confidence.settle import PickSet, Settler, grade_picks, push_results, settle
+from nfl_confidence.sheets import SheetReader, SheetWriter, typed_frame
+
+PICK_SETS = [
+    PickSet(),
+    PickSet(
+        winner_column="espn_pick",
+        confidence_column="espn_rank",
+        correct_column="espn_correct",
+        points_column="espn_points",
+    ),
+]
+
+
+def scores_game(game_id, home, away, home_score=None, away_score=None):
+    completed = home_score is not None
+    return {
+        "id": game_id,
+        "sport_key": "americanfootball_nfl",
+        "commence_time": "2023-10-22T17:00:00Z",
+        "completed": completed,
+        "home_team": home,
+        "away_team": away,
+        "scores": [
+            {"name": home, "score": str(home_score)},
+            {"name": away, "score": str(away_score)},
+        ]
+        if completed
+        else None,
+        "last_update": None,
+    }
+
+
+@pytest.fixture
+def week():
+    sh = FakeClient().create("Confidence")
+    ws = sh.add_worksheet(title="Week 7")
+    ws.update(
+        [
+            ["id", "predicted_winner", "confidence_rank", "espn_pick", "espn_rank"],
+            ["game_1", "jacksonville-jaguars", 3, "new-orleans-saints", 1],
+            ["game_2", "chicago-bears", 2, "chicago-bears", 3],
+            ["game_3", "buffalo-bills", 1, "new-england-patriots", 2],
+        ]
+    )
+    sh.faults.calls.clear()
+    return sh
+
+
+def test_grade_picks():
+    picks = np.array([["a", "b", "c"], ["x", "b", ""]])
+    confidence = np.array([[3, 2, 1], [1, 3, 2]])
+    correct, points = grade_picks(picks, confidence, winners=np.array(["a", "b", ""]))
+    assert correct.tolist() == [[True, True, False], [False, True, False]]
+    assert points.tolist() == [[3, 2, 0], [0, 3, 0]]
+
+
+def test_settler_returns_newly_settled_games():
+    snapshot = [
+        scores_game("game_1", "New Orleans Saints", "Jacksonville Jaguars", 24, 31),
+        scores_game("game_2", "Chicago Bears", "Las Vegas Raiders"),
+    ]
+    settler = Settler()
+    assert list(settler.update(snapshot)) == ["game_1"]
+    assert settler.update(copy.deepcopy(snapshot)) == {}
+
+    # A corrected final score settles the game again
+    snapshot[0]["scores"][0]["score"] = "34"
+    assert settler.update(snapshot)["game_1"].winner.value == "new-orleans-saints"
+
+
+def test_push_results_writes_changed_cells_once_per_game(week):
+    reader = SheetReader(week)
+    values = reader.values("Week 7")
+    writer = SheetWriter(ws=reader.worksheet("Week 7"), limiter=reader.limiter)
+    settler = Settler()
+    first = [scores_game("game_1", "New Orleans Saints", "Jacksonville Jaguars", 24, 31)]
+
+    # Seven new header cells, then three result and four grade cells for the finished game
+    assert push_results(writer, settler.update(first), PICK_SETS, current_values=values) == 14
+    assert week.faults.calls["batch_update"] == 1
+    assert values == week.worksheet("Week 7").get_all_values()
+
+    # Regrading the same game writes nothing, and later games write only their own rows
+    assert push_results(writer, settler.results, PICK_SETS, current_values=values) == 0
+    second = first + [
+        scores_game("game_2", "Chicago Bears", "Las Vegas Raiders", 17, 17),
+        scores_game("game_3", "Buffalo Bills", "New England Patriots", 20, 6),
+    ]
+    # The tie's winner cell stays blank, so it is skipped
+    assert push_results(writer, settler.update(second), PICK_SETS, current_values=values) == 13
+    assert week.faults.calls["batch_update"] == 2
+
+    df = typed_frame(week.worksheet("Week 7").get_all_values())
+    assert df.winner.tolist() == ["jacksonville-jaguars", "", "buffalo-bills"]
+    assert df.was_correct.tolist() == [True, False, True]
+    assert df.points.tolist() == [3, 0, 1]
+    assert df.espn_correct.tolist() == [False, False, False]
+    assert df.espn_points.sum() == 0
+    assert df.home_score.tolist() == [24, 17, 20]
+
+
+def test_push_results_requires_pick_columns(week):
+    reader = SheetReader(week)
+    writer = SheetWriter(ws=reader.worksheet("Week 7"))
+    with pytest.raises(ValueError, match="missing_pick"):
+        push_results(
+            writer,
+            {},
+            [PickSet(winner_column="missing_pick")],
+            current_values=reader.values("Week 7"),
+        )
+
+
+def test_settle_polls_until_the_week_is_settled(week, mocker):
+    reader = SheetReader(week)
+    values = reader.values("Week 7")
+    writer = SheetWriter(ws=reader.worksheet("Week 7"), limiter=reader.limiter)
+    snapshot = [
+        scores_game("game_1", "New Orleans Saints", "Jacksonville Jaguars", 24, 31),
+        scores_game("other_week", "Chicago Bears", "Las Vegas Raiders", 10, 3),
+        scores_game("game_3", "Buffalo Bills", "New England Patriots", 20, 6),
+    ]
+    with FakeOddsServer({"americanfootball_nfl/scores": snapshot}) as server:
+        fetch = mocker.Mock(side_effect=lambda: get_scores_json(api_key="key", base_url=server.url))
+        on_settled = mocker.Mock(
+            side_effect=lambda results: push_results(writer, results, PICK_SETS, values)
+        )
+        sleep = mocker.Mock()
+        n_settled = settle(
+            fetch=fetch,
+            settler=Settler(),
+            on_settled=on_settled,
+            game_ids=["game_1", "game_3"],
+            sleep=sleep,
+        )
+        assert server.requests[0]["daysFrom"] == ["3"]
+
+    # Both of the week's games settle on the first poll, so polling stops there
+    assert n_settled == 2
+    assert fetch.call_count == 1
+    sleep.assert_not_called()
+    [[results]] = [call.args for call in on_settled.call_args_list]
+    assert set(results) == {"game_1", "game_3"}
+    assert week.faults.calls["batch_update"] == 1
+
+
+def test_settle_stops_after_idle_polls(mocker):
+    snapshot = [scores_game("game_1", "Chicago Bears", "Las Vegas Raiders")]
+    fetch = mocker.Mock(return_value=snapshot)
+    sleep = mocker.Mock()
+    n_settled = settle(
+        fetch=fetch,
+        settler=Settler(),
+        on_settled=mocker.Mock(),
+        game_ids=["game_1", "missing"],
+        max_idle_polls=3,
+        sleep=sleep,
+    )
+    assert n_settled == 0
+    assert fetch.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_settle_gives_up_on_games_out_of_the_window(mocker):
+    snapshot = [
+        scores_game("thursday", "Chicago Bears", "Las Vegas Raiders"),
+        scores_game("game_3", "Buffalo Bills", "New England Patriots", 20, 6),
+    ]
+    now = [datetime(2023, 10, 23, tzinfo=timezone.utc)]
+    fetch = mocker.Mock(return_value=snapshot)
+
+    def sleep(seconds):
+        now[0] += timedelta(seconds=seconds)
+        if now[0] > datetime(2023, 10, 25, 17, tzinfo=timezone.utc):
+            snapshot.pop(0)  # The scores endpoint drops games older than daysFrom
+
+    n_settled = settle(
+        fetch=fetch,
+        settler=Settler(),
+        on_settled=mocker.Mock(),
+        game_ids=["thursday", "game_3"],
+        interval=3600,
+        expire_after=timedelta(days=3),
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+    assert n_settled == 1
+    assert now[0] == datetime(2023, 10, 25, 18, tzinfo=timezone.utc)
+    assert fetch.call_count == 67
+
+
+def test_settle_command_reads_a_scores_file_once(week, tmp_path, mocker, monkeypatch):
+    monkeypatch.setenv("THE_ODDS_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_SHEETS_SECRET_PATH", "secret.json")
+    client = mocker.Mock(open=mocker.Mock(return_value=week))
+    mocker.patch("nfl_confidence.commands.settle.gs.service_account", return_value=client)
+    read = mocker.patch("nfl_confidence.commands.settle.read_scores_json", wraps=read_scores_json)
+    scores_path = tmp_path / "scores.json"
+    with open(scores_path, "w") as f:
+        json.dump([scores_game("game_1", "New Orleans Saints", "Jacksonville Jaguars", 24, 31)], f)
+
+    main(["settle", "--week", "7", "--sheet", "Confidence", "--scores_path", str(scores_path)])
+    read.assert_called_once()
+    df = typed_frame(week.worksheet("Week 7").get_all_values())
+    assert df.points.tolist()[0] == 3
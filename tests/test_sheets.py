@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from gspread.exceptions import WorksheetNotFound
+
+from nfl_confidence.fakes import FakeClient
+from nfl_confidence.sheets import (
+    SheetReader,
+    SheetWriter,
+    TokenBucket,
+    push_rows,
+    typed_frame,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_limits_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 1.0
+    clock.now += 10
+    assert bucket.acquire() == 0.0
+    assert clock.now == 11.0
+
+
+def test_sheet_writer_batches_changed_cells(mocker):
+    ws = mocker.MagicMock()
+    ws.title = "Week 1"
+    current_values = [["Game ID", "Predicted Winner", "Confidence Rank"], ["a", "x", "16"], ["b"]]
+    writer = SheetWriter(ws=ws)
+    writer.update_cell(row=2, col=2, value="x")
+    writer.update_cell(row=2, col=3, value=15)
+    writer.update_cell(row=3, col=2, value="y")
+    writer.update_cell(row=3, col=3, value=16)
+    assert writer.flush(current_values=current_values) == 3
+    ws.batch_update.assert_called_once()
+    data = ws.batch_update.call_args.args[0]
+    assert data == [
+        {"range": "C2", "values": [[15]]},
+        {"range": "B3", "values": [["y"]]},
+        {"range": "C3", "values": [[16]]},
+    ]
+    ws.get_all_values.assert_not_called()
+
+
+def test_sheet_writer_skips_unchanged(mocker):
+    ws = mocker.MagicMock()
+    ws.get_all_values.return_value = [["Game ID", "Confidence Rank"], ["a", "16"]]
+    writer = SheetWriter(ws=ws)
+    writer.update_cell(row=2, col=2, value=16)
+    assert writer.flush() == 0
+    ws.get_all_values.assert_called_once()
+    ws.batch_update.assert_not_called()
+
+
+def make_season(n_weeks):
+    sh = FakeClient().create("Confidence")
+    for week in range(1, n_weeks + 1):
+        ws = sh.add_worksheet(title=f"Week {week}")
+        ws.update(
+            [
+                ["id", "espn", "538", "was_correct", "confidence_rank", "note"],
+                [f"{week}a", 0.6, 0.7, "TRUE", 16, "x"],
+                [f"{week}b", 0.55, "", "FALSE", 15],
+            ]
+        )
+    sh.faults.calls.clear()
+    return sh
+
+
+def test_sheet_writer_diffs_against_unformatted_values():
+    sh = FakeClient().create("Confidence")
+    ws = sh.add_worksheet(title="Week 1")
+    ws.update([["confidence_prob", "was_correct", "confidence_rank"], [0.6234567, True, 16]])
+    ws.display_decimals = 2
+    assert ws.get_all_values()[1] == ["0.62", "TRUE", "16"]
+
+    # Values shown rounded, numpy scalars and whole floats all match what the sheet holds
+    writer = SheetWriter(ws=ws)
+    writer.update_cell(row=2, col=1, value=np.float64(0.6234567))
+    writer.update_cell(row=2, col=2, value=np.bool_(True))
+    writer.update_cell(row=2, col=3, value=16.0)
+    assert writer.flush() == 0
+    assert SheetReader(sh).values("Week 1")[1] == ["0.6234567", "TRUE", "16"]
+
+    writer.update_cell(row=2, col=2, value=np.bool_(False))
+    assert writer.flush() == 1
+    assert ws.cells[(2, 2)] == "FALSE"
+
+
+def test_sheet_reader_reads_every_week_in_one_call():
+    sh = make_season(n_weeks=18)
+    reader = SheetReader(sh, limiter=TokenBucket(rate_per_minute=float("inf")))
+    weeks = [f"Week {week}" for week in range(1, 19)]
+    frames = reader.frames(weeks)
+    assert list(frames) == weeks
+    assert sh.faults.calls == {"worksheets": 1, "values_batch_get": 1}
+
+    # Cached for the rest of the run
+    assert reader.frame("Week 3").id.tolist() == ["3a", "3b"]
+    reader.frames(weeks[:5])
+    assert sum(sh.faults.calls.values()) == 2
+    reader.invalidate("Week 3")
+    reader.frame("Week 3")
+    assert sh.faults.calls["values_batch_get"] == 2
+
+    with pytest.raises(WorksheetNotFound):
+        reader.values("Week 19")
+
+
+def test_typed_frame():
+    df = typed_frame(
+        [
+            ["id", "espn", "538", "was_correct", "confidence_rank", "note"],
+            ["a", "0.6", "0.7", "TRUE", "16", "x"],
+            ["b", "0.55", "", "FALSE", "15"],
+        ]
+    )
+    assert df.id.tolist() == ["a", "b"]
+    assert df.espn.dtype == float and df.confidence_rank.dtype == np.int64
+    assert df["538"].iloc[0] == 0.7 and np.isnan(df["538"].iloc[1])
+    assert df.was_correct.dtype == bool and df.was_correct.tolist() == [True, False]
+    assert df.note.tolist() == ["x", ""]
+    assert typed_frame([]).empty
+    assert typed_frame([["id", "confidence_rank"]]).columns.tolist() == ["id", "confidence_rank"]
+
+
+def test_push_rows_reuses_reader_values():
+    sh = make_season(n_weeks=1)
+    reader = SheetReader(sh, limiter=TokenBucket(rate_per_minute=float("inf")))
+    ws = reader.add_worksheet(title="Week 2")
+    writer = SheetWriter(ws=ws, limiter=reader.limiter)
+    rows = {"a": ["a", "x", "y", "x", 0.01, 1.0, 0.6, 16]}
+    assert push_rows(writer, rows, current_values=reader.values("Week 2")) == 16
+    assert "get_all_values" not in sh.faults.calls
+    assert reader.titles() == ["Week 1", "Week 2"]
+    reader.invalidate()
+    assert reader.frame("Week 2").confidence_rank.tolist() == [16]
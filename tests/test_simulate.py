@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from nfl_confidence.odds import OddsTable, parse_the_odds_json
+from nfl_confidence.simulate import (
+    ScoreDistribution,
+    compare_assignments,
+    greedy_assignment,
+    iter_favorite_wins,
+    season_distribution,
+    simulate_assignments,
+)
+
+HOME_WIN_PROBABILITY = np.array([0.8, 0.3, 0.65, 0.5, 0.9, 0.45])
+
+
+def test_score_distribution_statistics():
+    dist = ScoreDistribution.from_points(np.array([0, 1, 1, 3]), max_points=4)
+    assert dist.n_sims == 4
+    assert list(dist.counts) == [1, 2, 0, 1, 0]
+    assert dist.mean == pytest.approx(1.25)
+    assert dist.var == pytest.approx(np.var([0, 1, 1, 3]))
+    assert dist.cdf(1) == pytest.approx(0.75)
+    assert dist.prob_at_least(3) == pytest.approx(0.25)
+    assert dist.quantile(0.5) == 1
+    assert dist.expected_shortfall(0.25) == pytest.approx(0.0)
+    assert dist.expected_shortfall(0.5) == pytest.approx(0.5)
+
+
+def test_outcomes_match_probabilities_and_ignore_chunk_size():
+    favorite_probability = np.array([0.55, 0.7, 0.9])
+    draws = np.concatenate(list(iter_favorite_wins(favorite_probability, 200_000, seed=1)))
+    assert draws.mean(axis=0) == pytest.approx(favorite_probability, abs=0.005)
+
+    for correlation in (0.0, 0.4):
+        whole = np.concatenate(
+            list(iter_favorite_wins(favorite_probability, 1000, seed=7, correlation=correlation))
+        )
+        chunked = np.concatenate(
+            list(
+                iter_favorite_wins(
+                    favorite_probability, 1000, seed=7, correlation=correlation, chunk_size=64
+                )
+            )
+        )
+        assert np.array_equal(whole, chunked)
+
+
+def test_correlation_keeps_marginals_and_widens_points():
+    picks_home, confidence = greedy_assignment(HOME_WIN_PROBABILITY, max_confidence=6)
+    assignments = {"greedy": (picks_home, confidence)}
+    independent = simulate_assignments(HOME_WIN_PROBABILITY, assignments, n_sims=200_000)
+    correlated = simulate_assignments(
+        HOME_WIN_PROBABILITY, assignments, n_sims=200_000, correlation=0.5
+    )
+    win_probability = np.where(picks_home, HOME_WIN_PROBABILITY, 1 - HOME_WIN_PROBABILITY)
+    expected = float(np.dot(win_probability, confidence))
+    assert independent["greedy"].mean == pytest.approx(expected, rel=0.01)
+    assert correlated["greedy"].mean == pytest.approx(expected, rel=0.01)
+    assert correlated["greedy"].std > independent["greedy"].std
+
+
+def test_simulate_assignments_is_reproducible_and_compares_strategies():
+    picks_home, confidence = greedy_assignment(HOME_WIN_PROBABILITY, max_confidence=6)
+    assignments = {
+        "greedy": (picks_home, confidence),
+        "reversed": (picks_home, confidence[::-1]),
+        "upset": (~picks_home, confidence),
+    }
+    kwargs = dict(n_sims=50_000, seed=3, correlation=0.2)
+    first = simulate_assignments(HOME_WIN_PROBABILITY, assignments, **kwargs)
+    second = simulate_assignments(HOME_WIN_PROBABILITY, assignments, chunk_size=999, **kwargs)
+    assert all(np.array_equal(first[name].counts, second[name].counts) for name in first)
+
+    table = compare_assignments(first)
+    assert list(table.index) == ["greedy", "reversed", "upset"]
+    assert table.loc["greedy", "mean"] > table.loc["reversed", "mean"]
+    assert table.loc["greedy", "mean"] > table.loc["upset", "mean"]
+    assert (table.expected_shortfall_5 <= table["mean"]).all()
+
+
+def test_season_distribution_adds_weeks():
+    week = ScoreDistribution.from_points(np.array([0, 1, 1, 2]), max_points=2)
+    season = season_distribution([week, week, week])
+    assert len(season.counts) == 7
+    assert season.mean == pytest.approx(3 * week.mean)
+    assert season.var == pytest.approx(3 * week.var)
+    assert season.n_sims == week.n_sims
+
+
+def test_simulate_odds_table(the_odds_resp_json):
+    table = OddsTable.from_games(parse_the_odds_json(the_odds_resp_json)[:12])
+    home_win_probability = table.home_team_win_prob
+    picks_home, confidence = greedy_assignment(home_win_probability)
+    assert sorted(confidence) == list(range(5, 17))
+    dist = simulate_assignments(home_win_probability, {"greedy": (picks_home, confidence)})
+    assert dist["greedy"].n_sims == 1_000_000
+    assert 0 < dist["greedy"].quantile(0.05) < dist["greedy"].mean < dist["greedy"].quantile(0.95)
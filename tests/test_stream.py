@@ -0,0 +1,84 @@
+import gzip
+import json
+import tracemalloc
+
+from nfl_confidence.odds import filter_games_by_date, parse_the_odds_json
+from nfl_confidence.stream import (
+    iter_games,
+    iter_json_values,
+    iter_odds_tables,
+    iter_snapshots,
+)
+
+
+def write_jsonl(path, snapshots, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, "wt") as f:
+        for snapshot in snapshots:
+            f.write(json.dumps(snapshot) + "\n")
+
+
+def test_iter_json_values_small_chunks(tmp_path):
+    path = tmp_path / "values.json"
+    path.write_text('[{"a": 1}, {"b": [1, 2]},\n {"c": "x]"}]')
+    assert list(iter_json_values(path, chunk_size=3)) == [{"a": 1}, {"b": [1, 2]}, {"c": "x]"}]
+    assert list(iter_json_values(path, stream_arrays=False, chunk_size=3)) == [
+        [{"a": 1}, {"b": [1, 2]}, {"c": "x]"}]
+    ]
+
+
+def test_iter_json_values_large_value_decoded_few_times(tmp_path, mocker):
+    path = tmp_path / "values.jsonl"
+    value = {"a": list(range(20_000))}
+    path.write_text(json.dumps(value) + "\n" + json.dumps({"b": 1}))
+    raw_decode = mocker.spy(json.JSONDecoder, "raw_decode")
+    assert list(iter_json_values(path, chunk_size=16)) == [value, {"b": 1}]
+    assert raw_decode.call_count < 40
+
+
+def test_iter_games_json(the_odds_file_path, the_odds_resp_json):
+    games = list(iter_games(the_odds_file_path, chunk_size=100))
+    expected = parse_the_odds_json(the_odds_resp_json)
+    assert [game.id for game in games] == [game.id for game in expected]
+    assert games[0].win_probability == expected[0].win_probability
+
+
+def test_iter_games_gzip_jsonl(tmp_path, the_odds_resp_json):
+    path = tmp_path / "archive.jsonl.gz"
+    write_jsonl(path, [the_odds_resp_json] * 3, compress=True)
+    games = list(iter_games(path))
+    assert len(games) == 3 * 29
+
+
+def test_iter_snapshots(tmp_path, the_odds_resp_json):
+    path = tmp_path / "archive.jsonl"
+    write_jsonl(path, [the_odds_resp_json, the_odds_resp_json[:5]])
+    snapshots = list(iter_snapshots(path))
+    assert [len(snapshot) for snapshot in snapshots] == [29, 5]
+
+
+def test_stream_into_filter_and_tables(tmp_path, the_odds_resp_json):
+    path = tmp_path / "archive.jsonl"
+    write_jsonl(path, [the_odds_resp_json] * 2)
+    games = parse_the_odds_json(the_odds_resp_json)
+    after, before = games[0].commence_time, games[-1].commence_time
+    expected = filter_games_by_date(games=games, after=after, before=before)
+    filtered = filter_games_by_date(games=iter_games(path), after=after, before=before)
+    assert len(filtered) == 2 * len(expected)
+    tables = list(iter_odds_tables(filtered, chunk_size=10))
+    assert sum(len(table) for table in tables) == len(filtered)
+    assert max(len(table) for table in tables) == 10
+
+
+def test_iter_snapshots_bounded_memory(tmp_path, the_odds_resp_json):
+    def peak_memory(n_snapshots):
+        path = tmp_path / f"archive_{n_snapshots}.jsonl.gz"
+        write_jsonl(path, [the_odds_resp_json] * n_snapshots, compress=True)
+        tracemalloc.start()
+        for snapshot in iter_snapshots(path):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    assert peak_memory(40) < 1.5 * peak_memory(4)
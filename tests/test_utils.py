@@ -1,7 +1,33 @@
 import numpy as np
+import pytest
 
-from nfl_confidence.utils import get_ranks
+from nfl_confidence.utils import assign_confidence, get_ranks
 
 
 def test_get_ranks():
     assert np.allclose(get_ranks([3, 7, 9, 1]), [2, 3, 4, 1])
+
+
+def test_assign_confidence():
+    assert list(assign_confidence([0.6, 0.9, 0.7], max_confidence=16)) == [14, 16, 15]
+
+
+def test_assign_confidence_keeps_locked_values():
+    values = [0.6, 0.9, 0.7, 0.8]
+    confidence = assign_confidence(values, max_confidence=16, locked={1: 13, 3: 15})
+    assert list(confidence) == [14, 13, 16, 15]
+    assert list(
+        assign_confidence(values, max_confidence=16, locked={0: 16, 1: 15, 2: 14, 3: 13})
+    ) == [
+        16,
+        15,
+        14,
+        13,
+    ]
+
+
+def test_assign_confidence_rejects_invalid_locks():
+    with pytest.raises(ValueError):
+        assign_confidence([0.6, 0.9], max_confidence=16, locked={0: 16, 1: 16})
+    with pytest.raises(ValueError):
+        assign_confidence([0.6, 0.9], max_confidence=16, locked={0: 14})
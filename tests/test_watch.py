@@ -0,0 +1,223 @@
+import copy
+from datetime import datetime, timezone
+from functools import partial
+
+import pytest
+import requests
+
+from nfl_confidence.cli import main
+from nfl_confidence.fakes import FakeClient, FakeOddsServer, FakeWorksheet
+from nfl_confidence.odds import get_the_odds_json, parse_the_odds_json
+from nfl_confidence.sheets import (
+    WEEK_SHEET_COLUMNS,
+    SheetWriter,
+    push_rows,
+    typed_frame,
+)
+from nfl_confidence.watch import OddsWatcher, game_version, watch
+
+# Before the first kickoff in tests/assets/the_odds_american.json
+BEFORE_KICKOFF = datetime(2023, 10, 19, tzinfo=timezone.utc)
+
+
+def move_line(snapshot, game_idx, price, last_update="2023-10-19T12:00:00Z"):
+    """Return a copy of the snapshot with every bookmaker's line moved to price for the home team
+    and -price for the away team"""
+    snapshot = copy.deepcopy(snapshot)
+    for bookmaker in snapshot[game_idx]["bookmakers"]:
+        bookmaker["last_update"] = last_update
+        for outcome in bookmaker["markets"][0]["outcomes"]:
+            home = outcome["name"] == snapshot[game_idx]["home_team"]
+            outcome["price"] = price if home else -price
+    return snapshot
+
+
+class FakeClock:
+    def __init__(self, now=BEFORE_KICKOFF):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_watcher(clock=None):
+    return OddsWatcher(
+        max_confidence=16, game_filter=lambda games: games, clock=clock or FakeClock()
+    )
+
+
+def test_game_version_ignores_bookmaker_order(the_odds_resp_json):
+    game = copy.deepcopy(the_odds_resp_json[0])
+    version = game_version(game)
+    game["bookmakers"].reverse()
+    assert game_version(game) == version
+
+
+def test_watcher_only_recomputes_changed_games(the_odds_resp_json, mocker):
+    snapshot = the_odds_resp_json[:12]
+    watcher = make_watcher()
+    rows = watcher.update(snapshot)
+    assert len(rows) == 12
+    assert sorted(row[-1] for row in rows.values()) == list(range(5, 17))
+
+    # An identical snapshot is not parsed at all
+    parse = mocker.spy(watcher, "game_filter")
+    assert watcher.update(copy.deepcopy(snapshot)) == {}
+    parse.assert_not_called()
+
+    # Moving one line recomputes only that game, and only rows that changed are returned
+    moved = move_line(snapshot, game_idx=3, price=-1000)
+    rows = watcher.update(moved)
+    assert [len(games) for (games,), _ in parse.call_args_list] == [1]
+    game_id = snapshot[3]["id"]
+    assert rows[game_id][-1] == 16
+    assert all(watcher.rows[gid] == row for gid, row in rows.items())
+    assert len(rows) < 12
+
+
+def test_watcher_keeps_games_that_drop_out(the_odds_resp_json):
+    watcher = make_watcher()
+    watcher.update(the_odds_resp_json[:12])
+    rows = watcher.update(move_line(the_odds_resp_json[1:12], game_idx=0, price=-1000))
+    assert the_odds_resp_json[0]["id"] not in rows
+    assert len(watcher.rows) == 12
+    assert sorted(row[-1] for row in watcher.rows.values()) == list(range(5, 17))
+
+
+def test_watcher_locks_games_after_kickoff(the_odds_resp_json):
+    snapshot = the_odds_resp_json[:12]
+    clock = FakeClock()
+    watcher = make_watcher(clock=clock)
+    watcher.update(snapshot)
+    first_game = min(watcher.games.values(), key=lambda game: game.commence_time)
+    locked_rank = watcher.rows[first_game.id][-1]
+
+    # After the first kickoff, moving its line changes nothing, and other games re-rank around it
+    clock.now = first_game.commence_time
+    first_idx = [game["id"] for game in snapshot].index(first_game.id)
+    assert watcher.update(move_line(snapshot, game_idx=first_idx, price=-1000)) == {}
+    other_idx = (first_idx + 1) % len(snapshot)
+    rows = watcher.update(move_line(snapshot, game_idx=other_idx, price=-1000))
+    assert first_game.id not in rows
+    assert watcher.locked == {first_game.id: locked_rank}
+    assert watcher.rows[first_game.id][-1] == locked_rank
+    assert sorted(row[-1] for row in watcher.rows.values()) == list(range(5, 17))
+
+
+def test_watcher_moves_on_to_the_next_week(the_odds_resp_json):
+    clock = FakeClock()
+    watcher = OddsWatcher(max_confidence=16, clock=clock)
+    rows = watcher.update(the_odds_resp_json)
+    assert len(rows) == 13
+    assert len(watcher.versions) == 13
+
+    # Next week's games were filtered out, not marked as seen, so they are ranked once the week
+    # turns over, and last week's games are forgotten
+    clock.now = datetime(2023, 10, 24, 12, tzinfo=timezone.utc)
+    rows = watcher.update(copy.deepcopy(the_odds_resp_json))
+    assert len(rows) == 16
+    assert set(watcher.rows) == set(rows) == set(watcher.games) == set(watcher.versions)
+    assert sorted(row[-1] for row in watcher.rows.values()) == list(range(1, 17))
+    assert watcher.locked == {}
+
+
+def test_push_rows_writes_only_changed_cells(the_odds_resp_json, mocker):
+    ws = FakeWorksheet(title="Week 7")
+    writer = SheetWriter(ws=ws)
+    watcher = make_watcher()
+    push_rows(writer, watcher.update(the_odds_resp_json[:12]))
+    records = ws.get_all_records()
+    assert list(records[0]) == WEEK_SHEET_COLUMNS
+    assert [r["id"] for r in records] == list(watcher.rows)
+
+    batch_update = mocker.spy(ws, "batch_update")
+    rows = watcher.update(move_line(the_odds_resp_json[:12], game_idx=3, price=-1000))
+    n_written = push_rows(writer, rows)
+    batch_update.assert_called_once()
+    assert 0 < n_written <= len(rows) * len(WEEK_SHEET_COLUMNS)
+    records = {r["id"]: r for r in ws.get_all_records()}
+    assert records[the_odds_resp_json[3]["id"]]["confidence_rank"] == 16
+
+
+def test_watch_polls_and_survives_errors(the_odds_resp_json):
+    snapshots = [
+        the_odds_resp_json[:12],
+        requests.ConnectionError("offline"),
+        the_odds_resp_json[:12],
+        move_line(the_odds_resp_json[:12], game_idx=3, price=-1000),
+    ]
+
+    def fetch():
+        snapshot = snapshots.pop(0)
+        if isinstance(snapshot, Exception):
+            raise snapshot
+        return snapshot
+
+    changes = []
+    sleeps = []
+    n_changed = watch(
+        fetch=fetch,
+        watcher=make_watcher(),
+        on_change=changes.append,
+        interval=60,
+        max_polls=4,
+        sleep=sleeps.append,
+    )
+    assert n_changed == 2
+    assert len(changes[0]) == 12
+    assert sleeps == [60, 60, 60]
+
+
+@pytest.fixture
+def watch_env(the_odds_file_path, mocker, monkeypatch):
+    """Run the watch command against a fake spreadsheet and a fake the-odds server, as of before
+    the first kickoff in the fixture"""
+    monkeypatch.setenv("THE_ODDS_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_SHEETS_SECRET_PATH", "secret.json")
+    sh = FakeClient().create("Confidence")
+    module = "nfl_confidence.commands.watch"
+    mocker.patch(f"{module}.gs.service_account", return_value=mocker.Mock(open=lambda name: sh))
+    mocker.patch(f"{module}.check_system_time")
+    mocker.patch(f"{module}.confirm", return_value=True)
+    mocker.patch(f"{module}.OddsWatcher", partial(OddsWatcher, clock=FakeClock()))
+    with FakeOddsServer({"americanfootball_nfl": the_odds_file_path}) as server:
+        mocker.patch(f"{module}.get_the_odds_json", partial(get_the_odds_json, base_url=server.url))
+        yield sh
+
+
+def test_watch_command_writes_the_week(watch_env):
+    main(["watch", "--week", "7", "--sheet", "Confidence", "--max_polls", "2", "--interval", "0"])
+    df = typed_frame(watch_env.worksheet("Week 7").get_all_values())
+    assert df.columns.tolist() == WEEK_SHEET_COLUMNS
+    assert sorted(df.confidence_rank) == list(range(4, 17))
+
+
+def test_watch_command_keeps_games_which_kicked_off(watch_env, the_odds_resp_json, mocker):
+    upcoming = parse_the_odds_json(the_odds_resp_json)[:13]
+    mocker.patch("nfl_confidence.commands.watch.get_this_weeks_odds", return_value=upcoming)
+    ws = watch_env.add_worksheet(title="Week 7")
+    ws.update(
+        [
+            WEEK_SHEET_COLUMNS,
+            ["kicked_off_0", "a", "b", "a", 0.0, 1.0, 0.9, 16],
+            ["kicked_off_1", "a", "b", "a", 0.0, 1.0, 0.8, 15],
+        ]
+    )
+    main(["watch", "--week", "7", "--sheet", "Confidence", "--max_polls", "1", "--interval", "0"])
+    df = typed_frame(ws.get_all_values())
+    assert df.confidence_rank.tolist()[:2] == [16, 15]
+    assert sorted(df.confidence_rank.iloc[2:]) == list(range(2, 15))
+
+
+def test_watcher_holds_locked_games_without_odds(the_odds_resp_json):
+    clock = FakeClock()
+    watcher = make_watcher(clock=clock)
+    watcher.locked = {"kicked_off": 16}
+    rows = watcher.update(the_odds_resp_json[:13])
+    assert "kicked_off" not in rows
+    assert sorted(row[-1] for row in rows.values()) == list(range(3, 16))
+
+    # Forgotten once the week turns over
+    clock.now = datetime(2023, 10, 25, tzinfo=timezone.utc)
+    watcher.update(the_odds_resp_json[13:])
+    assert "kicked_off" not in watcher.locked
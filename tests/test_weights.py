@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from nfl_confidence.odds import OddsTable, TeamNameEnum, parse_the_odds_json
+from nfl_confidence.weights import (
+    BookmakerWeights,
+    build_table,
+    fit_bookmaker_weights,
+    score_bookmakers,
+    score_probabilities,
+)
+
+
+def make_table(n_games=2000, seed=0):
+    """Games where one bookmaker quotes the true probability and the other is uninformative"""
+    rng = np.random.default_rng(seed)
+    true_prob = rng.uniform(0.15, 0.85, n_games)
+    noise_prob = rng.uniform(0.15, 0.85, n_games)
+    home_won = rng.random(n_games) < true_prob
+    probs = np.stack([true_prob, noise_prob], axis=1)
+    team = list(TeamNameEnum)[0]
+    table = OddsTable(
+        game_ids=[str(i) for i in range(n_games)],
+        home_teams=[team] * n_games,
+        away_teams=[team] * n_games,
+        commence_times=[None] * n_games,
+        bookmakers=["sharp", "noise"],
+        prices=np.stack([1 / probs, 1 / (1 - probs)], axis=-1),
+        odds_format="decimal",
+    )
+    return table, home_won
+
+
+def test_score_probabilities():
+    home_won = np.array([True, False])
+    assert score_probabilities([0.5, 0.5], home_won, rule="brier") == pytest.approx(0.25)
+    assert score_probabilities([0.5, 0.5], home_won) == pytest.approx(np.log(2))
+    assert score_probabilities([1.0, np.nan], home_won) == pytest.approx(0.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("rule", ["log_loss", "brier"])
+def test_fit_favors_the_reliable_bookmaker(rule):
+    table, home_won = make_table()
+    losses = score_bookmakers(table, home_won, rule=rule)
+    assert losses["sharp"] < losses["noise"]
+
+    weights = fit_bookmaker_weights(table, home_won, rule=rule)
+    assert weights.weights["sharp"] > 5 * weights.weights["noise"]
+    assert np.mean(list(weights.weights.values())) == pytest.approx(1.0)
+    assert weights.loss < weights.unweighted_loss
+    assert weights.games == len(table)
+
+
+def test_weighted_table(the_odds_resp_json, tmp_path):
+    games = parse_the_odds_json(the_odds_resp_json)
+    plain = OddsTable.from_games(games)
+
+    # Equal weights reproduce the plain average, and unknown bookmakers count as 1.0
+    equal = OddsTable.from_games(games, bookmaker_weights={"Unknown Book": 3.0})
+    assert np.allclose(equal.home_team_win_prob, plain.home_team_win_prob)
+
+    # All the weight on one bookmaker gives that bookmaker's probability wherever it quoted
+    book = plain.bookmakers[0]
+    weights = BookmakerWeights(weights={title: 1e-12 for title in plain.bookmakers})
+    weights.weights[book] = 1.0
+    path = str(tmp_path / "weights.json")
+    weights.save(path)
+    loaded = BookmakerWeights.load(path)
+    assert loaded == weights
+    table = build_table(games, weights=loaded)
+    quoted = ~np.isnan(plain.bookmaker_home_prob[:, 0])
+    assert np.allclose(table.home_team_win_prob[quoted], plain.bookmaker_home_prob[quoted, 0])
+    assert np.array_equal(build_table(games).home_team_win_prob, plain.home_team_win_prob)